@@ -0,0 +1 @@
+"""Benchmarks for `bot-ui-kitty`. Run all of them with `python -m benchmarks`."""
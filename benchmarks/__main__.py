@@ -0,0 +1,89 @@
+"""Runs every benchmark with its default parameters and prints the results as JSON.
+
+Usage: `python -m benchmarks [output_path]`
+
+If an output path is given, the results are also written to that file, so that they
+can be compared against the results of another release. The exit code is non-zero if
+any benchmark reports a failed check (e.g. `within_budget` or `isolated` is false), so
+that regressions can fail a CI job.
+"""
+
+import asyncio
+import json
+import platform
+import sys
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Final
+
+from benchmarks import (
+    autocomplete,
+    concurrent_sessions,
+    polls,
+    search_index,
+    selectors,
+    soak,
+)
+
+CHECKS: Final[tuple[str, ...]] = ("within_budget", "isolated", "correct_tally")
+
+
+def get_version(package_name: str) -> str | None:
+    """Returns the installed version of the given package, if it's installed."""
+    try:
+        return version(package_name)
+    except PackageNotFoundError:
+        return None
+
+
+def run() -> dict[str, Any]:
+    """Runs all benchmarks and returns their combined results."""
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "py-cord": get_version("py-cord"),
+            "bot-ui-kitty": get_version("bot-ui-kitty"),
+        },
+        "benchmarks": [
+            asyncio.run(selectors.run()),
+            search_index.run(),
+            autocomplete.run(),
+            asyncio.run(concurrent_sessions.run()),
+            asyncio.run(polls.run()),
+            asyncio.run(soak.run(user_count=50, duration=3.0)),
+        ],
+    }
+
+
+def get_failed_checks(results: dict[str, Any]) -> list[str]:
+    """Returns the names of the checks that failed, such as `"polls.correct_tally"`."""
+    failed_checks: list[str] = []
+
+    for result in results["benchmarks"]:
+        name = result["benchmark"]
+        failed_checks.extend(
+            f"{name}.{check}" for check in CHECKS if result.get(check) is False
+        )
+        if result.get("live_selectors", 0) != 0:
+            failed_checks.append(f"{name}.live_selectors")
+
+    return failed_checks
+
+
+def main() -> int:
+    """Runs all benchmarks and prints (and optionally saves) their results."""
+    results = run()
+    output = json.dumps(results, indent=2)
+    print(output)
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+
+    if failed_checks := get_failed_checks(results):
+        print(f"Failed checks: {', '.join(failed_checks)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""Measures how long `OptionAutocomplete` takes to answer each keystroke of a query.
+
+Simulated users type option keys (or parts of them) one character at a time, and each
+keystroke is answered as an autocomplete request. Every query is also answered without
+the per-user cache of recent queries, for comparison.
+
+Usage: `python -m benchmarks.autocomplete [option_count] [user_count]`
+"""
+
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Any, Final
+
+from benchmarks.search_index import make_keys
+from uikitty.autocomplete import OptionAutocomplete
+from uikitty.option_store import OptionStore
+
+KEYSTROKE_BUDGET_SECONDS: Final[float] = 0.001
+
+
+def make_queries(keys: list[str], user_count: int, seed: int = 0) -> list[str]:
+    """Returns a typed query (a slice of a random key, or random text) per user."""
+    rng = random.Random(seed)
+    queries = []
+
+    for _ in range(user_count):
+        key = rng.choice(keys)
+        match rng.randrange(3):
+            case 0:  # The start of a word.
+                queries.append(rng.choice(key.split()[1:])[:6])
+            case 1:  # The middle of a key.
+                start = rng.randrange(len(key) - 4)
+                queries.append(key[start : start + 5])
+            case _:  # A typo.
+                queries.append(key.split()[1][::-1])
+
+    return queries
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+    """Returns the median, 99th percentile, and maximum of the given timings (in µs)."""
+    return {
+        "median_us": round(statistics.median(timings) * 1e6, 2),
+        "p99_us": round(statistics.quantiles(timings, n=100)[98] * 1e6, 2),
+        "max_us": round(max(timings) * 1e6, 2),
+    }
+
+
+def time_keystrokes(
+    autocomplete: OptionAutocomplete, queries: list[str], use_cache: bool
+) -> list[float]:
+    """Types each query one character at a time and times each keystroke."""
+    timings = []
+
+    for user_id, query in enumerate(queries):
+        for length in range(1, len(query) + 1):
+            start = time.perf_counter()
+            autocomplete.get_choices(query[:length], user_id if use_cache else None)
+            timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def run(option_count: int = 100_000, user_count: int = 200) -> dict[str, Any]:
+    """Builds an autocomplete over `option_count` keys and times typed queries."""
+    keys = make_keys(option_count)
+
+    start = time.perf_counter()
+    autocomplete = OptionAutocomplete(OptionStore(zip(keys, keys)))
+    build_seconds = time.perf_counter() - start
+
+    queries = make_queries(keys, user_count)
+    uncached_timings = time_keystrokes(autocomplete, queries, use_cache=False)
+    cached_timings = time_keystrokes(autocomplete, queries, use_cache=True)
+    cached = summarize(cached_timings)
+
+    return {
+        "benchmark": "autocomplete",
+        "option_count": option_count,
+        "user_count": user_count,
+        "keystroke_count": len(cached_timings),
+        "build_seconds": round(build_seconds, 4),
+        "cached": cached,
+        "uncached": summarize(uncached_timings),
+        "cache": autocomplete.get_stats(),
+        "within_budget": cached["median_us"] < KEYSTROKE_BUDGET_SECONDS * 1e6,
+    }
+
+
+def main() -> int:
+    """Runs the benchmark and prints its results as JSON."""
+    option_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    user_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    result = run(option_count, user_count)
+    print(json.dumps(result, indent=2))
+    return 0 if result["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
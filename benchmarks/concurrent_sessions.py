@@ -0,0 +1,117 @@
+"""Runs many paginated selections at once and checks that their state stays isolated.
+
+Each session gets its own set of options and navigates to a random page before making
+a selection, so any state shared between sessions would produce a wrong result. The
+memory retained by each open session is measured while all sessions are active, and
+must stay within `BASE_BYTES_PER_SESSION` plus `BYTES_PER_OPTION` for each option. The
+benchmark fails if the sessions aren't isolated, or if they exceed this budget.
+
+Usage: `python -m benchmarks.concurrent_sessions [session_count] [options_per_session]`
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Final
+
+import uikitty
+from benchmarks.stubs import StubContext, select_values
+from uikitty.paginator import Paginator
+
+BASE_BYTES_PER_SESSION: Final[int] = 48_000
+BYTES_PER_OPTION: Final[int] = 320
+
+
+async def run_session(
+    ctx: StubContext,
+    session_id: int,
+    option_count: int,
+    all_shown: asyncio.Event,
+    rng: random.Random,
+) -> tuple[Any, Any, Paginator]:
+    """Runs a single paginated selection and returns the expected and actual results."""
+    options = {f"{session_id}-{i}": (session_id, i) for i in range(option_count)}
+    selection = asyncio.create_task(
+        uikitty.dynamic_select(ctx, log=None, **options)  # type: ignore[arg-type]
+    )
+
+    await ctx.shown.wait()
+    await all_shown.wait()
+
+    paginator = getattr(ctx.view, "paginator")
+    for _ in range(rng.randrange(paginator.page_count)):
+        await paginator.ui.next_button.callback(ctx.interaction_for())
+        await asyncio.sleep(0)
+
+    choice = rng.choice(paginator.ui.select.options)
+    select_values(paginator.ui.select, choice.value)
+    await paginator.ui.select.callback(ctx.interaction_for())
+    await paginator.ui.center_button.callback(ctx.interaction_for())
+
+    return options[choice.label], await selection, paginator
+
+
+async def run(session_count: int = 1000, option_count: int = 200) -> dict[str, Any]:
+    """Runs concurrent sessions and reports their isolation and memory usage."""
+    uikitty.selector_registry.max_size = max(
+        uikitty.selector_registry.max_size, session_count
+    )
+    rng = random.Random(0)
+    all_shown = asyncio.Event()
+
+    tracemalloc.start()
+    baseline_bytes, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    contexts = [StubContext() for _ in range(session_count)]
+    sessions = asyncio.gather(
+        *(
+            run_session(ctx, i, option_count, all_shown, rng)
+            for i, ctx in enumerate(contexts)
+        )
+    )
+    while not all(ctx.shown.is_set() for ctx in contexts):
+        await asyncio.sleep(0.01)
+
+    open_bytes, _ = tracemalloc.get_traced_memory()
+    all_shown.set()
+    results = await sessions
+
+    elapsed_seconds = time.perf_counter() - start
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    bytes_per_open_session = (open_bytes - baseline_bytes) // session_count
+    bytes_budget = BASE_BYTES_PER_SESSION + (BYTES_PER_OPTION * option_count)
+    mismatches = sum(expected != actual for expected, actual, _ in results)
+    distinct_selects = len({id(paginator.ui.select) for *_, paginator in results})
+
+    return {
+        "benchmark": "concurrent_sessions",
+        "session_count": session_count,
+        "options_per_session": option_count,
+        "elapsed_seconds": round(elapsed_seconds, 4),
+        "bytes_per_open_session": bytes_per_open_session,
+        "bytes_budget_per_session": bytes_budget,
+        "within_budget": bytes_per_open_session <= bytes_budget,
+        "peak_bytes": peak_bytes - baseline_bytes,
+        "mismatched_results": mismatches,
+        "distinct_components": distinct_selects == session_count,
+        "isolated": (mismatches == 0) and (distinct_selects == session_count),
+    }
+
+
+def main() -> int:
+    """Runs the benchmark and prints its results as JSON."""
+    session_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    option_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    result = asyncio.run(run(session_count, option_count))
+    print(json.dumps(result, indent=2))
+    return 0 if (result["isolated"] and result["within_budget"]) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
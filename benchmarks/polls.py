@@ -0,0 +1,98 @@
+"""Runs a poll with many voters and counts the API calls needed to collect their votes.
+
+Voters arrive at a steady rate over the poll's duration, and some of them change their
+vote. Each vote must be acknowledged, but the displayed tally should only be refreshed
+on a fixed cadence, so the number of message edits shouldn't grow with the voter count.
+
+Usage: `python -m benchmarks.polls [voter_count] [duration_seconds]`
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any
+
+import uikitty
+from benchmarks.stubs import StubContext, StubInteraction, StubUser
+from uikitty.poll_selector import PollSelector
+
+BATCH_COUNT: int = 50
+
+
+async def cast_votes(
+    ctx: StubContext, voters: list[StubUser], duration: float, rng: random.Random
+) -> dict[int, int]:
+    """Casts a vote for each voter (and changes some votes), spread over `duration`."""
+    await ctx.shown.wait()
+    poll = ctx.view
+    assert isinstance(poll, PollSelector)
+
+    expected: dict[int, int] = {}
+    votes = voters + rng.sample(voters, len(voters) // 10)
+    batch_size = max(len(votes) // BATCH_COUNT, 1)
+
+    # Votes are cast in batches, since sleeping between individual votes would take
+    # much longer than intended on platforms with a coarse timer resolution.
+    for batch_start in range(0, len(votes), batch_size):
+        for voter in votes[batch_start : batch_start + batch_size]:
+            index = rng.randrange(len(poll.buttons))
+            interaction = StubInteraction(ctx.api_log, voter)
+            await poll.buttons[index].callback(interaction)  # type: ignore[arg-type]
+            expected[voter.id] = index
+        await asyncio.sleep((duration * 0.5) / BATCH_COUNT)
+
+    return expected
+
+
+async def run(voter_count: int = 1000, duration: float = 2.0) -> dict[str, Any]:
+    """Runs a poll and reports the API calls made while collecting its votes."""
+    rng = random.Random(0)
+    ctx = StubContext()
+    voters = [StubUser() for _ in range(voter_count)]
+    update_interval = duration / 10
+
+    start = time.perf_counter()
+    poll = asyncio.create_task(
+        uikitty.dynamic_poll(
+            ctx,  # type: ignore[arg-type]
+            *"ABCDE",
+            log=None,
+            duration=duration,
+            update_interval=update_interval,
+        )
+    )
+    expected = await cast_votes(ctx, voters, duration, rng)
+    results = await poll
+    elapsed_seconds = time.perf_counter() - start
+
+    expected_counts = [0] * 5
+    for index in expected.values():
+        expected_counts[index] += 1
+    is_correct = list(results.counts.values()) == expected_counts
+
+    return {
+        "benchmark": "polls",
+        "voter_count": voter_count,
+        "vote_count": ctx.api_log.calls["defer"],
+        "duration_seconds": duration,
+        "update_interval_seconds": update_interval,
+        "elapsed_seconds": round(elapsed_seconds, 4),
+        "api_calls": dict(ctx.api_log.calls),
+        "message_edits": ctx.api_log.calls["message_edit"],
+        "correct_tally": is_correct,
+    }
+
+
+def main() -> int:
+    """Runs the benchmark and prints its results as JSON."""
+    voter_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    result = asyncio.run(run(voter_count, duration))
+    print(json.dumps(result, indent=2))
+    return 0 if result["correct_tally"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Measures how long it takes to build a `SearchIndex` and to answer queries with it.
+
+Usage: `python -m benchmarks.search_index [option_count]`
+"""
+
+import json
+import random
+import statistics
+import string
+import sys
+import time
+from typing import Any, Final
+
+from uikitty.search_index import SearchIndex
+
+QUERY_BUDGET_SECONDS: Final[float] = 0.001
+REPETITIONS: Final[int] = 200
+
+
+def make_keys(count: int, seed: int = 0) -> list[str]:
+    """Returns `count` pseudo-random option keys that resemble real-world labels."""
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        for _ in range(max(count // 20, 50))
+    ]
+    return [
+        f"{i}. {rng.choice(words).title()} {rng.choice(words)}" for i in range(count)
+    ]
+
+
+def run(option_count: int = 100_000) -> dict[str, Any]:
+    """Builds an index over `option_count` keys and times a mix of typical queries."""
+    keys = make_keys(option_count)
+
+    start = time.perf_counter()
+    search_index = SearchIndex(keys)
+    build_seconds = time.perf_counter() - start
+
+    sample_key = keys[len(keys) // 2]
+    queries = {
+        "word_prefix": sample_key.split()[1][:3],
+        "number_prefix": sample_key.split(".")[0],
+        "substring": sample_key[-5:-1],
+        "fuzzy": sample_key.split()[1][::-1],
+        "no_match": "~#~#~#",
+    }
+    results: dict[str, Any] = {}
+
+    for name, query in queries.items():
+        timings = []
+        for _ in range(REPETITIONS):
+            start = time.perf_counter()
+            match_count = len(search_index.search(query))
+            timings.append(time.perf_counter() - start)
+        results[name] = {
+            "query": query,
+            "matches": match_count,
+            "median_us": round(statistics.median(timings) * 1e6, 2),
+            "max_us": round(max(timings) * 1e6, 2),
+        }
+
+    return {
+        "benchmark": "search_index",
+        "option_count": option_count,
+        "build_seconds": round(build_seconds, 4),
+        "queries": results,
+        "within_budget": all(
+            result["median_us"] < QUERY_BUDGET_SECONDS * 1e6
+            for result in results.values()
+        ),
+    }
+
+
+def main() -> int:
+    """Runs the benchmark and prints its results as JSON."""
+    option_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    result = run(option_count)
+    print(json.dumps(result, indent=2))
+    return 0 if result["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
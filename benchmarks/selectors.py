@@ -0,0 +1,149 @@
+"""Measures the construction cost, memory usage, and responsiveness of selector views.
+
+For each option count, this benchmark builds `DynamicSelector` instances (which choose
+the buttons, select, or paginator layout on their own), measures how long construction
+takes and how much memory it allocates, and then times how quickly the resulting view
+can be rendered and, for paginated views, how quickly it handles page navigation.
+
+Usage: `python -m benchmarks.selectors [option_count ...]`
+"""
+
+import asyncio
+import functools
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any, Final
+
+from discord import ButtonStyle
+from discord.ui import Button
+
+from benchmarks.stubs import StubContext
+from uikitty.dynamic_selector import DynamicSelector
+from uikitty.option_store import OptionStore
+from uikitty.paginator import Paginator
+
+OPTION_COUNTS: Final[tuple[int, ...]] = (2, 5, 6, 25, 26, 100, 1_000, 10_000, 100_000)
+TIME_BUDGET_SECONDS: Final[float] = 0.25
+MAX_REPETITIONS: Final[int] = 1_000
+
+
+def make_options(count: int) -> OptionStore:
+    """Returns an `OptionStore` containing `count` options with distinct keys."""
+    return OptionStore((f"Option #{i:06}", i) for i in range(count))
+
+
+def build_selector(options: OptionStore) -> DynamicSelector:
+    """Builds a `DynamicSelector` for `options` with console output disabled."""
+    return DynamicSelector(
+        ctx=StubContext(),  # type: ignore[arg-type]
+        button_style=ButtonStyle.primary,
+        select_placeholder=None,
+        log=None,
+        options=options,
+    )
+
+
+def get_layout(selector: DynamicSelector) -> str:
+    """Returns the name of the layout that the given selector has chosen."""
+    if selector.paginator:
+        return "paginator"
+    first_item = selector.children[0]  # type: ignore[has-type]
+    return "buttons" if isinstance(first_item, Button) else "select"
+
+
+async def time_repeatedly(function: Callable[[], Any]) -> dict[str, float]:
+    """Calls `function` until the time budget is spent, and reports its timings."""
+    timings: list[float] = []
+    deadline = time.perf_counter() + TIME_BUDGET_SECONDS
+
+    while (len(timings) < MAX_REPETITIONS) and (time.perf_counter() < deadline):
+        start = time.perf_counter()
+        if asyncio.iscoroutine(result := function()):
+            await result
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "repetitions": len(timings),
+        "median_us": round(median * 1e6, 2),
+        "max_us": round(max(timings) * 1e6, 2),
+        "per_second": round(1 / median, 1) if median else float("inf"),
+    }
+
+
+async def click_next_button(paginator: Paginator, ctx: StubContext) -> None:
+    """Clicks the "next page" button, wrapping around after reaching the last page."""
+    if paginator.current_page == paginator.page_count - 1:
+        paginator.current_page = 0  # The button is disabled on the last page.
+    await paginator.ui.next_button.callback(ctx.interaction_for())  # type: ignore
+
+
+async def measure_memory(options: OptionStore) -> dict[str, int]:
+    """Reports the peak and retained memory allocated by building one selector."""
+    gc.collect()
+    tracemalloc.start()
+    baseline_bytes, _ = tracemalloc.get_traced_memory()
+
+    selector = build_selector(options)
+    await selector.prepare()
+    retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+    selector.stop()
+
+    return {
+        "peak_bytes": peak_bytes - baseline_bytes,
+        "retained_bytes": retained_bytes - baseline_bytes,
+    }
+
+
+async def run_for_count(option_count: int) -> dict[str, Any]:
+    """Runs every measurement for a single option count."""
+    options = make_options(option_count)
+
+    def construct() -> None:
+        build_selector(options).stop()
+
+    selector = build_selector(options)
+    await selector.prepare()
+    result: dict[str, Any] = {
+        "option_count": option_count,
+        "layout": get_layout(selector),
+        "construction": await time_repeatedly(construct),
+        "memory": await measure_memory(options),
+        "render": await time_repeatedly(selector.to_components),
+    }
+
+    if paginator := selector.paginator:
+        ctx = StubContext()
+        result["update_ui"] = await time_repeatedly(paginator._update_ui)
+        result["next_page_click"] = await time_repeatedly(
+            functools.partial(click_next_button, paginator, ctx)
+        )
+
+    selector.stop()
+    return result
+
+
+async def run(option_counts: tuple[int, ...] = OPTION_COUNTS) -> dict[str, Any]:
+    """Runs the benchmark for each of the given option counts."""
+    return {
+        "benchmark": "selectors",
+        "results": [await run_for_count(count) for count in option_counts],
+    }
+
+
+def main() -> int:
+    """Runs the benchmark and prints its results as JSON."""
+    option_counts = tuple(map(int, sys.argv[1:])) or OPTION_COUNTS
+    print(json.dumps(asyncio.run(run(option_counts)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
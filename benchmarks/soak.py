@@ -0,0 +1,231 @@
+"""Runs many simulated users through complete selections against a fake Discord API.
+
+Each simulated user repeatedly invokes `dynamic_select` with a random number of options
+(so every layout is exercised), waits a moment as if reading the message, navigates to
+a random page (if the options are paginated), and makes a selection. Every API call is
+answered by a `FakeHttp` layer, which adds randomized latency and occasionally responds
+with a rate limit (after which the call is retried, as Pycord's HTTP client would do).
+
+While the users are active, the harness samples event loop lag and traced memory. It
+reports percentiles of the time to selection, the number of API calls per selection,
+event loop lag, and the growth of retained memory between the first and last samples.
+Note that memory tracing slows everything down, which also shows up as loop lag.
+
+Usage: `python -m benchmarks.soak [user_count] [duration_seconds]`
+"""
+
+import asyncio
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Final
+
+from discord.ui import Button, Select
+
+import uikitty
+from benchmarks.stubs import ApiLog, StubContext, select_values
+
+OPTION_COUNTS: Final[tuple[int, ...]] = (3, 15, 60, 500)
+LAG_SAMPLE_INTERVAL: Final[float] = 0.01
+MEMORY_SAMPLE_INTERVAL: Final[float] = 0.5
+USERS_PER_CHANNEL: Final[int] = 10
+
+
+class FakeHttp(ApiLog):
+    """An `ApiLog` that behaves like a (slow and occasionally rate-limited) Discord API.
+
+    Each call takes a random amount of time, drawn from a log-normal distribution with
+    the given median. A fraction of calls is rejected with a rate limit, in which case
+    the call is retried after `retry_after` seconds. Rejected calls are counted in
+    `rate_limited_count`, and retries are recorded as additional calls.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        rate_limit_probability: float = 0.01,
+        retry_after: float = 0.5,
+        rng: random.Random | None = None,
+    ) -> None:
+        """Initializes a new `FakeHttp` instance with the given behavior."""
+        super().__init__(latency)
+        self.rate_limit_probability: float = rate_limit_probability
+        self.retry_after: float = retry_after
+        self.rate_limited_count: int = 0
+        self.rng: Final[random.Random] = rng or random.Random(0)
+
+    async def record(self, name: str) -> None:
+        """Simulates a single API call, including any rate-limited attempts."""
+        while True:
+            self.calls[name] += 1
+            await asyncio.sleep(self.latency * self.rng.lognormvariate(0, 0.5))
+
+            if self.rng.random() >= self.rate_limit_probability:
+                return
+
+            self.rate_limited_count += 1
+            await asyncio.sleep(self.retry_after)
+
+
+async def run_selection(
+    http: FakeHttp, channel_id: int, rng: random.Random, think_time: float
+) -> float:
+    """Runs a single selection from start to finish and returns its duration."""
+    ctx = StubContext(http, channel_id)
+    option_count = rng.choice(OPTION_COUNTS)
+    options = {f"Option #{i:04}": i for i in range(option_count)}
+    start = time.perf_counter()
+
+    selection = asyncio.create_task(
+        uikitty.dynamic_select(ctx, log=None, **options)  # type: ignore[arg-type]
+    )
+    await ctx.shown.wait()
+    await asyncio.sleep(think_time * rng.random())
+
+    view: Any = ctx.view
+    if paginator := view.paginator:
+        for _ in range(rng.randrange(min(paginator.page_count, 5))):
+            await paginator.ui.next_button.callback(ctx.interaction_for())
+            await asyncio.sleep(think_time * rng.random() / 2)
+
+        choice = rng.choice(paginator.ui.select.options)
+        select_values(paginator.ui.select, choice.value)
+        await paginator.ui.select.callback(ctx.interaction_for())
+        await paginator.ui.center_button.callback(ctx.interaction_for())
+    elif isinstance(item := view.children[0], Select):
+        select_values(item, rng.choice(item.options).value)
+        await item.callback(ctx.interaction_for())  # type: ignore[arg-type]
+    else:
+        button: Button = rng.choice(view.children)
+        await button.callback(ctx.interaction_for())  # type: ignore[arg-type]
+
+    await selection
+    return time.perf_counter() - start
+
+
+async def run_user(
+    http: FakeHttp,
+    channel_id: int,
+    rng: random.Random,
+    think_time: float,
+    deadline: float,
+    durations: list[float],
+) -> None:
+    """Runs selections for a single user until the deadline has passed."""
+    while time.perf_counter() < deadline:
+        durations.append(await run_selection(http, channel_id, rng, think_time))
+
+
+async def sample_lag(deadline: float, lags: list[float]) -> None:
+    """Measures how late the event loop wakes up from short sleeps."""
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        lags.append(time.perf_counter() - start - LAG_SAMPLE_INTERVAL)
+
+
+async def sample_memory(deadline: float, samples: list[int]) -> None:
+    """Records the traced memory at regular intervals."""
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(MEMORY_SAMPLE_INTERVAL)
+        gc.collect()
+        samples.append(tracemalloc.get_traced_memory()[0])
+
+
+def get_percentiles(values: list[float], scale: float = 1000) -> dict[str, float]:
+    """Returns the 50th, 95th, and 99th percentiles of the given values (in ms)."""
+    if len(values) < 2:
+        return {}
+    quantiles = statistics.quantiles(values, n=100)
+    return {
+        "p50_ms": round(quantiles[49] * scale, 2),
+        "p95_ms": round(quantiles[94] * scale, 2),
+        "p99_ms": round(quantiles[98] * scale, 2),
+        "max_ms": round(max(values) * scale, 2),
+    }
+
+
+async def run(
+    user_count: int = 100,
+    duration: float = 5.0,
+    latency: float = 0.05,
+    rate_limit_probability: float = 0.01,
+    think_time: float = 0.2,
+) -> dict[str, Any]:
+    """Runs the soak test and reports its latency, API usage, and memory growth."""
+    uikitty.selector_registry.max_size = max(
+        uikitty.selector_registry.max_size, user_count * 2
+    )
+    rng = random.Random(0)
+    http = FakeHttp(latency, rate_limit_probability, rng=random.Random(1))
+    durations: list[float] = []
+    lags: list[float] = []
+    memory_samples: list[int] = []
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    deadline = start + duration
+
+    await asyncio.gather(
+        sample_lag(deadline, lags),
+        sample_memory(deadline, memory_samples),
+        *(
+            run_user(
+                http,
+                i // USERS_PER_CHANNEL,
+                random.Random(rng.random()),
+                think_time,
+                deadline,
+                durations,
+            )
+            for i in range(user_count)
+        ),
+    )
+
+    elapsed_seconds = time.perf_counter() - start
+    tracemalloc.stop()
+    selection_count = len(durations)
+
+    return {
+        "benchmark": "soak",
+        "user_count": user_count,
+        "duration_seconds": duration,
+        "median_latency_ms": latency * 1000,
+        "rate_limit_probability": rate_limit_probability,
+        "elapsed_seconds": round(elapsed_seconds, 4),
+        "selection_count": selection_count,
+        "selections_per_second": round(selection_count / elapsed_seconds, 2),
+        "time_to_selection": get_percentiles(durations),
+        "api_calls_per_selection": round(http.total / max(selection_count, 1), 2),
+        "api_calls": dict(http.calls),
+        "rate_limited_calls": http.rate_limited_count,
+        "event_loop_lag": get_percentiles(lags),
+        "memory_bytes": {
+            "first_sample": memory_samples[0] if memory_samples else 0,
+            "last_sample": memory_samples[-1] if memory_samples else 0,
+            "max_sample": max(memory_samples, default=0),
+        },
+        "memory_growth_bytes": (
+            (memory_samples[-1] - memory_samples[0]) if memory_samples else 0
+        ),
+        "live_selectors": uikitty.selector_registry.live_count,
+        "edit_scheduler": uikitty.edit_scheduler.get_stats(),
+    }
+
+
+def main() -> int:
+    """Runs the benchmark and prints its results as JSON."""
+    user_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    result = asyncio.run(run(user_count, duration))
+    print(json.dumps(result, indent=2))
+    return 0 if (result["live_selectors"] == 0) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+"""Lightweight stand-ins for the Pycord objects that `uikitty` interacts with.
+
+These stubs implement just enough of `ApplicationContext`, `Interaction`, and their
+response objects to drive selector views without a network connection. Every method
+that would normally result in an HTTP request is recorded in an `ApiLog` instead.
+"""
+
+import asyncio
+import itertools
+from collections import Counter
+from typing import Any, Final
+
+from discord.ui import Select, View
+
+_ids: Final[itertools.count] = itertools.count(1)
+
+
+class ApiLog:
+    """Records the (simulated) API calls made while handling one or more selections."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Initializes a new `ApiLog` with an optional simulated latency per call."""
+        self.latency: float = latency
+        self.calls: Counter[str] = Counter()
+
+    @property
+    def total(self) -> int:
+        """The total number of API calls recorded by this log."""
+        return sum(self.calls.values())
+
+    async def record(self, name: str) -> None:
+        """Records a single API call, waiting for the simulated latency (if any)."""
+        self.calls[name] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class StubUser:
+    """A stand-in for a Discord `User`."""
+
+    def __init__(self, user_id: int | None = None) -> None:
+        """Initializes a new `StubUser` with a unique (or the given) ID."""
+        self.id: int = user_id if (user_id is not None) else next(_ids)
+        self.name: str = f"user-{self.id}"
+
+    def __str__(self) -> str:
+        """Returns the name of this user."""
+        return self.name
+
+
+class StubResponse:
+    """A stand-in for an `InteractionResponse`."""
+
+    def __init__(self, api_log: ApiLog) -> None:
+        """Initializes a new `StubResponse` that records its calls in `api_log`."""
+        self.api_log: Final[ApiLog] = api_log
+        self.modal: Any = None
+        self._is_done: bool = False
+
+    def is_done(self) -> bool:
+        """Whether this response has already been sent."""
+        return self._is_done
+
+    async def defer(self, **_: Any) -> None:
+        """Acknowledges the interaction without changing the message."""
+        self._is_done = True
+        await self.api_log.record("defer")
+
+    async def edit_message(self, *, view: View | None = None, **_: Any) -> None:
+        """Acknowledges the interaction by editing the message."""
+        self._is_done = True
+        if view is not None:
+            view.to_components()
+        await self.api_log.record("edit_message")
+
+    async def send_modal(self, modal: Any) -> None:
+        """Acknowledges the interaction by opening a modal."""
+        self._is_done = True
+        self.modal = modal
+        await self.api_log.record("send_modal")
+
+
+class StubChannel:
+    """A stand-in for a Discord channel."""
+
+    def __init__(self, channel_id: int = 0) -> None:
+        """Initializes a new `StubChannel` with the given ID."""
+        self.id: int = channel_id
+
+
+class StubMessage:
+    """A stand-in for the `Message` that displays a view."""
+
+    def __init__(self, api_log: ApiLog, channel_id: int = 0) -> None:
+        """Initializes a new `StubMessage` that records its calls in `api_log`."""
+        self.id: int = next(_ids)
+        self.channel: StubChannel = StubChannel(channel_id)
+        self.api_log: Final[ApiLog] = api_log
+
+    async def edit(self, *, view: View | None = None, **_: Any) -> None:
+        """Edits this message (outside of any interaction response)."""
+        if view is not None:
+            view.to_components()
+        await self.api_log.record("message_edit")
+
+
+class StubInteraction:
+    """A stand-in for a component `Interaction`."""
+
+    def __init__(self, api_log: ApiLog, user: StubUser | None = None) -> None:
+        """Initializes a new `StubInteraction` from the given (or a new) user."""
+        self.id: int = next(_ids)
+        self.user: StubUser = user or StubUser()
+        self.channel_id: int = 0
+        self.message: Any = None
+        self.response: Final[StubResponse] = StubResponse(api_log)
+        self.api_log: Final[ApiLog] = api_log
+
+    async def edit_original_response(
+        self, *, view: View | None = None, **_: Any
+    ) -> None:
+        """Edits the message that this interaction was responded to with."""
+        if view is not None:
+            view.to_components()
+        await self.api_log.record("edit_original_response")
+
+
+class StubContext:
+    """A stand-in for an `ApplicationContext`."""
+
+    def __init__(self, api_log: ApiLog | None = None, channel_id: int = 0) -> None:
+        """Initializes a new `StubContext` that records its calls in `api_log`."""
+        self.api_log: Final[ApiLog] = api_log or ApiLog()
+        self.user: Final[StubUser] = StubUser()
+        self.channel_id: int = channel_id
+        self.interaction: Final[StubInteraction] = StubInteraction(
+            self.api_log, self.user
+        )
+        self.interaction.channel_id = channel_id
+        self.response: Final[StubResponse] = self.interaction.response
+        self.view: View | None = None
+        self.shown: asyncio.Event = asyncio.Event()
+
+    async def respond(self, *, view: View | None = None, **_: Any) -> None:
+        """Sends the initial response to the application command."""
+        self.response._is_done = True
+        await self._show(view, "respond")
+
+    async def edit(self, *, view: View | None = None, **_: Any) -> None:
+        """Edits the initial response to the application command."""
+        await self._show(view, "edit")
+
+    async def _show(self, view: View | None, name: str) -> None:
+        if view is not None:
+            view.to_components()
+            if view.timeout:
+                view._start_listening_from_store(_StubViewStore())  # type: ignore
+            view.message = StubMessage(  # type: ignore[assignment]
+                self.api_log, self.channel_id
+            )
+        self.view = view
+        await self.api_log.record(name)
+        self.shown.set()
+
+    def interaction_for(self) -> StubInteraction:
+        """Returns a new interaction from the user who invoked this context."""
+        interaction = StubInteraction(self.api_log, self.user)
+        interaction.channel_id = self.channel_id
+        return interaction
+
+
+class _StubViewStore:
+    def remove_view(self, view: View) -> None:
+        pass
+
+
+def select_values(select: Select, *values: str) -> None:
+    """Sets the values of a `Select` as if the user had chosen them in Discord."""
+    select._selected_values = list(values)
+    select._interaction = type(  # type: ignore[assignment]
+        "_Interaction", (), {"data": {"values": list(values)}}
+    )
@@ -1,4 +1,6 @@
-import json
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
 from typing import Any, Final
 
 from discord import ApplicationContext, Bot, Cog, Embed, SlashCommandGroup
@@ -9,7 +11,14 @@ import uikitty
 class DynamicSelectCog(Cog):
     def __init__(self, bot: Bot) -> None:
         self.bot: Final[Bot] = bot
-        self.elements_data: Final[dict[str, Any]] = {}
+        self.elements: Final[uikitty.OptionCatalog] = uikitty.OptionCatalog.shared(
+            "https://raw.githubusercontent.com/Bowserinator/"
+            "Periodic-Table-JSON/master/PeriodicTableJSON.json",
+            parse=_parse_elements,
+            cache_path=Path(tempfile.gettempdir()) / "uikitty-elements.json",
+        )
+        self.elements.start(bot.loop)
+        self.layout_cache: Final[uikitty.LayoutCache] = uikitty.LayoutCache(max_size=1)
 
     select = SlashCommandGroup("select", "Examples for the Dynamic Select view.")
 
@@ -41,15 +50,15 @@ class DynamicSelectCog(Cog):
 
     @select.command(description="An example of a Dynamic Select view with 119 options.")
     async def element(self, ctx: ApplicationContext) -> None:
-        if not self.elements_data:
+        if not self.elements.is_loaded:
             await ctx.response.defer()
-            await self._fetch_elements()
 
         color = ctx.guild.me.color
         element = await uikitty.dynamic_select(
             ctx,
             embed=Embed(title="Select an element to learn more about it!", color=color),
-            **self.elements_data,
+            layout_cache=self.layout_cache,
+            source=self.elements,
         )
         embed = Embed(
             title=element["name"],
@@ -59,20 +68,13 @@ class DynamicSelectCog(Cog):
         )
         await ctx.edit(embed=embed, view=None)
 
-    async def _fetch_elements(self) -> None:
-        data_url = (
-            "https://raw.githubusercontent.com/Bowserinator/"
-            "Periodic-Table-JSON/master/PeriodicTableJSON.json"
-        )
-        # noinspection PyUnresolvedReferences, PyProtectedMember
-        async with self.bot.http._HTTPClient__session.get(data_url) as response:
-            elements = json.loads(await response.text())["elements"]
 
-        for element in elements:
-            label = f"{element['number']}. {element['name']} ({element['symbol']})"
-            self.elements_data[label] = {
-                k: v for k, v in element.items() if k in {"name", "source", "summary"}
-            }
+def _parse_elements(data: dict[str, Any]) -> Iterator[tuple[str, dict[str, Any]]]:
+    for element in data["elements"]:
+        label = f"{element['number']}. {element['name']} ({element['symbol']})"
+        yield label, {
+            k: v for k, v in element.items() if k in {"name", "source", "summary"}
+        }
 
 
 def setup(bot: Bot) -> None:
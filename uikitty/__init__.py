@@ -1,7 +1,55 @@
 """Main package for `bot-ui-kitty`. Exposes functions that make up the public API."""
 
+from uikitty.autocomplete import OptionAutocomplete
+from uikitty.edit_scheduler import EditScheduler, edit_scheduler
 from uikitty.functions import *
+from uikitty.instrumentation import (
+    EventKind,
+    Instrumentation,
+    LoggingSink,
+    MetricsSink,
+    SelectorEvent,
+    selector_instrumentation,
+)
+from uikitty.layout_cache import LayoutCache
+from uikitty.option_catalog import OptionCatalog
+from uikitty.persistent_selector import PersistentSelectorManager
+from uikitty.poll_selector import PollResults
+from uikitty.registry import SelectorRegistry, selector_registry
+from uikitty.resolver import CachedResolver
+from uikitty.selection_chain import SelectionChain
+from uikitty.session_store import (
+    MemorySessionStore,
+    SessionState,
+    SessionStore,
+    SQLiteSessionStore,
+)
 
 __all__ = [
+    "CachedResolver",
+    "EditScheduler",
+    "EventKind",
+    "Instrumentation",
+    "LayoutCache",
+    "LoggingSink",
+    "MemorySessionStore",
+    "MetricsSink",
+    "OptionAutocomplete",
+    "OptionCatalog",
+    "PersistentSelectorManager",
+    "PollResults",
+    "SelectorEvent",
+    "SelectionChain",
+    "SelectorRegistry",
+    "SessionState",
+    "SessionStore",
+    "SQLiteSessionStore",
+    "dynamic_autocomplete",
+    "dynamic_multi_select",
+    "dynamic_poll",
     "dynamic_select",
+    "edit_scheduler",
+    "selection_chain",
+    "selector_instrumentation",
+    "selector_registry",
 ]
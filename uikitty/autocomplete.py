@@ -0,0 +1,168 @@
+from collections import OrderedDict
+from typing import Any, Final, NamedTuple
+
+from discord import AutocompleteContext, OptionChoice
+
+from uikitty.option_store import OptionStore, truncate
+from uikitty.search_index import SearchIndex
+
+
+class _RecentQuery(NamedTuple):
+    query: str
+    matches: list[int]
+
+
+class OptionAutocomplete:
+    """Suggests options for a slash command option as the user types.
+
+    An instance of this class can be passed as the `autocomplete` argument of a Pycord
+    `Option`. For each keystroke, it searches a `SearchIndex` of the option keys and
+    returns (up to) 25 `OptionChoice` objects, ranked as in a `DynamicSelector` search:
+    word prefix matches first, then substring matches, then fuzzy matches.
+
+    Since each keystroke usually extends the previous query, each user's recent queries
+    are kept in a small cache if they have fewer than 25 (non-fuzzy) matches, i.e. if
+    all of their matches are known. If a new query starts with a cached one, only that
+    query's matches are searched again, instead of the entire index. Queries that are
+    shorter than `SearchIndex.MIN_SUBSTRING_LENGTH` characters only look for prefix
+    matches (which are cheap to find) and aren't cached. The cache holds the queries of
+    at most `max_users` users, and the least recently active users are discarded first.
+
+    Each choice's value is its option key (shortened to 100 characters if necessary),
+    which is what Discord passes to the command. Use `get_value()` to look up the value
+    of the corresponding option.
+    """
+
+    MAX_CHOICES: Final[int] = 25
+    MAX_CHOICE_LENGTH: Final[int] = 100
+    MAX_QUERIES_PER_USER: Final[int] = 4
+
+    def __init__(self, options: OptionStore, max_users: int = 1024) -> None:
+        """Initializes a new `OptionAutocomplete` instance.
+
+        Args:
+            options:
+                The options to suggest. The store must not be modified afterwards.
+            max_users:
+                The maximum number of users whose recent queries are kept.
+        """
+        self.options: Final[OptionStore] = options
+        self.search_index: Final[SearchIndex] = SearchIndex(options.keys)
+        self.max_users: int = max_users
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+
+        max_length = type(self).MAX_CHOICE_LENGTH
+        self._choice_names: Final[list[str]] = [
+            truncate(key, max_length) for key in options.keys
+        ]
+        self._indices_by_name: Final[dict[str, int]] = {}
+        for index, name in enumerate(self._choice_names):
+            self._indices_by_name.setdefault(name, index)
+
+        self._recent_queries: Final[
+            OrderedDict[int, list[_RecentQuery]]
+        ] = OrderedDict()
+
+    def get_stats(self) -> dict[str, int]:
+        """Returns the current values of all counters for this instance."""
+        return {
+            "users": len(self._recent_queries),
+            "hits": self.hit_count,
+            "misses": self.miss_count,
+        }
+
+    async def __call__(self, ctx: AutocompleteContext) -> list[OptionChoice]:
+        """Returns the choices for the value that the user has typed so far."""
+        user = ctx.interaction.user
+        return self.get_choices(str(ctx.value or ""), user.id if user else None)
+
+    def get_choices(self, query: str, user_id: int | None = None) -> list[OptionChoice]:
+        """Returns the choices that best match the given query.
+
+        Args:
+            query:
+                The text that the user has typed so far. If empty, the first options
+                are returned in their original order.
+            user_id:
+                The ID of the user who typed the query, whose recent queries may be
+                used to speed up the search. Optional.
+        """
+        return [
+            OptionChoice(self._choice_names[index])
+            for index in self.search(query, user_id)
+        ]
+
+    def search(self, query: str, user_id: int | None = None) -> list[int]:
+        """Returns the indices of the options that best match the given query."""
+        cls = type(self)
+
+        if not (query := query.strip().casefold()):
+            return list(range(min(len(self.options), cls.MAX_CHOICES)))
+
+        if len(query) < SearchIndex.MIN_SUBSTRING_LENGTH:
+            # These only find prefix matches, so they can't be refined into the matches
+            # for longer queries (which include substring matches as well).
+            return self.search_index.search(query, cls.MAX_CHOICES)
+
+        if (recent_query := self._find_recent_query(query, user_id)) is not None:
+            self.hit_count += 1
+            matches = self.search_index.refine(
+                query, recent_query.matches, cls.MAX_CHOICES
+            )
+        else:
+            self.miss_count += 1
+            matches = self.search_index.search(query, cls.MAX_CHOICES, fuzzy=False)
+
+        if (user_id is not None) and (len(matches) < cls.MAX_CHOICES):
+            # Only complete sets of matches can be refined by later queries. These
+            # are also the queries that are the most expensive to answer from scratch,
+            # since the whole index had to be searched to find that few matches.
+            self._remember(user_id, _RecentQuery(query, matches))
+
+        return matches or self.search_index.find_similar(query, cls.MAX_CHOICES)
+
+    def get_value(self, choice: str, default: Any = None) -> Any:
+        """Returns the value of the option with the given choice value (i.e. its key).
+
+        Users may submit text that doesn't match any choice, in which case `default` is
+        returned. If several options have the same key, the first one's value is used.
+        """
+        if (index := self._indices_by_name.get(choice)) is None:
+            return default
+        return self.options.values[index]
+
+    def _find_recent_query(
+        self, query: str, user_id: int | None
+    ) -> _RecentQuery | None:
+        if (user_id is None) or not (
+            recent_queries := self._recent_queries.get(user_id)
+        ):
+            return None
+
+        best_query = None
+
+        for recent_query in recent_queries:
+            if query.startswith(recent_query.query) and (
+                (best_query is None)
+                or (len(recent_query.query) > len(best_query.query))
+            ):
+                best_query = recent_query
+
+        return best_query
+
+    def _remember(self, user_id: int, recent_query: _RecentQuery) -> None:
+        if (recent_queries := self._recent_queries.get(user_id)) is None:
+            recent_queries = []
+            self._recent_queries[user_id] = recent_queries
+        else:
+            self._recent_queries.move_to_end(user_id)
+            recent_queries[:] = [
+                entry for entry in recent_queries if entry.query != recent_query.query
+            ]
+
+        recent_queries.append(recent_query)
+        del recent_queries[: -type(self).MAX_QUERIES_PER_USER]
+
+        while len(self._recent_queries) > max(self.max_users, 1):
+            self._recent_queries.popitem(last=False)
@@ -1,17 +1,46 @@
-from collections.abc import Callable
+import asyncio
+import time
+from collections.abc import Callable, Sequence
 from typing import Any, Final
 
 from discord import Interaction
 from discord.ui import View
 
+from uikitty.edit_scheduler import EditScheduler, EditSender, edit_scheduler
+from uikitty.instrumentation import (
+    EventKind,
+    Instrumentation,
+    LoggingSink,
+    SelectorEvent,
+    selector_instrumentation,
+)
+from uikitty.option_store import OptionStore
+from uikitty.registry import SelectorRegistry, selector_registry
+from uikitty.resolver import Resolver
+
 
 class BaseSelector(View):
     """Base class for views that let the user pick from a set of predefined options."""
 
+    EVICTABLE: bool = True
+    LOGGED_EVENT_KINDS: Final[frozenset[EventKind]] = frozenset(
+        {
+            EventKind.LAYOUT_CHOSEN,
+            EventKind.FINISHED,
+            EventKind.POLL_CLOSED,
+            EventKind.ABANDONED,
+        }
+    )
+
     def __init__(
         self,
         log: Callable[[str], None] | None,
-        options: dict[str, Any],
+        options: OptionStore,
+        timeout: float | None = None,
+        resolver: Resolver | None = None,
+        registry: SelectorRegistry = selector_registry,
+        instrumentation: Instrumentation = selector_instrumentation,
+        scheduler: EditScheduler = edit_scheduler,
     ) -> None:
         """Initializes a new `BaseSelector` instance.
 
@@ -23,34 +52,211 @@ class BaseSelector(View):
                 A function that will be called to display information in the console.
                 Set to `None` to disable console output for this instance.
             options:
-                A dictionary that maps option keys (i.e. names/labels) to option values.
+                The `OptionStore` containing the keys (i.e. labels) and values of all
+                options. Components refer to options by their index in this store.
+            timeout:
+                The number of seconds to wait for user input before giving up. If this
+                elapses, the view's components will be disabled. Set to `None` to wait
+                indefinitely (or until this view is evicted from its `registry`).
+            resolver:
+                An async function that accepts the key of the selected option and
+                returns the value to use as this instance's `selected_value`. Optional.
+                If omitted, the value from the `options` store will be used instead.
+            registry:
+                The `SelectorRegistry` that will keep track of this instance while it's
+                waiting for user input. Defaults to the process-wide registry.
+            instrumentation:
+                The `Instrumentation` that will receive the events reported by this
+                instance. Defaults to the process-wide instrumentation.
+            scheduler:
+                The `EditScheduler` through which this instance sends message edits
+                that don't respond to an interaction. Defaults to the process-wide one.
         """
-        super().__init__(timeout=None)
-
-        def _log(message: str) -> None:
-            if log:
-                log(message)
+        super().__init__(timeout=timeout, disable_on_timeout=True)
 
-        self.log: Final[Callable[[str], None]] = _log
-        self.options: Final[dict[str, Any]] = options
+        self.log: Final[Callable[[str], None] | None] = log
+        self.log_sink: Final[LoggingSink | None] = (
+            LoggingSink(log, kinds=type(self).LOGGED_EVENT_KINDS) if log else None
+        )
+        self.options: Final[OptionStore] = options
+        self.resolver: Final[Resolver | None] = resolver
+        self.selected_indices: Sequence[int] | None = None
         self.selected_value: Any = None
+        self.resolver_error: Exception | None = None
+        self.finish_interaction: Interaction | None = None
+        self.defers_finish: bool = True
+        self.registry: Final[SelectorRegistry] = registry
+        self.instrumentation: Final[Instrumentation] = instrumentation
+        self.scheduler: Final[EditScheduler] = scheduler
+        self.is_evicted: bool = False
+        self.start_time: float = time.perf_counter()
+        self.interaction_count: int = 0
+
+        registry.register(self)
+        self.emit(EventKind.CREATED, option_count=len(options))
+
+    async def prepare(self) -> None:
+        """Performs any asynchronous setup that must happen before this view is shown.
+
+        The default implementation does nothing. Subclasses that rely on asynchronous
+        setup (e.g. loading the first page of a `Paginator`) should override this.
+        """
+
+    def mark_shown(self) -> None:
+        """Records that this view was just shown to the user.
+
+        The elapsed times of subsequent events (e.g. the time it takes the user to make
+        a selection) will be measured from this point instead of from creation.
+        """
+        self.start_time = time.perf_counter()
 
-    async def finish(self, selected_key: str, interaction: Interaction) -> None:
-        """Sets this instance's `selected_value` to the value for the `selected_key`.
+    def emit(self, kind: EventKind, **data: Any) -> None:
+        """Reports an event to this instance's `log_sink` and `instrumentation`.
 
-        Subclasses should rely on this method to call `stop()` and ensure
-        that an appropriate value is available for subsequent consumers.
+        The event is only created if it will actually be received by a sink, i.e. if any
+        sinks are installed on the `instrumentation`, or if the `log_sink` logs events
+        of this kind. Otherwise, calling this method is (nearly) free.
 
         Args:
-            selected_key:
-                The `options` dictionary key for the item that was selected by the user.
+            kind:
+                What happened.
+            **data:
+                Additional details that depend on the `kind` of event.
+        """
+        log_sink = self.log_sink
+        if log_sink and not log_sink.accepts(kind):
+            log_sink = None
+        if not (log_sink or self.instrumentation.sinks):
+            return
+
+        event = SelectorEvent(
+            kind=kind,
+            selector_id=self.id,
+            timestamp=time.time(),
+            elapsed_seconds=time.perf_counter() - self.start_time,
+            interaction_count=self.interaction_count,
+            data=data,
+        )
+        if log_sink:
+            log_sink(event)
+        self.instrumentation.emit(event)
+
+    async def schedule_edit(self, channel_id: int | None, send: EditSender) -> None:
+        """Sends an edit to the message that displays this view via its `scheduler`.
+
+        Edits that respond to an interaction should be sent directly instead, since
+        they must be sent within 3 seconds.
+
+        Args:
+            channel_id:
+                The ID of the channel that contains the message, if known.
+            send:
+                An async function that sends the edit. It won't be called if a newer
+                edit for this view is scheduled before it's sent.
+        """
+        await self.scheduler.submit(channel_id, self.id, send)
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        """Marks this instance as recently active in its registry. Always succeeds."""
+        self.interaction_count += 1
+        self.registry.touch(self)
+        return True
+
+    async def on_timeout(self) -> None:
+        """Removes this instance from its registry and disables its components."""
+        self.registry.unregister(self, expired=True)
+        self.emit(EventKind.ABANDONED, reason="timeout")
+        await super().on_timeout()
+
+    def evict(self) -> None:
+        """Stops this instance without a selection, e.g. to make room in a registry."""
+        self.is_evicted = True
+        self.emit(EventKind.ABANDONED, reason="evicted")
+        self.stop()
+
+    def stop(self) -> None:
+        """Removes this instance from its registry and stops listening for input."""
+        self.registry.unregister(self)
+        super().stop()
+
+    async def finish(self, selected_index: int, interaction: Interaction) -> None:
+        """Sets this instance's `selected_value` to the value of the selected option.
+
+        Subclasses should rely on this method (or `finish_many()`) to call `stop()` and
+        ensure that an appropriate value is available for subsequent consumers.
+
+        If this instance has a `resolver`, it will be awaited to obtain the value of the
+        selected option. Any exception that it raises is stored in `resolver_error`.
+
+        The interaction is acknowledged (deferred) unless `defers_finish` is disabled.
+        In that case, it's stored in `finish_interaction` so that the caller can use it
+        to respond (e.g. with the next view) instead, and must do so within 3 seconds.
+
+        Args:
+            selected_index:
+                The index in this instance's `options` of the item selected by the user.
+            interaction:
+                The `Interaction` on the UI component that triggered this method call.
+
+        Raises:
+            IndexError: If `selected_index` is out of range for this instance's options.
+        """
+        await self._finish([selected_index], interaction, is_multiple=False)
+
+    async def finish_many(
+        self, selected_indices: Sequence[int], interaction: Interaction
+    ) -> None:
+        """Sets this instance's `selected_value` to a list of the selected values.
+
+        This is the equivalent of `finish()` for views that allow multiple selections.
+        If this instance has a `resolver`, it will be awaited for each selected option.
+
+        Args:
+            selected_indices:
+                The indices in this instance's `options` of the items selected by the
+                user, in the order in which their values should be listed.
             interaction:
                 The `Interaction` on the UI component that triggered this method call.
 
         Raises:
-            KeyError: If `selected_key` is not in this instance's `options` dictionary.
+            IndexError: If any index is out of range for this instance's options.
         """
-        await interaction.response.defer()
-        self.log(f"└── {interaction.user} selected '{selected_key}'.")
-        self.selected_value = self.options[selected_key]
+        await self._finish(selected_indices, interaction, is_multiple=True)
+
+    async def _finish(
+        self, indices: Sequence[int], interaction: Interaction, is_multiple: bool
+    ) -> None:
+        is_repeated = self.selected_indices is not None
+
+        if is_repeated or self.defers_finish:
+            await interaction.response.defer()
+        if is_repeated:
+            return  # A previous selection is still being resolved.
+
+        self.finish_interaction = interaction
+        keys = [self.options.keys[index] for index in indices]
+        self.selected_indices = indices
+
+        if self.resolver:
+            try:
+                values = await asyncio.gather(*map(self.resolver, keys))
+            except Exception as error:
+                values = []
+                self.resolver_error = error
+        else:
+            values = [self.options.values[index] for index in indices]
+
+        if is_multiple:
+            self.selected_value = values
+            selection_data: dict[str, Any] = {"selected_count": len(values)}
+        else:
+            self.selected_value = values[0] if values else None
+            selection_data = {"selected_key": keys[0]}
+
+        self.emit(
+            EventKind.FINISHED,
+            user=str(interaction.user),
+            user_id=interaction.user.id if interaction.user else None,
+            **selection_data,
+        )
         self.stop()
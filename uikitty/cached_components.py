@@ -0,0 +1,138 @@
+import inspect
+from collections import OrderedDict
+from typing import Any, Final, TypeVar
+
+from discord import SelectOption
+from discord.components import Component
+from discord.ui import Button, Select
+
+_ComponentClass = TypeVar("_ComponentClass", bound=type)
+
+# Settable attributes of Pycord components that aren't part of their payloads.
+_UNSERIALIZED_ATTRIBUTES: Final[frozenset[str]] = frozenset({"row", "view", "modal"})
+
+
+def _invalidating(attribute: Any, is_options: bool = False) -> Any:
+    # Wraps an attribute of a Pycord component so that changing its value discards the
+    # cached payload of the component. Setting it to its current value has no effect.
+    def set_value(component: Any, value: Any) -> None:
+        if is_options:
+            if value is not attribute.__get__(component):
+                attribute.__set__(component, value)
+                component._has_new_options = True
+        elif value != attribute.__get__(component):
+            attribute.__set__(component, value)
+            component._payload = None
+
+    return property(attribute.__get__, set_value, doc=attribute.__doc__)
+
+
+def _invalidate_on_change(component_class: _ComponentClass) -> _ComponentClass:
+    # Wraps every settable attribute that the class inherits from Pycord (including any
+    # that are added in later versions), so that none of them can leave a stale payload.
+    for name, attribute in inspect.getmembers(component_class):
+        if (
+            isinstance(attribute, property)
+            and attribute.fset
+            and (name not in _UNSERIALIZED_ATTRIBUTES)
+        ):
+            setattr(
+                component_class,
+                name,
+                _invalidating(attribute, is_options=(name == "options")),
+            )
+    return component_class
+
+
+@_invalidate_on_change
+class CachedButton(Button):
+    """A `Button` that reuses its serialized form until one of its attributes changes.
+
+    Pycord serializes every component of a view each time the view is sent, even though
+    most of them usually look the same as before. This class keeps its last payload and
+    only builds a new one after any of its attributes (e.g. `label`, `style`, or
+    `disabled`) have been set to a different value. Payloads are never modified after
+    they've been returned, so they can also be compared by identity to tell whether a
+    component has changed since it was last sent.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initializes a new `CachedButton` with the same arguments as a `Button`."""
+        super().__init__(**kwargs)
+        self._payload: dict[str, Any] | None = None
+
+    def to_component_dict(self) -> dict[str, Any]:  # type: ignore[override]
+        """Returns the payload that represents this button, reusing it if possible."""
+        if self._payload is None:
+            self._payload = dict(super().to_component_dict())
+        return self._payload
+
+    def refresh_component(self, button: Component) -> None:
+        """Replaces the underlying component and discards the cached payload."""
+        super().refresh_component(button)  # type: ignore[arg-type]
+        self._payload = None
+
+
+@_invalidate_on_change
+class CachedSelect(Select):
+    """A `Select` that reuses its serialized form until one of its attributes changes.
+
+    This works like a `CachedButton`, except that the options of this dropdown menu are
+    compared by identity instead of by value, so they must be replaced with a different
+    list (rather than modified in place) in order to change them. The serialized forms
+    of the most recently displayed lists of options are kept as well, so that they can
+    be reused when a list (e.g. a shared page of options) is displayed again.
+    """
+
+    MAX_CACHED_OPTION_LISTS: Final[int] = 4
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Initializes a new `CachedSelect` with the same arguments as a `Select`."""
+        super().__init__(**kwargs)
+        self._payload: dict[str, Any] | None = None
+        self._has_new_options: bool = False
+        self._option_payloads: Final[
+            OrderedDict[int, tuple[list[SelectOption], list[dict[str, Any]]]]
+        ] = OrderedDict()
+
+    def to_component_dict(self) -> dict[str, Any]:  # type: ignore[override]
+        """Returns the payload that represents this menu, reusing it if possible."""
+        if self._payload is None:
+            self._payload = dict(super().to_component_dict())
+            self._remember_option_payloads(self.options, self._payload["options"])
+        elif self._has_new_options:
+            option_payloads = self._get_option_payloads(self.options)
+            self._payload = {**self._payload, "options": option_payloads}
+
+        self._has_new_options = False
+        return self._payload
+
+    def refresh_component(self, component: Component) -> None:
+        """Replaces the underlying component and discards the cached payload."""
+        super().refresh_component(component)  # type: ignore[arg-type]
+        self._payload = None
+
+    def append_option(self, option: SelectOption) -> "CachedSelect":
+        """Appends an option to this menu (in place) and discards the cached payload."""
+        super().append_option(option)
+        self._payload = None
+        return self
+
+    def _get_option_payloads(self, options: list[SelectOption]) -> list[dict[str, Any]]:
+        if (entry := self._option_payloads.get(id(options))) and (entry[0] is options):
+            self._option_payloads.move_to_end(id(options))
+            return entry[1]
+
+        option_payloads = [dict(option.to_dict()) for option in options]
+        self._remember_option_payloads(options, option_payloads)
+        return option_payloads
+
+    def _remember_option_payloads(
+        self, options: list[SelectOption], option_payloads: list[dict[str, Any]]
+    ) -> None:
+        # Keeping a reference to the list ensures that its ID isn't reused for another.
+        self._option_payloads[id(options)] = (options, option_payloads)
+        self._option_payloads.move_to_end(id(options))
+
+        while len(self._option_payloads) > type(self).MAX_CACHED_OPTION_LISTS:
+            self._option_payloads.popitem(last=False)
@@ -1,13 +1,20 @@
 import functools
 import math
-from collections.abc import Callable
-from typing import Any, Final
+from collections.abc import Callable, Sequence
+from typing import Final
 
 from discord import ApplicationContext, ButtonStyle, Interaction, SelectOption
 from discord.ui import Button, Select
 
 from uikitty.base_selector import BaseSelector
+from uikitty.instrumentation import EventKind
+from uikitty.layout_cache import LayoutCache, PageLayout, Partition
+from uikitty.layout_planner import LayoutPlan, LayoutPlanner
+from uikitty.multi_paginator import MultiPaginator
+from uikitty.option_source import OptionSource
+from uikitty.option_store import OptionStore, truncate
 from uikitty.paginator import Paginator
+from uikitty.resolver import Resolver
 
 
 class DynamicSelector(BaseSelector):
@@ -16,6 +23,7 @@ class DynamicSelector(BaseSelector):
     MAX_ENTRIES_PER_PAGE: Final[int] = 25
     MAX_BUTTONS_PER_ROW: Final[int] = 5
     MIN_OPTIONS: Final[int] = 2
+    DENSE_PARTITIONS: Final[tuple[Partition, ...]] = ("position", "alphabetical")
 
     def __init__(
         self,
@@ -23,7 +31,14 @@ class DynamicSelector(BaseSelector):
         button_style: ButtonStyle,
         select_placeholder: str | None,
         log: Callable[[str], None] | None,
-        options: dict[str, Any],
+        options: OptionStore | OptionSource,
+        jump_navigation: bool = False,
+        timeout: float | None = None,
+        layout_cache: LayoutCache | None = None,
+        resolver: Resolver | None = None,
+        multi_select: bool = False,
+        partition: Partition = "position",
+        dense_layout: bool = False,
     ) -> None:
         """Initializes a new `DynamicSelector` instance.
 
@@ -32,66 +47,242 @@ class DynamicSelector(BaseSelector):
                 The context for the application command that prompted this selection.
             button_style:
                 The `ButtonStyle` to use for the option `Button` components.
-                Only applicable if there are between 2 and 5 options (inclusive).
+                Only applicable if there are between 2 and 5 options (inclusive), or if
+                `dense_layout` is enabled.
             select_placeholder:
                 The placeholder text to display in the `Select` (dropdown) component.
-                Only applicable if there are between 6 and 25 options (inclusive).
+                Only applicable if there are between 6 and 25 options (inclusive), or
+                if `dense_layout` is enabled.
             log:
                 A function that will be called to display information in the console.
                 Set to `None` to disable console output for this instance.
             options:
-                A dictionary that maps option keys (i.e. names/labels) to option values.
+                An `OptionStore` containing the keys (i.e. names/labels) and values of
+                all options, or an `OptionSource` that will load them on demand. In the
+                latter case, the source's estimated count will determine the layout.
+            jump_navigation:
+                Whether to display an additional dropdown menu of page ranges that can
+                be used to jump directly to any page. Only applicable if there are more
+                than 25 options, and they're not provided by an `OptionSource`.
+            timeout:
+                The number of seconds to wait for user input before giving up.
+                Set to `None` to wait indefinitely.
+            layout_cache:
+                A `LayoutCache` from which to reuse the pages and `SelectOption` items
+                built by previous instances with the same option keys. Optional. Only
+                applicable if the options are not provided by an `OptionSource`.
+            resolver:
+                An async function that accepts the key of the selected option and
+                returns its value. Optional. If provided, it's only awaited once the
+                user has made a selection, and the values in `options` are ignored.
+            multi_select:
+                Whether to let the user select any number of options instead of one.
+                If enabled, the options are always displayed in a `MultiPaginator`, and
+                this view's `selected_value` will be a list of the selected values.
+            partition:
+                How to order the options and divide them into pages (see `PageLayout`).
+                Only applicable if there are more than 5 options (or `multi_select` is
+                enabled), and they're not provided by an `OptionSource`.
+            dense_layout:
+                Whether to consider layouts with up to 5 rows of buttons and/or several
+                dropdown menus (see `LayoutPlanner`), so that options can be selected
+                in fewer clicks. Up to 25 options are then displayed as buttons, and
+                up to 125 options without pagination. Only applicable to single
+                selections whose options are in their original or alphabetical order.
 
         Raises:
             ValueError: If fewer than `2` options are provided.
         """
-        super().__init__(log=log, options=options)
         cls = type(self)
+        source = options if isinstance(options, OptionSource) else None
+        store = options.store if isinstance(options, OptionSource) else options
+        option_count = source.estimated_count if source else len(store)
 
-        match len(self.options):
-            case n if n > cls.MAX_ENTRIES_PER_PAGE:
+        # Checked before `super().__init__()`, which registers this instance.
+        if option_count < cls.MIN_OPTIONS:
+            raise ValueError(f"At least {cls.MIN_OPTIONS} options are required.")
+
+        super().__init__(
+            log=log,
+            options=store,
+            timeout=timeout,
+            resolver=resolver,
+        )
+        self.paginator: Paginator | None = None
+        self.paginator_class: Final[type[Paginator]] = (
+            MultiPaginator if multi_select else Paginator
+        )
+        self.layout_cache: Final[LayoutCache | None] = layout_cache
+        self.partition: Final[Partition] = partition
+        layout_prefix = "multi_" if multi_select else ""
+
+        match option_count:
+            case n if (n > cls.MAX_ENTRIES_PER_PAGE) and source:
                 page_count = math.ceil(n / cls.MAX_ENTRIES_PER_PAGE)
-                self.log(
-                    f"Setting up a paginated selector with {n} "
-                    f"options spread across {page_count} pages."
+                self._setup_streaming_paginator(source, page_count)
+                self._emit_layout(
+                    f"streaming_{layout_prefix}paginator",
+                    n,
+                    LayoutPlanner.plan_paginator(page_count),
+                )
+            case n if multi_select:
+                page_count = self._setup_paginator(
+                    math.ceil(n / cls.MAX_ENTRIES_PER_PAGE), jump_navigation
                 )
-                self._setup_paginator(ctx, page_count)
-            case n if n > cls.MAX_BUTTONS_PER_ROW:
-                self.log(f"Setting up a simple dropdown menu with {n} options.")
-                self._setup_simple_select(select_placeholder)
-            case n if n >= cls.MIN_OPTIONS:
-                self.log(f"Setting up an action row of {n} buttons.")
-                self._setup_simple_buttons(button_style)
-            case _:
-                raise ValueError(f"At least {cls.MIN_OPTIONS} options are required.")
-
-    def _setup_simple_buttons(self, style: ButtonStyle) -> None:
-        for key in self.options:
-            button = Button(style=style, label=key)
-            button.callback = functools.partial(self.finish, button.label)
+                self._emit_layout(
+                    "multi_paginator",
+                    n,
+                    LayoutPlanner.plan_paginator(page_count, jump_navigation),
+                )
+            case n:
+                plan = LayoutPlanner.plan(
+                    n,
+                    dense=dense_layout and (partition in cls.DENSE_PARTITIONS),
+                    jump_navigation=jump_navigation,
+                )
+                match plan.layout:
+                    case "paginator":
+                        page_count = self._setup_paginator(
+                            plan.page_count, jump_navigation
+                        )
+                        plan = LayoutPlanner.plan_paginator(page_count, jump_navigation)
+                    case "select":
+                        self._setup_simple_select(select_placeholder)
+                    case _:
+                        self._setup_grid(plan, button_style, select_placeholder)
+                self._emit_layout(plan.layout, n, plan)
+
+    async def prepare(self) -> None:
+        """Loads the first page of options if this instance uses a `Paginator`."""
+        if self.paginator:
+            await self.paginator.prepare()
+
+    def _emit_layout(self, layout: str, option_count: int, plan: LayoutPlan) -> None:
+        self.emit(
+            EventKind.LAYOUT_CHOSEN,
+            layout=layout,
+            option_count=option_count,
+            page_count=plan.page_count,
+            button_count=plan.button_count,
+            select_count=plan.select_count,
+            expected_clicks=round(plan.expected_clicks, 3),
+        )
+
+    def _setup_grid(
+        self, plan: LayoutPlan, style: ButtonStyle, placeholder: str | None
+    ) -> None:
+        cls = type(self)
+        indices: Sequence[int] = range(len(self.options))
+
+        if (plan.row_count > 1) and (self.partition == "alphabetical"):
+            folded_keys = [key.casefold() for key in self.options.keys]
+            indices = sorted(indices, key=folded_keys.__getitem__)
+
+        for position, index in enumerate(indices[: plan.button_count]):
+            button = Button(
+                style=style,
+                label=self.options.get_button_label(index),
+                row=(
+                    (position // cls.MAX_BUTTONS_PER_ROW)
+                    if (plan.row_count > 1)
+                    else None
+                ),
+            )
+            button.callback = functools.partial(self.finish, index)
             self.add_item(button)
 
+        select_indices = indices[plan.button_count :]
+        first_select_row = plan.row_count - plan.select_count
+
+        for select_index in range(plan.select_count):
+            # Divide the remaining options evenly between the dropdown menus.
+            start = (select_index * len(select_indices)) // plan.select_count
+            end = ((select_index + 1) * len(select_indices)) // plan.select_count
+            self._add_grid_select(
+                select_indices[start:end], first_select_row + select_index, placeholder
+            )
+
+    def _add_grid_select(
+        self, indices: Sequence[int], row: int, placeholder: str | None
+    ) -> None:
+        first_key = self.options.keys[indices[0]]
+        last_key = self.options.keys[indices[-1]]
+        label = (
+            Paginator.get_range_label(first_key, last_key)
+            if (self.partition == "alphabetical")
+            else f"{indices[0] + 1}–{indices[-1] + 1}"
+        )
+        select = Select(
+            placeholder=truncate(
+                f"[{label}] {placeholder}" if placeholder else f"Options {label}",
+                Paginator.MAX_PLACEHOLDER_LENGTH,
+            ),
+            options=[self.options.get_select_option(index) for index in indices],
+            row=row,
+        )
+
+        async def callback(interaction: Interaction) -> None:
+            await self.finish(int(select.values[0]), interaction)
+
+        select.callback = callback
+        self.add_item(select)
+
+    def _get_page_layout(self, page_count: int) -> PageLayout:
+        if self.layout_cache:
+            return self.layout_cache.get(self.options.keys, page_count, self.partition)
+        return PageLayout(self.options.keys, page_count, self.partition)
+
     def _setup_simple_select(self, placeholder: str | None) -> None:
         select = Select(
-            placeholder=placeholder,
-            options=[SelectOption(label=key) for key in self.options],
+            placeholder=placeholder, options=self._get_page_layout(1).get_page(0)
         )
 
         async def callback(interaction: Interaction) -> None:
-            await self.finish(select.values[0], interaction)
+            await self.finish(int(select.values[0]), interaction)
 
         select.callback = callback
         self.add_item(select)
 
-    def _setup_paginator(self, ctx: ApplicationContext, page_count: int) -> None:
-        option_keys = list(self.options)
-        quot, rmdr = divmod(len(self.options), page_count)
+    def _setup_paginator(self, page_count: int, jump_navigation: bool) -> int:
+        page_layout = self._get_page_layout(page_count)
+        page_count = page_layout.page_count  # Grouped options may need more pages.
+
+        def get_range_label(first_page_index: int, last_page_index: int) -> str:
+            return page_layout.get_range_label(
+                first_page_index, last_page_index, Paginator.get_range_label
+            )
+
+        def get_page_label(page_index: int) -> str:
+            return get_range_label(page_index, page_index)
+
+        self.paginator = self.paginator_class(
+            page_layout.get_page,
+            page_count,
+            search_index=page_layout.get_search_index if (page_count > 1) else None,
+            range_labeler=get_range_label if jump_navigation else None,
+            page_labeler=(
+                get_page_label
+                if (page_layout.partition != "position") and (page_count > 1)
+                else None
+            ),
+        )
+        self.paginator.attach(self)
+        return page_count
+
+    def _setup_streaming_paginator(self, source: OptionSource, page_count: int) -> None:
+        page_size = type(self).MAX_ENTRIES_PER_PAGE
 
-        def get_options(start: int, end: int) -> list[SelectOption]:
-            return [SelectOption(label=key) for key in option_keys[start:end]]
+        async def get_options(page_index: int) -> list[SelectOption]:
+            start = page_index * page_size
+            # Load one extra option to find out whether there's a next page.
+            await source.ensure(start + page_size + 1)
+            source.prefetch(start + (2 * page_size) + 1)
+            paginator.page_count = max(
+                math.ceil(source.estimated_count / page_size), page_index + 1
+            )
+            indices = range(start, min(start + page_size, len(source.store)))
+            return list(map(source.store.get_select_option, indices))
 
-        options_by_page = [
-            get_options((i * quot) + min(i, rmdr), ((i + 1) * quot) + min(i + 1, rmdr))
-            for i in range(page_count)
-        ]
-        Paginator(*options_by_page).attach(self, ctx)
+        paginator = self.paginator_class(get_options, page_count)
+        paginator.attach(self)
+        self.paginator = paginator
@@ -0,0 +1,211 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Final
+
+from uikitty.instrumentation import (
+    EventKind,
+    Instrumentation,
+    SelectorEvent,
+    selector_instrumentation,
+)
+
+EditSender = Callable[[], Awaitable[Any]]
+
+
+class _TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_time")
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate: Final[float] = rate
+        self.capacity: Final[int] = capacity
+        self.tokens: float = capacity
+        self.updated_time: float = time.monotonic()
+
+    def get_delay(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + ((now - self.updated_time) * self.rate)
+        )
+        self.updated_time = now
+        return 0 if (self.tokens >= 1) else ((1 - self.tokens) / self.rate)
+
+
+class _QueuedEdit:
+    __slots__ = ("send", "futures", "queued_time", "merged_count")
+
+    def __init__(self, send: EditSender, future: asyncio.Future[None]) -> None:
+        self.send: EditSender = send
+        self.futures: Final[list[asyncio.Future[None]]] = [future]
+        self.queued_time: Final[float] = time.monotonic()
+        self.merged_count: int = 0
+
+
+class _ChannelQueue:
+    __slots__ = ("bucket", "edits", "worker")
+
+    def __init__(self, bucket: _TokenBucket) -> None:
+        self.bucket: Final[_TokenBucket] = bucket
+        self.edits: Final[OrderedDict[str, _QueuedEdit]] = OrderedDict()
+        self.worker: asyncio.Task[None] | None = None
+
+
+class EditScheduler:
+    """Sends message edits in each channel at a rate that stays within Discord's limits.
+
+    Each channel has a token bucket that allows a burst of `burst` edits, and then one
+    edit every `1 / rate` seconds. Edits that exceed this rate are queued and sent in
+    order. If another edit to the same message is submitted while one is still queued,
+    only the newest one is sent, and every caller is notified once it has been sent.
+    As a result, many open selectors in a busy channel cause a steady trickle of edits,
+    instead of a burst that triggers rate limits (and the ensuing backoff).
+
+    This only applies to edits that don't respond to an interaction, since those must
+    be sent within 3 seconds and aren't subject to the same limits. The counters on this
+    class (and the `EDIT_SENT` events reported to its `instrumentation`) can be used to
+    monitor queue depth and the time that edits spend waiting.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 5,
+        instrumentation: Instrumentation = selector_instrumentation,
+    ) -> None:
+        """Initializes a new `EditScheduler` instance.
+
+        Args:
+            rate:
+                The number of edits per second that may be sent to each channel, once
+                its burst allowance has been used up.
+            burst:
+                The number of edits that may be sent to an idle channel at once.
+            instrumentation:
+                The `Instrumentation` that will receive an event for each sent edit.
+                Defaults to the process-wide instrumentation.
+        """
+        self.rate: float = rate
+        self.burst: int = burst
+        self.instrumentation: Final[Instrumentation] = instrumentation
+        self.sent_count: int = 0
+        self.merged_count: int = 0
+        self.total_wait_seconds: float = 0
+        self.max_wait_seconds: float = 0
+        self._channels: Final[dict[int | None, _ChannelQueue]] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of edits that are currently waiting to be sent."""
+        return sum(len(channel.edits) for channel in self._channels.values())
+
+    def get_stats(self) -> dict[str, float]:
+        """Returns the current values of all counters for this scheduler."""
+        return {
+            "queued": self.queue_depth,
+            "sent": self.sent_count,
+            "merged": self.merged_count,
+            "total_wait_seconds": self.total_wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+    async def submit(
+        self, channel_id: int | None, message_key: str, send: EditSender
+    ) -> None:
+        """Queues an edit and waits until it (or a newer edit to its message) is sent.
+
+        Args:
+            channel_id:
+                The ID of the channel that contains the message, if known.
+            message_key:
+                A string that identifies the message to edit (e.g. the ID of the view
+                that it displays). Queued edits with the same key are merged.
+            send:
+                An async function that sends the edit. It may not be called at all if
+                a newer edit to the same message is submitted before it's sent.
+
+        Raises:
+            Exception: Any exception raised while sending the edit.
+        """
+        if (channel := self._channels.get(channel_id)) is None:
+            channel = _ChannelQueue(_TokenBucket(self.rate, self.burst))
+            self._channels[channel_id] = channel
+
+        future = asyncio.get_running_loop().create_future()
+
+        if edit := channel.edits.get(message_key):
+            edit.send = send
+            edit.futures.append(future)
+            edit.merged_count += 1
+            self.merged_count += 1
+        else:
+            channel.edits[message_key] = _QueuedEdit(send, future)
+
+        if channel.worker is None:
+            channel.worker = asyncio.create_task(self._drain(channel_id, channel))
+
+        await future
+
+    async def _drain(self, channel_id: int | None, channel: _ChannelQueue) -> None:
+        try:
+            while channel.edits:
+                if (delay := channel.bucket.get_delay()) > 0:
+                    await asyncio.sleep(delay)
+                    continue
+
+                channel.bucket.tokens -= 1
+                message_key, edit = channel.edits.popitem(last=False)
+                await self._send(channel_id, message_key, edit)
+        finally:
+            channel.worker = None
+            # Keep the channel's bucket around until it's full again, so that the
+            # rate limit still applies to the next edit if it comes in soon.
+            refill_seconds = self.burst / self.rate
+            asyncio.get_running_loop().call_later(
+                refill_seconds, self._discard_if_idle, channel_id, channel
+            )
+
+    async def _send(
+        self, channel_id: int | None, message_key: str, edit: _QueuedEdit
+    ) -> None:
+        wait_seconds = time.monotonic() - edit.queued_time
+        self.sent_count += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+        try:
+            await edit.send()
+        except Exception as error:
+            for future in edit.futures:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for future in edit.futures:
+                if not future.done():
+                    future.set_result(None)
+
+        if self.instrumentation.sinks:
+            self.instrumentation.emit(
+                SelectorEvent(
+                    kind=EventKind.EDIT_SENT,
+                    selector_id=message_key,
+                    timestamp=time.time(),
+                    elapsed_seconds=wait_seconds,
+                    interaction_count=0,
+                    data={
+                        "channel_id": channel_id,
+                        "merged_count": edit.merged_count,
+                        "queue_depth": self.queue_depth,
+                    },
+                )
+            )
+
+    def _discard_if_idle(self, channel_id: int | None, channel: _ChannelQueue) -> None:
+        if (channel.worker is None) and (self._channels.get(channel_id) is channel):
+            channel.bucket.get_delay()  # Refill the bucket as of now.
+            if channel.bucket.tokens >= channel.bucket.capacity:
+                del self._channels[channel_id]
+
+
+edit_scheduler: Final[EditScheduler] = EditScheduler()
+"""The default scheduler, through which every selector sends its message edits."""
@@ -7,12 +7,24 @@ All functions in this module must be thoroughly documented and (relatively) easy
 and should (if feasible/applicable) provide reasonable options for user customization.
 """
 
-from collections.abc import Callable
+import asyncio
+import functools
+from collections.abc import AsyncIterable, Callable
 from typing import Any
 
 from discord import ApplicationContext, ButtonStyle, Embed
 
+from uikitty.autocomplete import OptionAutocomplete
+from uikitty.base_selector import BaseSelector
 from uikitty.dynamic_selector import DynamicSelector
+from uikitty.instrumentation import EventKind
+from uikitty.layout_cache import LayoutCache, Partition
+from uikitty.option_catalog import OptionCatalog
+from uikitty.option_source import OptionItem, OptionSource, PagedFetcher
+from uikitty.option_store import OptionStore
+from uikitty.poll_selector import PollResults, PollSelector
+from uikitty.resolver import Resolver
+from uikitty.selection_chain import SelectionChain
 
 
 async def dynamic_select(
@@ -23,6 +35,14 @@ async def dynamic_select(
     button_style: ButtonStyle = ButtonStyle.secondary,
     select_placeholder: str | None = None,
     log: Callable[[str], None] | None = print,
+    source: AsyncIterable[OptionItem] | PagedFetcher | OptionCatalog | None = None,
+    count_hint: int | None = None,
+    jump_navigation: bool = False,
+    partition: Partition = "position",
+    dense_layout: bool = False,
+    timeout: float | None = None,
+    layout_cache: LayoutCache | None = None,
+    resolver: Resolver | None = None,
     **kwargs: Any,
 ) -> Any:
     """Displays a collection of options and returns the one selected by the user.
@@ -44,23 +64,300 @@ async def dynamic_select(
           in a single `Select` component. This function will return the selected option
           (or its value) once the user clicks an item in the dropdown menu.
 
-        - If there are **26 or more** options, they will be evenly divided into pages
-          and displayed in a composite `Paginator` view. This function will return the
-          selected option (or its value) once the user selects it (using the `Select`
-          component) and confirms their choice (using the central `Button` component).
+        - If there are **26 or more** options, they will be divided into pages (evenly,
+          unless `partition` groups them) and displayed in a composite `Paginator` view.
+          This function will return the selected option (or its value) once the user
+          selects it (using the `Select` component) and confirms their choice (using
+          the central `Button` component).
+
+        If the options are provided via `source`, the first page of options will be
+        displayed as soon as it has been loaded, and the remaining options will be
+        loaded in the background (or as the user navigates to them). In this case,
+        `count_hint` is used to estimate the number of pages that will be displayed.
+
+        If `dense_layout` is enabled, up to 25 options are displayed as a grid of
+        buttons (with up to 5 rows), and up to 125 options are displayed as a
+        combination of button rows and `Select` components instead of a `Paginator`,
+        depending on which layout takes the fewest clicks per selection on average.
+
+        Option labels don't need to be unique, and labels that are too long to display
+        (more than 100 characters in a dropdown menu, or 80 characters on a button)
+        will be shortened with an ellipsis. Either way, the correct option is returned.
 
     Args:
         ctx:
             The context for the application command that prompted this selection.
         *args:
             An ordered collection of option strings.
+            Cannot be used alongside `**kwargs` or `source`.
+        content:
+            The text content to display in the message with the selector view.
+            Optional. May be used alongside `embed`.
+        embed:
+            An embed to display in the message with the selector view.
+            Optional. May be used alongside `content`.
+        button_style:
+            The `ButtonStyle` to use for the option `Button` components.
+            Only applicable if there are between 2 and 5 options (inclusive).
+        select_placeholder:
+            The placeholder text to display in the `Select` (dropdown) component.
+            Only applicable if there are between 6 and 25 options (inclusive).
+        log:
+            A function that will be called to display debug information in the console.
+            Set to `None` to disable console output for this function call. To collect
+            structured events and metrics instead, install a sink (such as a
+            `LoggingSink` or a `MetricsSink`) on `selector_instrumentation`.
+        source:
+            An `AsyncIterable` of options, or an async function that accepts an `offset`
+            and a `limit` and returns (at most) that many options. Each option may be
+            an option string, or a `tuple` containing an option label and its value.
+            Alternatively, an `OptionCatalog`, whose options are treated as if they
+            were provided via `**kwargs`. Cannot be used alongside `*args` or
+            `**kwargs`.
+        count_hint:
+            The expected total number of options provided by `source`. Optional.
+            Only applicable if `source` is provided (and isn't an `OptionCatalog`).
+        jump_navigation:
+            Whether to display an extra dropdown menu that lists ranges of pages, which
+            can be used to reach any page in a few selections instead of stepping
+            through each page in turn. Best suited for large, alphabetically sorted
+            collections of options. Only applicable if there are 26 or more options
+            and they are provided via `*args` or `**kwargs`.
+        partition:
+            How to order the options and divide them into pages. By default, options
+            keep their order and are divided evenly. Set to `"alphabetical"` to sort
+            them by label, or to `"first_letter"` to also group them by the first
+            letter of their labels. Alternatively, pass a function that accepts an
+            option label and returns the name of its group, to group them by name.
+            Sorted and grouped pages are described by the range of labels or groups
+            on them (e.g. "Ne–Ni"), which is displayed on the center button, so users
+            can tell where to find an option. Only applicable if there are 6 or more
+            options and they are provided via `*args` or `**kwargs`.
+        dense_layout:
+            Whether to choose between more layouts, by minimizing the expected number
+            of clicks it takes to select an option (see above). Only applicable if
+            there are 6 or more options, they're provided via `*args` or `**kwargs`,
+            and `partition` is `"position"` or `"alphabetical"`. Each layout choice
+            and its expected cost are reported in a `LAYOUT_CHOSEN` event.
+        timeout:
+            The number of seconds to wait for the user to make a selection. The timer
+            restarts whenever the user interacts with the view. Set to `None` to wait
+            indefinitely (or until the view is evicted to make room for newer views).
+        layout_cache:
+            A `LayoutCache` in which to keep the pages built for these options, so that
+            later calls with the same option labels can reuse them instead of building
+            them again. Optional. Recommended for commands that always present the same
+            large collection of options. Not applicable if `source` is provided.
+        resolver:
+            An async function that accepts the label of the selected option and returns
+            its value, e.g. by loading it from a database. Optional. If provided, only
+            the labels of the options need to be loaded up front, and the value of the
+            selected option will be resolved (and returned) once the user chooses it.
+            Wrap this function in a `CachedResolver` to reuse values between calls.
             Cannot be used alongside `**kwargs`.
+        **kwargs:
+            An ordered mapping of option labels to option values.
+            Cannot be used alongside `*args` or `source`.
+
+    Returns:
+        The user's selected option string (if `*args`) or option value (if `**kwargs`).
+        If `source` is provided, the value of the selected option is returned. If
+        `resolver` is provided, the value it returns for the selection is returned.
+
+    Raises:
+        TimeoutError:
+            If the `timeout` elapses without a selection, or the view is evicted from
+            the process-wide `selector_registry` before a selection is made.
+        ValueError:
+            If more than one of `*args`, `**kwargs`, and `source` are provided, or if
+            `resolver` is provided alongside `**kwargs`.
+        Exception:
+            Any exception raised by the `resolver` while resolving the selected option.
+    """
+    options, option_count = await _load_options(
+        args, kwargs, source, count_hint, resolver
+    )
+
+    if option_count < DynamicSelector.MIN_OPTIONS:
+        return await _get_only_value(options, resolver)
+
+    view = DynamicSelector(
+        ctx,
+        button_style,
+        select_placeholder,
+        log,
+        options,
+        jump_navigation,
+        timeout,
+        layout_cache,
+        resolver,
+        partition=partition,
+        dense_layout=dense_layout,
+    )
+    return await _show_and_wait(ctx, view, content, embed)
+
+
+async def dynamic_multi_select(
+    ctx: ApplicationContext,
+    *args: str,
+    content: str | None = None,
+    embed: Embed | None = None,
+    log: Callable[[str], None] | None = print,
+    source: AsyncIterable[OptionItem] | PagedFetcher | OptionCatalog | None = None,
+    count_hint: int | None = None,
+    jump_navigation: bool = False,
+    partition: Partition = "position",
+    timeout: float | None = None,
+    layout_cache: LayoutCache | None = None,
+    resolver: Resolver | None = None,
+    **kwargs: Any,
+) -> list[Any]:
+    """Displays a collection of options and returns all of those selected by the user.
+
+    Note:
+        The options are displayed in a `MultiPaginator` view, which divides them into
+        pages of (up to) 25 options each. The user can select options on any number of
+        pages using the dropdown menu, or select every option on the current page at
+        once. The selection can be cleared, and a button displays the number of options
+        that are currently selected. Once the user confirms their selection, this
+        function returns the selected options (or their values) in their original order.
+
+        The selection is stored as a bitset, so it only uses a single bit per option,
+        even for very large collections of options.
+
+        If there are **no** options, this function will simply return an empty list.
+        If there is **exactly 1** option, a list containing only that option (or its
+        value) will be returned without displaying a view.
+
+    Args:
+        ctx:
+            The context for the application command that prompted this selection.
+        *args:
+            An ordered collection of option strings.
+            Cannot be used alongside `**kwargs` or `source`.
         content:
             The text content to display in the message with the selector view.
             Optional. May be used alongside `embed`.
         embed:
             An embed to display in the message with the selector view.
             Optional. May be used alongside `content`.
+        log:
+            A function that will be called to display debug information in the console.
+            Set to `None` to disable console output for this function call.
+        source:
+            An `AsyncIterable` of options, or an async function that accepts an `offset`
+            and a `limit` and returns (at most) that many options. Each option may be
+            an option string, or a `tuple` containing an option label and its value.
+            Alternatively, an `OptionCatalog`, whose options are treated as if they
+            were provided via `**kwargs`. Cannot be used alongside `*args` or
+            `**kwargs`.
+        count_hint:
+            The expected total number of options provided by `source`. Optional.
+            Only applicable if `source` is provided (and isn't an `OptionCatalog`).
+        jump_navigation:
+            Whether to display an extra dropdown menu that lists ranges of pages, which
+            can be used to reach any page in a few selections. Only applicable if there
+            are 26 or more options and they are provided via `*args` or `**kwargs`.
+        partition:
+            How to order the options and divide them into pages: `"position"` (the
+            default), `"alphabetical"`, `"first_letter"`, or a function that accepts an
+            option label and returns the name of its group. See `dynamic_select`.
+        timeout:
+            The number of seconds to wait for the user to confirm their selection. The
+            timer restarts whenever the user interacts with the view. Set to `None` to
+            wait indefinitely (or until the view is evicted to make room for new views).
+        layout_cache:
+            A `LayoutCache` in which to keep the pages built for these options, so that
+            later calls with the same option labels can reuse them. Optional.
+            Not applicable if `source` is provided.
+        resolver:
+            An async function that accepts the label of a selected option and returns
+            its value. Optional. If provided, it will be called for each selected option
+            once the user confirms their selection. Cannot be used alongside `**kwargs`.
+        **kwargs:
+            An ordered mapping of option labels to option values.
+            Cannot be used alongside `*args` or `source`.
+
+    Returns:
+        A list of the user's selected option strings (if `*args`) or option values (if
+        `**kwargs` or `source`), or of the values returned by `resolver` (if provided).
+
+    Raises:
+        TimeoutError:
+            If the `timeout` elapses before the selection is confirmed, or the view is
+            evicted from the process-wide `selector_registry` before then.
+        ValueError:
+            If more than one of `*args`, `**kwargs`, and `source` are provided, or if
+            `resolver` is provided alongside `**kwargs`.
+        Exception:
+            Any exception raised by the `resolver` while resolving a selected option.
+    """
+    options, option_count = await _load_options(
+        args, kwargs, source, count_hint, resolver
+    )
+
+    if option_count < DynamicSelector.MIN_OPTIONS:
+        return [await _get_only_value(options, resolver)] if option_count else []
+
+    view = DynamicSelector(
+        ctx,
+        ButtonStyle.secondary,
+        None,
+        log,
+        options,
+        jump_navigation,
+        timeout,
+        layout_cache,
+        resolver,
+        multi_select=True,
+        partition=partition,
+    )
+    return await _show_and_wait(ctx, view, content, embed)
+
+
+async def dynamic_poll(
+    ctx: ApplicationContext,
+    *args: str,
+    content: str | None = None,
+    embed: Embed | None = None,
+    button_style: ButtonStyle = ButtonStyle.secondary,
+    select_placeholder: str | None = None,
+    log: Callable[[str], None] | None = print,
+    duration: float | None = 300,
+    update_interval: float = 2.0,
+    **kwargs: Any,
+) -> PollResults:
+    """Displays a collection of options that any number of users can choose from.
+
+    Note:
+        Unlike `dynamic_select`, which waits for the invoking user to make a selection,
+        this function displays a single message that every user in the channel can use
+        to vote for one of the options. If a user votes again, their previous vote is
+        replaced. Once the `duration` elapses, the components are disabled and the
+        aggregated results are returned.
+
+        Votes are acknowledged without editing the message. Instead, the number of
+        votes for each option is displayed on the components, and refreshed at most
+        once every `update_interval` seconds (if any votes were cast in the meantime).
+        As a result, the number of API requests needed to update the message doesn't
+        depend on the number of voters.
+
+        Polls must have between 2 and 25 options. If there are between 2 and 5 options
+        (inclusive), they will be displayed as a single row of `Button` components.
+        Otherwise, they will be displayed in a single `Select` component.
+
+    Args:
+        ctx:
+            The context for the application command that prompted this poll.
+        *args:
+            An ordered collection of option strings.
+            Cannot be used alongside `**kwargs`.
+        content:
+            The text content to display in the message with the poll view.
+            Optional. May be used alongside `embed`.
+        embed:
+            An embed to display in the message with the poll view.
+            Optional. May be used alongside `content`.
         button_style:
             The `ButtonStyle` to use for the option `Button` components.
             Only applicable if there are between 2 and 5 options (inclusive).
@@ -70,28 +367,227 @@ async def dynamic_select(
         log:
             A function that will be called to display debug information in the console.
             Set to `None` to disable console output for this function call.
+        duration:
+            The number of seconds for which to collect votes. Set to `None` to collect
+            them indefinitely (or until the task awaiting this function is cancelled).
+        update_interval:
+            The minimum number of seconds between two updates of the displayed tally.
         **kwargs:
             An ordered mapping of option labels to option values.
             Cannot be used alongside `*args`.
 
     Returns:
-        The user's selected option string (if `*args`) or option value (if `**kwargs`).
+        A `PollResults` tuple containing the number of votes for each option label, and
+        the option string (if `*args`) or option value (if `**kwargs`) chosen by each
+        user who voted, keyed by their user ID.
+
+    Raises:
+        ValueError:
+            If both `*args` and `**kwargs` are provided, or if fewer than 2 or more than
+            25 options are provided.
+    """
+    if args and kwargs:
+        raise ValueError("Only one of '*args' or '**kwargs' may be provided.")
+
+    view = PollSelector(
+        button_style,
+        select_placeholder,
+        log,
+        OptionStore(kwargs.items() if kwargs else zip(args, args)),
+        update_interval,
+    )
+
+    try:
+        await _show(ctx, view, content, embed)
+        view.mark_shown()
+        return await view.collect(duration)
+    except asyncio.CancelledError:
+        view.emit(EventKind.ABANDONED, reason="cancelled")
+        raise
+    finally:
+        view.stop()
+
+
+def dynamic_autocomplete(*args: str, **kwargs: Any) -> OptionAutocomplete:
+    """Returns an autocomplete function that suggests the given options as users type.
+
+    Note:
+        For very large collections of options (e.g. tens of thousands of items), it's
+        often more convenient to let users type into a slash command option than to
+        have them page through a selector. Pass the returned `OptionAutocomplete` as the
+        `autocomplete` argument of a Pycord `Option`, and it will suggest the 25 options
+        that best match what the user has typed so far. Matches are ranked as in the
+        search feature of `dynamic_select`.
+
+        The options are indexed once, when this function is called, which may take a
+        moment for large collections. Call it once (e.g. when the cog is set up) and
+        share the result between commands, rather than calling it for each keystroke.
+        Each keystroke then takes well under a millisecond, even for 100,000 options,
+        since the matches for each user's recent queries are cached and refined.
+
+        Discord passes the selected choice to the command as a string (i.e. the option
+        key, shortened to 100 characters if necessary). Use `get_value()` to look up
+        the corresponding option value, if the options were specified via `**kwargs`.
+
+        ```py
+        autocomplete = uikitty.dynamic_autocomplete(**items_by_name)
+
+        @bot.slash_command()
+        async def item(ctx, name: Option(str, autocomplete=autocomplete)):
+            await ctx.respond(f"{autocomplete.get_value(name)}")
+        ```
+
+    Args:
+        *args:
+            An ordered collection of option strings.
+            Cannot be used alongside `**kwargs`.
+        **kwargs:
+            An ordered mapping of option labels to option values.
+            Cannot be used alongside `*args`.
+
+    Returns:
+        A new `OptionAutocomplete` that suggests the given options.
+
+    Raises:
+        ValueError: If both `*args` and `**kwargs` are provided.
     """
     if args and kwargs:
+        raise ValueError("Only one of '*args' or '**kwargs' may be provided.")
+
+    return OptionAutocomplete(
+        OptionStore(kwargs.items() if kwargs else zip(args, args))
+    )
+
+
+def selection_chain(
+    ctx: ApplicationContext,
+    log: Callable[[str], None] | None = print,
+    timeout: float | None = None,
+    layout_cache: LayoutCache | None = None,
+) -> SelectionChain:
+    """Returns a `SelectionChain` that displays a series of selections in one message.
+
+    Note:
+        This is intended for multi-step flows (e.g. wizards), where each step's options
+        may depend on the answers to previous steps. Instead of calling `dynamic_select`
+        once per step, call `select()` on the returned chain, which accepts the same
+        options and display arguments. Each step replaces the previous step's view in
+        the same message, using the response to the interaction that completed the
+        previous step. This takes half as many API requests per step, and the next
+        step appears as soon as the user completes the previous one.
+
+        Call `finish()` on the chain to remove the last step's view from the message
+        (and optionally replace its content or embed) in the same way.
+
+        ```py
+        chain = uikitty.selection_chain(ctx)
+        region = await chain.select(*regions, content="Pick a region.")
+        city = await chain.select(*cities[region], content=f"Pick a city in {region}.")
+        await chain.finish(content=f"You picked **{city}**!")
+        ```
+
+    Args:
+        ctx:
+            The context for the application command that prompted these selections.
+        log:
+            A function that will be called to display debug information in the console.
+            Set to `None` to disable console output for this chain.
+        timeout:
+            The number of seconds to wait for the user to complete each step. The timer
+            restarts whenever the user interacts with the view. Set to `None` to wait
+            indefinitely (or until the view is evicted to make room for new views).
+        layout_cache:
+            A `LayoutCache` in which to keep the pages built for each step's options, so
+            that later steps or chains with the same option labels can reuse them.
+
+    Returns:
+        A new `SelectionChain` that hasn't displayed anything yet.
+    """
+    return SelectionChain(ctx, log, timeout, layout_cache)
+
+
+async def _load_options(
+    args: tuple[str, ...],
+    kwargs: dict[str, Any],
+    source: AsyncIterable[OptionItem] | PagedFetcher | OptionCatalog | None,
+    count_hint: int | None,
+    resolver: Resolver | None,
+) -> tuple[OptionStore | OptionSource, int]:
+    if sum(map(bool, (args, kwargs, source is not None))) > 1:
         raise ValueError(
-            "Either '*args' or '**kwargs' (not both!) "
-            "must be provided to define the available options."
+            "Only one of '*args', '**kwargs', or 'source' "
+            "may be provided to define the available options."
         )
+    if kwargs and resolver:
+        raise ValueError("A 'resolver' cannot be used alongside '**kwargs'.")
+
+    if isinstance(source, OptionCatalog):
+        option_store = await source.load()
+        return option_store, len(option_store)
 
-    options = kwargs if kwargs else {arg: arg for arg in args}
+    if source is not None:
+        option_source = OptionSource(source, count_hint)
+        await option_source.ensure(DynamicSelector.MAX_ENTRIES_PER_PAGE + 1)
+        return option_source, option_source.estimated_count
+
+    option_store = OptionStore(kwargs.items() if kwargs else zip(args, args))
+    return option_store, len(option_store)
+
+
+async def _get_only_value(
+    options: OptionStore | OptionSource, resolver: Resolver | None
+) -> Any:
+    option_store = options.store if isinstance(options, OptionSource) else options
 
-    if len(options) < DynamicSelector.MIN_OPTIONS:
-        return next(iter(options.values())) if options else None
+    if not option_store.keys:
+        return None
+    if resolver:
+        return await resolver(option_store.keys[0])
+    return option_store.values[0]
+
+
+async def _show(
+    ctx: ApplicationContext,
+    view: BaseSelector,
+    content: str | None,
+    embed: Embed | None,
+) -> None:
+    if not ctx.response.is_done():
+        await ctx.respond(content=content, embed=embed, view=view)
+        return
+
+    # The message already exists, so editing it isn't urgent and may be rate limited.
+    await view.schedule_edit(
+        ctx.channel_id,
+        functools.partial(ctx.edit, content=content, embed=embed, view=view),
+    )
+
+
+async def _show_and_wait(
+    ctx: ApplicationContext,
+    view: DynamicSelector,
+    content: str | None,
+    embed: Embed | None,
+) -> Any:
+    timed_out = False
 
-    view = DynamicSelector(ctx, button_style, select_placeholder, log, options)
-    respond = ctx.edit if ctx.response.is_done() else ctx.respond
+    try:
+        await view.prepare()
+        await _show(ctx, view, content, embed)
+        view.mark_shown()
+        timed_out = await view.wait()
+    except asyncio.CancelledError:
+        view.emit(EventKind.ABANDONED, reason="cancelled")
+        raise
+    finally:
+        # Release the view if this coroutine was cancelled. Expired views clean up
+        # after themselves in `on_timeout()`, which also keeps track of the expiry.
+        if not timed_out:
+            view.stop()
 
-    await respond(content=content, embed=embed, view=view)
-    await view.wait()
+    if timed_out or view.is_evicted:
+        raise TimeoutError("The user did not make a selection in time.")
+    if view.resolver_error:
+        raise view.resolver_error
 
     return view.selected_value
@@ -0,0 +1,381 @@
+import logging
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from enum import Enum
+from typing import Any, Final, NamedTuple
+
+
+class EventKind(str, Enum):
+    """The kinds of events that selectors report over the course of their lifetime."""
+
+    CREATED = "created"
+    """A selector was created. Carries `option_count`."""
+
+    LAYOUT_CHOSEN = "layout_chosen"
+    """A selector decided how to display its options. Carries `layout`, `option_count`,
+    `page_count`, `button_count`, `select_count`, and `expected_clicks`. The layout is
+    one of `"buttons"`, `"select"`, `"grid"`, `"paginator"`, or `"streaming_paginator"`,
+    or (for multiple selections) `"multi_paginator"` or `"streaming_multi_paginator"`,
+    or (for polls) `"poll_buttons"` or `"poll_select"`. The expected number of clicks
+    per selection is the cost that the layout was chosen by (see `LayoutPlanner`).
+    """
+
+    PAGE_NAVIGATED = "page_navigated"
+    """The user moved to a different page. Carries `page_index` and `page_count`."""
+
+    FINISHED = "finished"
+    """The user made a selection. Carries `user`, `user_id`, and either `selected_key`
+    (for single selections) or `selected_count` (for multiple selections).
+    """
+
+    TALLY_UPDATED = "tally_updated"
+    """A poll refreshed its displayed tally. Carries `voter_count` and the number of
+    votes cast since the previous refresh, as `batched_vote_count`.
+    """
+
+    POLL_CLOSED = "poll_closed"
+    """A poll stopped collecting votes. Carries `voter_count`."""
+
+    EDIT_SENT = "edit_sent"
+    """An `EditScheduler` sent a message edit. Its `selector_id` is the key of the
+    message, and its `elapsed_seconds` is the time the edit spent in the queue. Carries
+    `channel_id`, `merged_count` (the number of newer edits that replaced this one while
+    it was queued), and `queue_depth` (the number of edits still queued afterwards).
+    """
+
+    ABANDONED = "abandoned"
+    """A selector stopped without a selection. Carries `reason`, which is one of
+    `"timeout"`, `"evicted"`, or `"cancelled"`.
+    """
+
+
+class SelectorEvent(NamedTuple):
+    """A structured record of something that happened to a selector."""
+
+    kind: EventKind
+    """What happened."""
+
+    selector_id: str
+    """The ID of the selector view that this event is about."""
+
+    timestamp: float
+    """When this event happened, in seconds since the epoch."""
+
+    elapsed_seconds: float
+    """The time since the selector was shown to the user (or created, if it hasn't been
+    shown yet). For `FINISHED` events, this is the time it took the user to choose.
+    """
+
+    interaction_count: int
+    """The number of interactions with the selector's components so far."""
+
+    data: dict[str, Any]
+    """Additional details that depend on the `kind` of this event."""
+
+    def describe(self) -> str:
+        """Returns a human-readable description of this event."""
+        data = self.data
+
+        match self.kind:
+            case EventKind.CREATED:
+                return f"Created a selector with {data['option_count']} options."
+            case EventKind.LAYOUT_CHOSEN:
+                return _describe_layout(**data)
+            case EventKind.PAGE_NAVIGATED:
+                page_number = data["page_index"] + 1
+                return f"├── Navigated to page {page_number} of {data['page_count']}."
+            case EventKind.FINISHED if "selected_count" in data:
+                return f"└── {data['user']} selected {data['selected_count']} options."
+            case EventKind.FINISHED:
+                return f"└── {data['user']} selected '{data['selected_key']}'."
+            case EventKind.TALLY_UPDATED:
+                return (
+                    f"├── Updated the tally with {data['batched_vote_count']} "
+                    f"new votes ({data['voter_count']} voters in total)."
+                )
+            case EventKind.POLL_CLOSED:
+                return f"└── Closed the poll with {data['voter_count']} voters."
+            case EventKind.EDIT_SENT:
+                return (
+                    f"├── Sent an edit after {self.elapsed_seconds:.3f}s in the queue "
+                    f"({data['queue_depth']} edits still queued)."
+                )
+            case EventKind.ABANDONED:
+                reason = "timed out" if data["reason"] == "timeout" else data["reason"]
+                return f"└── {reason.capitalize()} while waiting for a selection."
+
+        # Events of other kinds (e.g. ones added later) are described generically.
+        return f"{self.kind.value}: {data}"
+
+
+EventSink = Callable[[SelectorEvent], None]
+"""A function that receives the events reported by selectors."""
+
+
+class Instrumentation:
+    """Forwards the events reported by selectors to any number of installed sinks.
+
+    Selectors only build `SelectorEvent` objects if at least one sink is installed (or
+    if they were given a `log` function), so instrumentation costs nothing by default.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a new `Instrumentation` instance without any sinks."""
+        self.sinks: Final[list[EventSink]] = []
+
+    def add_sink(self, sink: EventSink) -> None:
+        """Starts forwarding all subsequent events to the given sink.
+
+        Args:
+            sink:
+                A function that accepts a `SelectorEvent`, e.g. a `LoggingSink` or a
+                `MetricsSink`. It should return quickly and must not raise exceptions.
+        """
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink: EventSink) -> None:
+        """Stops forwarding events to the given sink, if it's currently installed."""
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+
+    def emit(self, event: SelectorEvent) -> None:
+        """Forwards an event to every installed sink."""
+        for sink in self.sinks:
+            sink(event)
+
+
+class LoggingSink:
+    """An event sink that writes events to a standard library `logging.Logger`.
+
+    Each record's message is the event's description, and the event itself is attached
+    to the record as its `selector_event` attribute for use by structured formatters.
+    Alternatively, the descriptions may be passed to a plain function such as `print`,
+    which is how selectors display the events they were given a `log` function for.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger | Callable[[str], None] | None = None,
+        level: int = logging.DEBUG,
+        kinds: Iterable[EventKind] | None = None,
+    ) -> None:
+        """Initializes a new `LoggingSink` instance.
+
+        Args:
+            logger:
+                The logger to write to, or a function that accepts the description of
+                each event. Defaults to the `"uikitty"` logger.
+            level:
+                The level at which to log events. Only applicable to loggers.
+            kinds:
+                The kinds of events to log. Set to `None` to log events of every kind.
+        """
+        self.logger: Final[
+            logging.Logger | Callable[[str], None]
+        ] = logger or logging.getLogger("uikitty")
+        self.level: Final[int] = level
+        self.kinds: Final[frozenset[EventKind] | None] = (
+            None if (kinds is None) else frozenset(kinds)
+        )
+
+    def accepts(self, kind: EventKind) -> bool:
+        """Returns whether this sink logs events of the given kind."""
+        return (self.kinds is None) or (kind in self.kinds)
+
+    def __call__(self, event: SelectorEvent) -> None:
+        """Logs the given event if this sink accepts its kind (and level)."""
+        if not self.accepts(event.kind):
+            return
+
+        if not isinstance(self.logger, logging.Logger):
+            self.logger(event.describe())
+        elif self.logger.isEnabledFor(self.level):
+            self.logger.log(
+                self.level, "%s", event.describe(), extra={"selector_event": event}
+            )
+
+
+class MetricsSink:
+    """An event sink that aggregates events into Prometheus-style in-memory metrics.
+
+    All metrics are stored in `values`, keyed by their sample name (including labels,
+    if any). Durations and per-selector counts are recorded as summaries, i.e. a pair
+    of `_sum` and `_count` samples, and queue depths are recorded as gauges. Use
+    `expose()` to render every sample in the text format that Prometheus scrapes, along
+    with the type and description of each metric (as listed in `METRICS`).
+    """
+
+    PREFIX: Final[str] = "uikitty_"
+    METRICS: Final[dict[str, tuple[str, str]]] = {
+        "selectors_created_total": ("counter", "Selectors that were created."),
+        "layouts_chosen_total": ("counter", "Layouts chosen by selectors."),
+        "expected_clicks_per_selection": (
+            "summary",
+            "Expected clicks per selection of the chosen layouts.",
+        ),
+        "page_navigations_total": ("counter", "Navigations to another page."),
+        "selections_finished_total": ("counter", "Selections that were made."),
+        "time_to_selection_seconds": (
+            "summary",
+            "Time between showing a selector and its selection.",
+        ),
+        "interactions_per_selection": (
+            "summary",
+            "Interactions with a selector before its selection.",
+        ),
+        "votes_per_tally_update": ("summary", "Votes displayed by each tally update."),
+        "polls_closed_total": ("counter", "Polls that were closed."),
+        "voters_per_poll": ("summary", "Users who voted in each closed poll."),
+        "edits_sent_total": ("counter", "Scheduled message edits that were sent."),
+        "edits_merged_total": (
+            "counter",
+            "Scheduled message edits that were replaced by later ones.",
+        ),
+        "edit_wait_seconds": (
+            "summary",
+            "Time that scheduled message edits spent in the queue.",
+        ),
+        "edit_queue_depth": ("gauge", "Scheduled message edits still in the queue."),
+        "selections_abandoned_total": (
+            "counter",
+            "Selectors that stopped without a selection.",
+        ),
+    }
+
+    def __init__(self) -> None:
+        """Initializes a new `MetricsSink` instance with all metrics at zero."""
+        self.values: Final[defaultdict[str, float]] = defaultdict(float)
+
+    def __call__(self, event: SelectorEvent) -> None:
+        """Updates the metrics that are affected by the given event."""
+        match event.kind:
+            case EventKind.CREATED:
+                self._increment("selectors_created_total")
+            case EventKind.LAYOUT_CHOSEN:
+                self._increment("layouts_chosen_total", layout=event.data["layout"])
+                if (expected_clicks := event.data.get("expected_clicks")) is not None:
+                    self._observe("expected_clicks_per_selection", expected_clicks)
+            case EventKind.PAGE_NAVIGATED:
+                self._increment("page_navigations_total")
+            case EventKind.FINISHED:
+                self._increment("selections_finished_total")
+                self._observe("time_to_selection_seconds", event.elapsed_seconds)
+                self._observe("interactions_per_selection", event.interaction_count)
+            case EventKind.TALLY_UPDATED:
+                self._observe(
+                    "votes_per_tally_update", event.data["batched_vote_count"]
+                )
+            case EventKind.POLL_CLOSED:
+                self._increment("polls_closed_total")
+                self._observe("voters_per_poll", event.data["voter_count"])
+            case EventKind.EDIT_SENT:
+                self._increment("edits_sent_total")
+                self._add("edits_merged_total", event.data["merged_count"])
+                self._observe("edit_wait_seconds", event.elapsed_seconds)
+                self._set("edit_queue_depth", event.data["queue_depth"])
+            case EventKind.ABANDONED:
+                self._increment(
+                    "selections_abandoned_total", reason=event.data["reason"]
+                )
+
+    def get(self, name: str, **labels: str) -> float:
+        """Returns the current value of a metric, or `0` if it has never been updated.
+
+        Args:
+            name:
+                The name of the metric, without the `"uikitty_"` prefix.
+            **labels:
+                The labels that identify the specific sample to return, if any.
+        """
+        return self.values.get(_get_sample_name(type(self).PREFIX + name, labels), 0)
+
+    def expose(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        cls = type(self)
+        samples_by_metric: defaultdict[str, list[str]] = defaultdict(list)
+
+        for sample_name, value in sorted(self.values.items()):
+            name = sample_name.partition("{")[0].removeprefix(cls.PREFIX)
+            if name not in cls.METRICS:
+                name = name.removesuffix("_sum").removesuffix("_count")
+            samples_by_metric[name].append(f"{sample_name} {value}\n")
+
+        lines = []
+        for name, samples in sorted(samples_by_metric.items()):
+            metric_type, description = cls.METRICS.get(name, ("untyped", name))
+            lines.append(f"# HELP {cls.PREFIX}{name} {description}\n")
+            lines.append(f"# TYPE {cls.PREFIX}{name} {metric_type}\n")
+            lines.extend(samples)
+
+        return "".join(lines)
+
+    def _increment(self, name: str, **labels: str) -> None:
+        self._add(name, 1, **labels)
+
+    def _add(self, name: str, amount: float, **labels: str) -> None:
+        self.values[_get_sample_name(type(self).PREFIX + name, labels)] += amount
+
+    def _set(self, name: str, value: float) -> None:
+        self.values[type(self).PREFIX + name] = value
+
+    def _observe(self, name: str, value: float) -> None:
+        self.values[f"{type(self).PREFIX}{name}_sum"] += value
+        self.values[f"{type(self).PREFIX}{name}_count"] += 1
+
+
+def _describe_layout(
+    layout: str,
+    option_count: int,
+    page_count: int,
+    button_count: int = 0,
+    select_count: int = 0,
+    expected_clicks: float | None = None,
+) -> str:
+    match layout:
+        case "streaming_paginator" | "streaming_multi_paginator":
+            kind = "multi-selector" if "multi" in layout else "selector"
+            description = (
+                f"Setting up a streaming paginated {kind} with an estimated "
+                f"{option_count} options spread across {page_count} pages"
+            )
+        case "paginator" | "multi_paginator":
+            kind = "multi-selector" if "multi" in layout else "selector"
+            description = (
+                f"Setting up a paginated {kind} with {option_count} "
+                f"options spread across {page_count} pages"
+            )
+        case "poll_buttons" | "poll_select":
+            kind = "buttons" if (layout == "poll_buttons") else "a dropdown menu"
+            description = f"Setting up a poll with {option_count} options as {kind}"
+        case "select":
+            description = (
+                f"Setting up a simple dropdown menu with {option_count} options"
+            )
+        case "grid":
+            components = f"{select_count} dropdown menu" + (
+                "s" if (select_count != 1) else ""
+            )
+            if button_count:
+                components = f"{button_count} buttons and {components}"
+            description = (
+                f"Setting up a grid of {components} with {option_count} options"
+            )
+        case _ if option_count > 5:
+            description = f"Setting up a grid of {option_count} buttons"
+        case _:
+            description = f"Setting up an action row of {option_count} buttons"
+
+    if expected_clicks is None:
+        return f"{description}."
+    return f"{description} (expected clicks per selection: {expected_clicks:g})."
+
+
+def _get_sample_name(name: str, labels: dict[str, str]) -> str:
+    if not labels:
+        return name
+    label_text = ",".join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+    return f"{name}{{{label_text}}}"
+
+
+selector_instrumentation: Final[Instrumentation] = Instrumentation()
+"""The default instrumentation, which receives events from every selector by default."""
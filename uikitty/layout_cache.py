@@ -0,0 +1,345 @@
+import asyncio
+import bisect
+import hashlib
+import math
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Final, Literal, NamedTuple, TypeAlias
+
+from discord import SelectOption
+
+from uikitty.option_store import create_select_option
+from uikitty.search_index import SearchIndex
+
+Partition: TypeAlias = (
+    "Literal['position', 'alphabetical', 'first_letter'] | Callable[[str], str]"
+)
+
+
+class PageLayout:
+    """The parts of a selector's layout that only depend on its option keys.
+
+    This includes the partitioning of options into pages, the `SelectOption` items for
+    each page, and the `SearchIndex` of the option keys, which are built when first
+    requested. Since none of this data depends on option values or user input, a
+    `PageLayout` may be shared by any number of selectors with the same option keys
+    (see `LayoutCache`). Shared layouts keep the pages that were most recently built,
+    up to `max_cached_pages`, so that they can be reused by other selectors. Layouts
+    that aren't shared keep no pages, since each `Paginator` already keeps its own.
+
+    By default, options keep their original order and are divided evenly into pages.
+    They may also be sorted by key, or grouped (see `__init__()`), in which case each
+    page can be described by the range of keys or groups it contains (e.g. `"Ne–Ni"`).
+    The partitioning is computed once, and only consists of the display order of the
+    options and the offset at which each page (and group) starts within that order.
+    """
+
+    MAX_PAGE_SIZE: Final[int] = 25
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        page_count: int,
+        partition: Partition = "position",
+        max_cached_pages: int = 0,
+    ) -> None:
+        """Initializes a new `PageLayout` instance.
+
+        Args:
+            keys:
+                The keys (i.e. labels) of all options, in order.
+            page_count:
+                The number of pages across which to (evenly) divide the options. If the
+                options are grouped, the groups are packed into as few pages of at most
+                `MAX_PAGE_SIZE` options as possible instead, so the actual number of
+                pages (i.e. the `page_count` attribute) may differ.
+            partition:
+                How to order the options and divide them into pages:
+
+                - `"position"`: Options keep their original order.
+                - `"alphabetical"`: Options are sorted by key (case-insensitively).
+                - `"first_letter"`: Options are sorted by key and grouped by the first
+                  letter of their keys. Keys that don't start with a letter are grouped
+                  under `"#"`.
+                - A function that accepts an option key and returns the name of the
+                  option's group: Options are grouped by name (in sorted order), and
+                  sorted by key within each group.
+
+                Groups share a page if they fit on it, and groups with more options than
+                fit on one page are divided evenly across several pages.
+            max_cached_pages:
+                The maximum number of built pages to keep for reuse. If exceeded, the
+                least recently used pages are discarded first. Set to `0` to build each
+                page whenever it's requested.
+        """
+        self.keys: Final[Sequence[str]] = keys
+        self.partition: Final[Partition] = partition
+        self.order: array[int] | None = None
+        self.group_names: Final[list[str]] = []
+        self.group_starts: Final[array[int]] = array("I")
+
+        match partition:
+            case "position":
+                page_starts = _divide_evenly(0, len(keys), page_count)
+            case "alphabetical":
+                folded_keys = [key.casefold() for key in keys]
+                self.order = array(
+                    "I", sorted(range(len(keys)), key=folded_keys.__getitem__)
+                )
+                page_starts = _divide_evenly(0, len(keys), page_count)
+            case _:
+                self._group(
+                    _get_first_letter if (partition == "first_letter") else partition
+                )
+                page_starts = self._pack_groups()
+
+        self.page_starts: Final[array[int]] = page_starts
+        self.page_count: Final[int] = len(page_starts) - 1
+        self.max_cached_pages: int = max_cached_pages
+        self._cached_pages: Final[OrderedDict[int, list[SelectOption]]] = OrderedDict()
+        self._range_labels: Final[dict[tuple[int, int], str]] = {}
+        self._search_index_task: asyncio.Future[SearchIndex] | None = None
+
+    def get_page(self, page_index: int) -> list[SelectOption]:
+        """Returns the `SelectOption` items for the options on the given page.
+
+        The returned list may be shared and must not be modified.
+        """
+        if (page := self._cached_pages.get(page_index)) is not None:
+            self._cached_pages.move_to_end(page_index)
+            return page
+
+        start, end = self.page_starts[page_index], self.page_starts[page_index + 1]
+        indices = range(start, end) if (self.order is None) else self.order[start:end]
+        page = [create_select_option(self.keys[i], i) for i in indices]
+
+        if self.max_cached_pages > 0:
+            self._cached_pages[page_index] = page
+            while len(self._cached_pages) > self.max_cached_pages:
+                self._cached_pages.popitem(last=False)
+
+        return page
+
+    async def get_search_index(self) -> SearchIndex:
+        """Returns a `SearchIndex` of the option keys, building it if needed.
+
+        The index is built in a background thread the first time it's requested, and
+        then shared by every selector that uses this layout.
+        """
+        if self._search_index_task is None:
+            self._search_index_task = asyncio.ensure_future(
+                asyncio.to_thread(SearchIndex, self.keys)
+            )
+        # Shielded, so that a cancelled search doesn't cancel the build for others.
+        return await asyncio.shield(self._search_index_task)
+
+    def get_range_label(
+        self,
+        first_page_index: int,
+        last_page_index: int,
+        labeler: Callable[[str, str], str],
+    ) -> str:
+        """Returns a label for the options on the given range of pages (inclusive).
+
+        If the options are grouped, the label names the groups in the range (e.g. `"A"`
+        or `"A–C"`). If the range only contains part of a group, the keys in the range
+        are described as well (e.g. `"Ne–Ni"` or `"Metals: Ag–Bo"`).
+
+        Args:
+            first_page_index:
+                The index of the first page in the range.
+            last_page_index:
+                The index of the last page in the range.
+            labeler:
+                A function that accepts the first and last option keys in the range
+                and returns a label for it. Its results are reused for later calls.
+        """
+        range_key = (first_page_index, last_page_index)
+        if (label := self._range_labels.get(range_key)) is None:
+            start = self.page_starts[first_page_index]
+            end = self.page_starts[last_page_index + 1]
+            label = self._get_label(start, end, labeler)
+            self._range_labels[range_key] = label
+        return label
+
+    def _get_key(self, position: int) -> str:
+        return self.keys[position if (self.order is None) else self.order[position]]
+
+    def _get_label(
+        self, start: int, end: int, labeler: Callable[[str, str], str]
+    ) -> str:
+        key_label = labeler(self._get_key(start), self._get_key(end - 1))
+
+        if not self.group_names:
+            return key_label
+
+        first_group = bisect.bisect_right(self.group_starts, start) - 1
+        last_group = bisect.bisect_right(self.group_starts, end - 1) - 1
+        group_name = self.group_names[first_group]
+
+        if first_group != last_group:
+            return f"{group_name}–{self.group_names[last_group]}"
+        if (start, end) == tuple(self.group_starts[first_group : first_group + 2]):
+            return group_name
+        if key_label.casefold().startswith(group_name.casefold()):
+            return key_label
+        return f"{group_name}: {key_label}"
+
+    def _group(self, get_group_name: Callable[[str], str]) -> None:
+        group_names = list(map(get_group_name, self.keys))
+        sort_keys = [
+            (name.casefold(), name, key.casefold())
+            for name, key in zip(group_names, self.keys)
+        ]
+        self.order = array(
+            "I", sorted(range(len(self.keys)), key=sort_keys.__getitem__)
+        )
+
+        for position, index in enumerate(self.order):
+            if not self.group_names or (group_names[index] != self.group_names[-1]):
+                self.group_names.append(group_names[index])
+                self.group_starts.append(position)
+        self.group_starts.append(len(self.keys))
+
+    def _pack_groups(self) -> "array[int]":
+        max_page_size = type(self).MAX_PAGE_SIZE
+        page_starts = array("I", (0,))
+
+        for group_start, group_end in zip(self.group_starts, self.group_starts[1:]):
+            if group_end - page_starts[-1] <= max_page_size:
+                continue  # The group fits on the current page.
+            if group_start > page_starts[-1]:
+                page_starts.append(group_start)  # The group starts a new page.
+            if (group_size := group_end - group_start) > max_page_size:
+                page_count = math.ceil(group_size / max_page_size)
+                page_starts.extend(
+                    _divide_evenly(group_start, group_end, page_count)[1:-1]
+                )
+                page_starts.append(group_end)
+
+        if page_starts[-1] < len(self.keys) or (len(page_starts) == 1):
+            page_starts.append(len(self.keys))
+        return page_starts
+
+
+def _get_first_letter(key: str) -> str:
+    first_letter = key.casefold()[:1]
+    return first_letter.upper() if first_letter.isalpha() else "#"
+
+
+def _divide_evenly(start: int, end: int, part_count: int) -> "array[int]":
+    quot, rmdr = divmod(end - start, part_count)
+    return array(
+        "I", (start + (i * quot) + min(i, rmdr) for i in range(part_count + 1))
+    )
+
+
+class _CacheEntry(NamedTuple):
+    page_layout: PageLayout
+    expiry_time: float
+
+
+class LayoutCache:
+    """An opt-in cache of `PageLayout` objects for frequently used sets of options.
+
+    Layouts are keyed by a fingerprint of their option keys and page count, so option
+    values may differ between selectors that share a cached layout. The cache holds at
+    most `max_size` layouts. If adding a layout would exceed that limit, the least
+    recently used one is discarded. Layouts are also discarded once they're older than
+    `ttl` seconds, so that memory isn't held indefinitely for rarely used options. Each
+    cached layout keeps up to `max_pages_per_layout` of its most recently used pages.
+
+    The counters on this class can be used to monitor the effectiveness of the cache.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 128,
+        ttl: float | None = 3600,
+        max_pages_per_layout: int = 16,
+    ) -> None:
+        """Initializes a new `LayoutCache` instance.
+
+        Args:
+            max_size:
+                The maximum number of layouts to keep at the same time.
+            ttl:
+                The number of seconds after which a cached layout should be rebuilt.
+                Set to `None` to keep layouts until they're the least recently used.
+            max_pages_per_layout:
+                The maximum number of built pages to keep for each layout.
+        """
+        self.max_size: int = max_size
+        self.ttl: float | None = ttl
+        self.max_pages_per_layout: int = max_pages_per_layout
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+        self._entries: Final[OrderedDict[str, _CacheEntry]] = OrderedDict()
+
+    @property
+    def size(self) -> int:
+        """The number of layouts that are currently cached."""
+        return len(self._entries)
+
+    def get_stats(self) -> dict[str, int]:
+        """Returns the current values of all counters for this cache."""
+        return {"size": self.size, "hits": self.hit_count, "misses": self.miss_count}
+
+    def get(
+        self, keys: Sequence[str], page_count: int, partition: Partition = "position"
+    ) -> PageLayout:
+        """Returns the cached layout for the given option keys, building it if needed.
+
+        Args:
+            keys:
+                The keys (i.e. labels) of all options, in order.
+            page_count:
+                The number of pages across which to (evenly) divide the options.
+            partition:
+                How to order the options and divide them into pages. See `PageLayout`.
+        """
+        fingerprint = type(self).get_fingerprint(keys, page_count, partition)
+        now = time.monotonic()
+
+        if (entry := self._entries.get(fingerprint)) and (entry.expiry_time > now):
+            self.hit_count += 1
+            self._entries.move_to_end(fingerprint)
+            return entry.page_layout
+
+        self.miss_count += 1
+        page_layout = PageLayout(
+            keys, page_count, partition, max_cached_pages=self.max_pages_per_layout
+        )
+        expiry_time = (now + self.ttl) if (self.ttl is not None) else float("inf")
+        self._entries[fingerprint] = _CacheEntry(page_layout, expiry_time)
+        self._entries.move_to_end(fingerprint)
+
+        while len(self._entries) > max(self.max_size, 1):
+            self._entries.popitem(last=False)
+
+        return page_layout
+
+    def clear(self) -> None:
+        """Discards all cached layouts. Does not reset the counters."""
+        self._entries.clear()
+
+    @staticmethod
+    def get_fingerprint(
+        keys: Sequence[str], page_count: int, partition: Partition = "position"
+    ) -> str:
+        """Returns a digest that identifies the given option keys and partitioning.
+
+        If `partition` is a function, the group names it returns for each key are part
+        of the digest, since they may differ between functions with the same name.
+        """
+        partition_name = "groups" if callable(partition) else partition
+        digest = hashlib.blake2b(
+            f"{page_count}\0{partition_name}\0".encode(), digest_size=16
+        )
+        digest.update("\0".join(keys).encode())
+        if callable(partition):
+            digest.update(b"\1")
+            digest.update("\0".join(map(partition, keys)).encode())
+        return digest.hexdigest()
@@ -0,0 +1,162 @@
+import math
+from collections.abc import Iterator
+from typing import Final, NamedTuple
+
+
+class LayoutPlan(NamedTuple):
+    """A way to display a selector's options, along with its expected cost."""
+
+    layout: str
+    """The kind of layout, which is one of `"buttons"`, `"select"`, `"grid"` (rows of
+    buttons and/or several dropdown menus), or `"paginator"`.
+    """
+
+    button_count: int
+    """The number of options that are displayed as buttons, in rows of up to 5."""
+
+    select_count: int
+    """The number of dropdown menus that display the remaining options."""
+
+    page_count: int
+    """The number of pages across which the options are divided."""
+
+    expected_clicks: float
+    """The expected number of clicks it takes to select an option, assuming that each
+    option is equally likely to be selected.
+    """
+
+    @property
+    def row_count(self) -> int:
+        """The number of action rows that display the options (excluding navigation)."""
+        return math.ceil(self.button_count / LayoutPlanner.MAX_BUTTONS_PER_ROW) + (
+            self.select_count
+        )
+
+
+class LayoutPlanner:
+    """Chooses how to display a number of options by minimizing the expected clicks.
+
+    Each candidate layout is assigned the number of clicks that it takes to select an
+    option, averaged over all options (which are assumed to be equally likely):
+
+    - A button takes `BUTTON_CLICKS` (one click).
+    - An option in a dropdown menu takes `SELECT_CLICKS` (one to open it, one to pick).
+    - An option in a paginator takes `SELECT_CLICKS` plus `CONFIRM_CLICKS`, plus the
+      clicks it takes to reach its page from the first page. That's one click per page
+      with the arrow buttons, or `SELECT_CLICKS` per level of the jump navigation menu
+      (if enabled), whichever is fewer.
+
+    A message may contain up to `MAX_ROWS` action rows, each of which holds either
+    `MAX_BUTTONS_PER_ROW` buttons or a single dropdown menu of `MAX_SELECT_OPTIONS`
+    options. The classic layouts use a single row of buttons for up to 5 options, a
+    single dropdown menu for up to 25 options, and a paginator for more than that. Dense
+    layouts may also use up to 5 rows of buttons (i.e. 25 buttons), and fill any rows
+    that are left over with dropdown menus. If several layouts are equally cheap, the
+    one with the fewest rows is chosen.
+    """
+
+    MAX_ROWS: Final[int] = 5
+    MAX_BUTTONS_PER_ROW: Final[int] = 5
+    MAX_SELECT_OPTIONS: Final[int] = 25
+    BUTTON_CLICKS: Final[float] = 1
+    SELECT_CLICKS: Final[float] = 2
+    CONFIRM_CLICKS: Final[float] = 1
+
+    @classmethod
+    def plan(
+        cls, option_count: int, dense: bool = False, jump_navigation: bool = False
+    ) -> LayoutPlan:
+        """Returns the cheapest layout for the given number of options.
+
+        Args:
+            option_count:
+                The number of options to display. Must be positive.
+            dense:
+                Whether to consider layouts that use several rows of buttons and/or
+                several dropdown menus, instead of only the classic layouts.
+            jump_navigation:
+                Whether a paginator would display a jump navigation menu.
+        """
+        candidates = list(
+            cls._get_dense_plans(option_count)
+            if dense
+            else cls._get_classic_plans(option_count)
+        )
+        if option_count > cls.MAX_SELECT_OPTIONS:
+            page_count = math.ceil(option_count / cls.MAX_SELECT_OPTIONS)
+            candidates.append(cls.plan_paginator(page_count, jump_navigation))
+
+        return min(candidates, key=lambda plan: (plan.expected_clicks, plan.row_count))
+
+    @classmethod
+    def plan_paginator(
+        cls, page_count: int, jump_navigation: bool = False
+    ) -> LayoutPlan:
+        """Returns the layout of a paginator with the given number of pages."""
+        navigation_clicks = cls._get_navigation_clicks(page_count, jump_navigation)
+        return LayoutPlan(
+            layout="paginator",
+            button_count=0,
+            select_count=1,
+            page_count=page_count,
+            expected_clicks=(
+                cls.SELECT_CLICKS
+                + cls.CONFIRM_CLICKS
+                + (navigation_clicks / page_count)
+            ),
+        )
+
+    @classmethod
+    def _get_classic_plans(cls, option_count: int) -> Iterator[LayoutPlan]:
+        if option_count <= cls.MAX_BUTTONS_PER_ROW:
+            yield cls._plan_grid(option_count, option_count, 0)
+        elif option_count <= cls.MAX_SELECT_OPTIONS:
+            yield cls._plan_grid(option_count, 0, 1)
+
+    @classmethod
+    def _get_dense_plans(cls, option_count: int) -> Iterator[LayoutPlan]:
+        for button_row_count in range(cls.MAX_ROWS + 1):
+            button_count = min(button_row_count * cls.MAX_BUTTONS_PER_ROW, option_count)
+            select_option_count = option_count - button_count
+            select_count = math.ceil(select_option_count / cls.MAX_SELECT_OPTIONS)
+            if button_row_count + select_count <= cls.MAX_ROWS:
+                yield cls._plan_grid(option_count, button_count, select_count)
+
+    @classmethod
+    def _plan_grid(
+        cls, option_count: int, button_count: int, select_count: int
+    ) -> LayoutPlan:
+        if select_count == 0:
+            layout = "buttons"
+        elif (select_count == 1) and (button_count == 0):
+            layout = "select"
+        else:
+            layout = "grid"
+
+        total_clicks = (button_count * cls.BUTTON_CLICKS) + (
+            (option_count - button_count) * cls.SELECT_CLICKS
+        )
+        return LayoutPlan(
+            layout=layout,
+            button_count=button_count,
+            select_count=select_count,
+            page_count=1,
+            expected_clicks=total_clicks / option_count,
+        )
+
+    @classmethod
+    def _get_navigation_clicks(cls, page_count: int, jump_navigation: bool) -> float:
+        # Returns the total number of clicks it takes to reach every page once.
+        if not jump_navigation:
+            return page_count * (page_count - 1) / 2  # i.e. 0 + 1 + ... + (n - 1).
+
+        jump_level_count = 1
+        while cls.MAX_SELECT_OPTIONS**jump_level_count < page_count:
+            jump_level_count += 1
+        jump_clicks = jump_level_count * cls.SELECT_CLICKS
+
+        # Pages up to `jump_clicks` away are reached faster with the arrow buttons.
+        arrow_page_count = min(page_count, math.floor(jump_clicks) + 1)
+        return (arrow_page_count * (arrow_page_count - 1) / 2) + (
+            (page_count - arrow_page_count) * jump_clicks
+        )
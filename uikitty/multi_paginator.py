@@ -0,0 +1,203 @@
+from collections.abc import Iterator
+from typing import Final
+
+from discord import ButtonStyle, Interaction, SelectOption
+
+from uikitty.base_selector import BaseSelector
+from uikitty.cached_components import CachedButton
+from uikitty.paginator import (
+    PageLabeler,
+    PageProvider,
+    Paginator,
+    RangeLabeler,
+    SearchIndexProvider,
+)
+from uikitty.selection_set import SelectionSet
+
+
+class MultiPaginator(Paginator):
+    """A `Paginator` that lets the user select any number of options across all pages.
+
+    The selection is kept in a `SelectionSet` (a bitset indexed by option position), so
+    it only takes up a single bit per option, regardless of the number of pages. The
+    options on the current page that are part of the selection are pre-selected in the
+    dropdown menu, and changing the selected items in the menu updates the selection for
+    that page only. An extra row of buttons can be used to select every option on the
+    current page, clear the entire selection, or confirm it. The confirmation button
+    shows the number of options that are currently selected.
+
+    Unlike a regular `Paginator`, this class also supports a single page of options. In
+    that case, the navigation buttons are omitted.
+    """
+
+    class ActionUI:
+        """A container for the UI components that are specific to a `MultiPaginator`."""
+
+        __slots__ = ("select_page_button", "clear_button", "confirm_button")
+
+        def __init__(self, row: int) -> None:
+            """Initializes a new `ActionUI` instance with a fresh set of components."""
+            self.select_page_button: Final[CachedButton] = CachedButton(
+                label="Select Page", row=row
+            )
+            """Adds every option on the current page to the selection when clicked."""
+
+            self.clear_button: Final[CachedButton] = CachedButton(
+                label="Clear", row=row
+            )
+            """Removes every option from the selection when clicked."""
+
+            self.confirm_button: Final[CachedButton] = CachedButton(row=row)
+            """Confirms the selection when clicked. Shows the number of selections."""
+
+        def __iter__(self) -> Iterator[CachedButton]:
+            """Yields each component in the order in which it should be displayed."""
+            yield self.select_page_button
+            yield self.clear_button
+            yield self.confirm_button
+
+    MIN_PAGE_COUNT: int = 1
+    ACTION_ROW: Final[int] = 4
+
+    def __init__(
+        self,
+        page_provider: PageProvider,
+        page_count: int,
+        placeholder: str | None = None,
+        search_index: SearchIndexProvider | None = None,
+        range_labeler: RangeLabeler | None = None,
+        page_labeler: PageLabeler | None = None,
+    ) -> None:
+        """Initializes a new `MultiPaginator` instance.
+
+        Args:
+            page_provider:
+                A sync or async function that accepts a page index and returns a list
+                of the `SelectOption` items that should be rendered on that page. The
+                value of each item must be its index in the parent view's `options`.
+            page_count:
+                The total number of pages that can be returned by the `page_provider`.
+            placeholder:
+                The placeholder text to display in the `Select` (dropdown) menu. By
+                default, it only mentions the arrow buttons if there are several pages.
+            search_index:
+                An async function that returns a `SearchIndex` of the keys (i.e. labels)
+                of all options. Optional. If provided, the user will be able to search
+                for options by name.
+            range_labeler:
+                A function that accepts the indices of the first and last pages in a
+                range (inclusive) and returns a short description of the options in
+                that range. Optional. If provided, jump navigation will be enabled.
+            page_labeler:
+                A function that accepts the index of a page and returns a short
+                description of the options on it. Optional.
+
+        Raises:
+            ValueError: If the `page_count` is less than `1`.
+        """
+        if placeholder is None:
+            placeholder = (
+                "Select any number of options"
+                if (page_count == 1)
+                else "Select any number of options, or use the arrows for more"
+            )
+
+        super().__init__(
+            page_provider,
+            page_count,
+            placeholder,
+            search_index,
+            range_labeler,
+            page_labeler,
+        )
+        self.selection: Final[SelectionSet] = SelectionSet()
+        self.action_ui: Final[MultiPaginator.ActionUI] = type(self).ActionUI(
+            row=type(self).ACTION_ROW
+        )
+        self.action_ui.select_page_button.callback = self._on_select_page_click
+        self.action_ui.clear_button.callback = self._on_clear_click
+        self._marked_options: tuple[
+            list[SelectOption], list[bool], list[SelectOption]
+        ] = ([], [], [])
+
+    def attach(self, parent_view: BaseSelector) -> None:
+        """Adds pagination UI components to the view and sets up the required callbacks.
+
+        Note:
+            The `prepare()` method must be awaited before the parent view is displayed.
+
+        Args:
+            parent_view:
+                The `BaseSelector` view to which these UI components will be added.
+                Once the selection is confirmed, its `finish_many()` method is called.
+        """
+        super().attach(parent_view)
+
+        if self.page_count == 1:
+            for button in (
+                self.ui.prev_button,
+                self.ui.center_button,
+                self.ui.next_button,
+            ):
+                parent_view.remove_item(button)
+
+        async def on_confirm(interaction: Interaction) -> None:
+            await parent_view.finish_many(list(self.selection), interaction)
+
+        self.action_ui.confirm_button.callback = on_confirm
+
+        for button in self.action_ui:
+            parent_view.add_item(button)
+
+    async def _on_select(self, interaction: Interaction) -> None:
+        selected_values = set(self.ui.select.values)
+
+        for option in self.ui.select.options:
+            if option.value in selected_values:
+                self.selection.add(int(option.value))
+            else:
+                self.selection.discard(int(option.value))
+
+        await self._on_interaction(interaction)
+
+    async def _on_select_page_click(self, interaction: Interaction) -> None:
+        self.selection.update(int(option.value) for option in self.ui.select.options)
+        await self._on_interaction(interaction)
+
+    async def _on_clear_click(self, interaction: Interaction) -> None:
+        self.selection.clear()
+        await self._on_interaction(interaction)
+
+    async def _update_ui(self) -> None:
+        await super()._update_ui()
+
+        # The page options may be shared with other views, so they must not be modified.
+        page_options = self.ui.select.options
+        defaults = [int(option.value) in self.selection for option in page_options]
+        previous_page_options, previous_defaults, options = self._marked_options
+
+        if (page_options is not previous_page_options) or (
+            defaults != previous_defaults
+        ):
+            options = [
+                SelectOption(label=option.label, value=option.value, default=default)
+                for option, default in zip(page_options, defaults)
+            ]
+            self._marked_options = (page_options, defaults, options)
+
+        selected_count = len(self.selection)
+        is_page_selected = all(option.default for option in options)
+
+        self.ui.select.options = options
+        self.ui.select.min_values = 0
+        self.ui.select.max_values = max(len(options), 1)
+
+        self.action_ui.select_page_button.disabled = is_page_selected
+        self.action_ui.clear_button.disabled = selected_count == 0
+        self.action_ui.confirm_button.disabled = selected_count == 0
+        self.action_ui.confirm_button.style = (
+            ButtonStyle.success if selected_count else ButtonStyle.secondary
+        )
+        self.action_ui.confirm_button.label = (
+            f"Confirm {selected_count} Selection{'' if selected_count == 1 else 's'}"
+        )
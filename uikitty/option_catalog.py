@@ -0,0 +1,300 @@
+import asyncio
+import json
+import os
+import time
+from collections.abc import Callable, Iterable
+from typing import Any, Final, NamedTuple, TypeAlias
+
+import aiohttp
+
+from uikitty.option_source import OptionItem
+from uikitty.option_store import OptionStore
+
+CatalogParser: TypeAlias = Callable[[Any], Iterable[OptionItem]]
+
+
+class _Snapshot(NamedTuple):
+    store: OptionStore
+    etag: str | None
+    last_modified: str | None
+    validated_time: float
+
+
+class OptionCatalog:
+    """A remote collection of options that is loaded in the background and kept on disk.
+
+    The catalog is fetched from a URL that returns JSON, and converted into options by a
+    parser function. Call `start()` when the bot (or cog) is set up, so that it's loaded
+    before the first command needs it. If a `cache_path` is provided, the options are
+    saved to that file in a compact JSON format, and later loaded from it on startup, so
+    the remote source doesn't need to be fetched again after a restart.
+
+    Once the options are older than `ttl` seconds, the next call to `load()` returns
+    them right away and refreshes them in the background. Refreshes are conditional
+    requests (using the `ETag` and `Last-Modified` headers of the previous response),
+    so an unchanged catalog is neither downloaded nor parsed again. If a refresh fails,
+    the previous options are kept until the next attempt.
+
+    Instances may be passed as the `source` of the selector functions (such as
+    `dynamic_select`), which wait until the options are loaded. To share a catalog
+    between all of the commands that use the same URL, create it via `shared()`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        parse: CatalogParser | None = None,
+        cache_path: str | os.PathLike[str] | None = None,
+        ttl: float | None = 86400,
+        timeout: float = 30,
+        log: Callable[[str], None] | None = print,
+        parser_version: str | int | None = None,
+    ) -> None:
+        """Initializes a new `OptionCatalog` instance. Nothing is loaded until needed.
+
+        Args:
+            url:
+                The URL from which to fetch the catalog. Must return JSON.
+            parse:
+                A function that accepts the decoded JSON and returns the options, each
+                of which may be an option string or a `(label, value)` pair. Option
+                values must be JSON-serializable to be cached on disk. By default, a
+                JSON object is parsed into its items, and a JSON array is parsed into
+                option strings (or `[label, value]` pairs).
+            cache_path:
+                The path of the file in which to cache the options between restarts.
+                Optional. The file (but not its directory) is created if needed.
+            ttl:
+                The number of seconds after which the options should be refreshed.
+                Set to `None` to never refresh them after they've been loaded.
+            timeout:
+                The maximum number of seconds to wait for the remote source to respond.
+            log:
+                A function that will be called to display information in the console.
+                Set to `None` to disable console output for this instance.
+            parser_version:
+                The version of the `parse` function. Optional. The cache file records
+                the (qualified) name and version of the function that produced it, and
+                is ignored if either differs, so change the version whenever the
+                function's output changes.
+        """
+        self.url: Final[str] = url
+        self.parse: Final[CatalogParser] = parse or _parse_items
+        self.cache_path: Final[str | os.PathLike[str] | None] = cache_path
+        self.ttl: float | None = ttl
+        self.timeout: float = timeout
+        self.log: Final[Callable[[str], None] | None] = log
+        self.parser_version: Final[str | int | None] = parser_version
+        self._parser_id: Final[str] = _get_parser_id(self.parse, parser_version)
+        self._snapshot: _Snapshot | None = None
+        self._load_task: asyncio.Task[None] | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    @classmethod
+    def shared(
+        cls, url: str, parse: CatalogParser | None = None, **kwargs: Any
+    ) -> "OptionCatalog":
+        """Returns the catalog for the given URL and parser, creating it if needed.
+
+        Every call with the same `url` and `parse` function returns the same instance,
+        so it's only loaded (and refreshed) once, no matter how many commands use it.
+        Other keyword arguments are passed to `__init__()` if a new instance is made.
+
+        Raises:
+            ValueError: If the instance already exists, and any of the other keyword
+                arguments differ from the corresponding attributes of that instance.
+        """
+        if (catalog := _shared_catalogs.get((url, parse))) is None:
+            catalog = cls(url, parse, **kwargs)
+            _shared_catalogs[(url, parse)] = catalog
+            return catalog
+
+        for name, value in kwargs.items():
+            if getattr(catalog, name) != value:
+                raise ValueError(
+                    f"The shared catalog at '{url}' already has a different '{name}'."
+                )
+        return catalog
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the options have been loaded (from the cache file or the URL)."""
+        return self._snapshot is not None
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the options are due to be refreshed (or haven't been loaded yet)."""
+        if self._snapshot is None:
+            return True
+        if self.ttl is None:
+            return False
+        return time.time() - self._snapshot.validated_time >= self.ttl
+
+    def start(self, loop: asyncio.AbstractEventLoop | None = None) -> None:
+        """Starts loading the options in the background, if that hasn't started yet.
+
+        Args:
+            loop:
+                The event loop on which to load the options, such as `bot.loop`. This
+                may be a loop that isn't running yet, e.g. while extensions are being
+                loaded. Defaults to the running event loop.
+        """
+        if self._load_task is None:
+            loop = loop or asyncio.get_running_loop()
+            self._load_task = loop.create_task(self._load())
+            self._load_task.add_done_callback(self._on_load_done)
+
+    async def load(self) -> OptionStore:
+        """Returns the options, waiting for them to be loaded if necessary.
+
+        If the options are stale, they're returned right away and refreshed in the
+        background. The returned `OptionStore` is replaced (not modified) by refreshes,
+        so it remains valid for selectors that are already displaying its options.
+
+        Raises:
+            Exception: Any exception raised while fetching or parsing the catalog, if
+                the options couldn't be loaded from the cache file either.
+        """
+        if self._snapshot is None:
+            self.start()
+            try:
+                await asyncio.shield(self._load_task)  # type: ignore[arg-type]
+            except Exception:
+                self._load_task = None  # Allow the next call to try again.
+                raise
+        elif self.is_stale:
+            self._start_refresh()
+
+        return self._snapshot.store  # type: ignore[union-attr]
+
+    async def refresh(self) -> None:
+        """Fetches the catalog again if it has changed since it was last fetched.
+
+        Raises:
+            aiohttp.ClientError: If the catalog couldn't be fetched.
+            Exception: Any exception raised while parsing the catalog.
+        """
+        snapshot = self._snapshot
+        headers = {}
+
+        if snapshot and snapshot.etag:
+            headers["If-None-Match"] = snapshot.etag
+        if snapshot and snapshot.last_modified:
+            headers["If-Modified-Since"] = snapshot.last_modified
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(self.url, headers=headers) as response:
+                if snapshot and (response.status == 304):
+                    self._snapshot = snapshot._replace(validated_time=time.time())
+                    await asyncio.to_thread(self._touch_cache_file)
+                    self._log(f"The catalog at '{self.url}' hasn't changed.")
+                    return
+
+                response.raise_for_status()
+                data = await response.json(content_type=None)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+        store = OptionStore(map(_get_item_pair, self.parse(data)))
+        self._snapshot = _Snapshot(store, etag, last_modified, time.time())
+        self._log(f"Fetched {len(store)} options from '{self.url}'.")
+        await asyncio.to_thread(self._write_cache_file, self._snapshot)
+
+    async def _load(self) -> None:
+        if self.cache_path and (
+            snapshot := await asyncio.to_thread(self._read_cache_file)
+        ):
+            self._snapshot = snapshot
+            self._log(f"Loaded {len(snapshot.store)} options for '{self.url}'.")
+
+        if self._snapshot is None:
+            await self.refresh()
+        elif self.is_stale:
+            self._start_refresh()
+
+    def _on_load_done(self, task: asyncio.Task[None]) -> None:
+        if not task.cancelled() and (error := task.exception()):
+            self._log(f"Couldn't load the catalog at '{self.url}': {error!r}")
+
+    def _start_refresh(self) -> None:
+        if self._refresh_task and not self._refresh_task.done():
+            return
+
+        async def refresh() -> None:
+            try:
+                await self.refresh()
+            except Exception as error:
+                self._log(f"Couldn't refresh the catalog at '{self.url}': {error!r}")
+
+        self._refresh_task = asyncio.create_task(refresh())
+
+    def _read_cache_file(self) -> _Snapshot | None:
+        try:
+            with open(self.cache_path, encoding="utf-8") as file:  # type: ignore
+                data = json.load(file)
+            validated_time = os.path.getmtime(self.cache_path)  # type: ignore
+        except (OSError, ValueError):
+            return None
+
+        if (data.get("url") != self.url) or (data.get("parser") != self._parser_id):
+            return None  # The options were produced by a different source or parser.
+
+        return _Snapshot(
+            OptionStore(zip(data["keys"], data["values"])),
+            data.get("etag"),
+            data.get("last_modified"),
+            validated_time,
+        )
+
+    def _write_cache_file(self, snapshot: _Snapshot) -> None:
+        if not self.cache_path:
+            return
+
+        temp_path = f"{os.fspath(self.cache_path)}.tmp"
+        data = {
+            "url": self.url,
+            "parser": self._parser_id,
+            "etag": snapshot.etag,
+            "last_modified": snapshot.last_modified,
+            "keys": snapshot.store.keys,
+            "values": snapshot.store.values,
+        }
+
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp_path, self.cache_path)
+        except (OSError, TypeError, ValueError) as error:
+            self._log(f"Couldn't cache the catalog at '{self.url}': {error!r}")
+
+    def _touch_cache_file(self) -> None:
+        if self.cache_path:
+            try:
+                os.utime(self.cache_path)
+            except OSError:
+                pass
+
+    def _log(self, message: str) -> None:
+        if self.log:
+            self.log(message)
+
+
+_shared_catalogs: Final[dict[tuple[str, CatalogParser | None], OptionCatalog]] = {}
+
+
+def _parse_items(data: Any) -> Iterable[OptionItem]:
+    return data.items() if isinstance(data, dict) else data
+
+
+def _get_parser_id(parse: CatalogParser, version: str | int | None) -> str:
+    name = getattr(parse, "__qualname__", type(parse).__qualname__)
+    parser_id = f"{getattr(parse, '__module__', None)}.{name}"
+    return parser_id if (version is None) else f"{parser_id}@{version}"
+
+
+def _get_item_pair(item: Any) -> tuple[str, Any]:
+    if isinstance(item, (tuple, list)):
+        key, value = item
+        return str(key), value
+    return str(item), item
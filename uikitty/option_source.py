@@ -0,0 +1,107 @@
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any, Final, TypeAlias
+
+from uikitty.option_store import OptionStore
+
+OptionItem: TypeAlias = "str | tuple[str, Any]"
+PagedFetcher: TypeAlias = Callable[[int, int], Awaitable[Iterable[OptionItem]]]
+
+
+class OptionSource:
+    """A helper class that incrementally loads options from an asynchronous source.
+
+    The underlying source may either be an `AsyncIterable` or a paged fetcher (i.e. an
+    async function that accepts an `offset` and a `limit` and returns a batch of items).
+    Each item must be an option key, or a `tuple` containing an option key and value.
+    Loaded options are appended to this instance's `store` in the order they arrive.
+
+    Options are only loaded when they're needed (via `ensure()`) or when explicitly
+    requested in the background (via `prefetch()`), so callers can start displaying
+    the first options before the rest of the source has been consumed.
+    """
+
+    MIN_FETCH_SIZE: Final[int] = 25
+
+    def __init__(
+        self,
+        source: AsyncIterable[OptionItem] | PagedFetcher,
+        count_hint: int | None = None,
+    ) -> None:
+        """Initializes a new `OptionSource` instance.
+
+        Args:
+            source:
+                An `AsyncIterable` of option items, or an async function that accepts
+                an `offset` and a `limit` and returns (at most) that many option items.
+                An empty or incomplete batch indicates that the source is exhausted.
+            count_hint:
+                The expected total number of options. Optional. If provided, this will
+                be used to estimate the number of pages before all options are loaded.
+        """
+        self.store: Final[OptionStore] = OptionStore()
+        self.count_hint: Final[int | None] = count_hint
+        self.is_exhausted: bool = False
+
+        self._iterator: AsyncIterator[OptionItem] | None = None
+        self._fetcher: PagedFetcher | None = None
+        self._fetch_offset: int = 0
+
+        if isinstance(source, AsyncIterable):
+            self._iterator = aiter(source)
+        else:
+            self._fetcher = source
+
+        self._lock: Final[asyncio.Lock] = asyncio.Lock()
+        self._prefetch_task: asyncio.Task[None] | None = None
+
+    @property
+    def estimated_count(self) -> int:
+        """The exact number of options if exhausted, or an estimate if not."""
+        if self.is_exhausted:
+            return len(self.store)
+        return max(self.count_hint or 0, len(self.store) + 1)
+
+    async def ensure(self, count: int) -> None:
+        """Loads options until at least `count` are available or the source runs out.
+
+        Args:
+            count:
+                The minimum number of options that should be available afterwards.
+        """
+        async with self._lock:
+            while (len(self.store) < count) and not self.is_exhausted:
+                await self._load_batch(count - len(self.store))
+
+    def prefetch(self, count: int) -> None:
+        """Starts loading options in the background until `count` of them are available.
+
+        This method does nothing if a background load is already in progress.
+
+        Args:
+            count:
+                The minimum number of options that should be available afterwards.
+        """
+        if self.is_exhausted or (len(self.store) >= count):
+            return
+        if self._prefetch_task and not self._prefetch_task.done():
+            return
+        self._prefetch_task = asyncio.create_task(self.ensure(count))
+
+    async def _load_batch(self, count: int) -> None:
+        if self._iterator:
+            try:
+                self._add_item(await anext(self._iterator))
+            except StopAsyncIteration:
+                self.is_exhausted = True
+        elif self._fetcher:
+            limit = max(count, type(self).MIN_FETCH_SIZE)
+            items = list(await self._fetcher(self._fetch_offset, limit))
+            self._fetch_offset += len(items)
+            for item in items:
+                self._add_item(item)
+            self.is_exhausted = len(items) < limit
+
+    def _add_item(self, item: OptionItem) -> None:
+        key, value = item if isinstance(item, tuple) else (item, item)
+        self.store.append(key, value)
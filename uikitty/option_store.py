@@ -0,0 +1,64 @@
+from collections.abc import Iterable
+from typing import Any, Final
+
+from discord import SelectOption
+
+
+class OptionStore:
+    """An append-only collection of options, each of which is identified by its index.
+
+    Option keys (i.e. labels) and values are kept in two parallel lists, so an option
+    can be looked up in O(1) time given its index. Components only need to send these
+    indices to and from Discord (as option values and custom IDs) instead of the full
+    keys, which keeps their payloads small. It also means that keys don't need to be
+    unique, and that they can be shortened for display without causing collisions.
+    """
+
+    MAX_SELECT_LABEL_LENGTH: Final[int] = 100
+    MAX_BUTTON_LABEL_LENGTH: Final[int] = 80
+
+    def __init__(self, items: Iterable[tuple[str, Any]] = ()) -> None:
+        """Initializes a new `OptionStore` instance.
+
+        Args:
+            items:
+                The initial options, as `(key, value)` pairs. Duplicate keys are kept.
+        """
+        self.keys: Final[list[str]] = []
+        self.values: Final[list[Any]] = []
+
+        for key, value in items:
+            self.append(key, value)
+
+    def __len__(self) -> int:
+        """Returns the number of options in this store."""
+        return len(self.keys)
+
+    def append(self, key: str, value: Any) -> int:
+        """Adds an option to the end of this store and returns its index."""
+        self.keys.append(key)
+        self.values.append(value)
+        return len(self.keys) - 1
+
+    def get_select_option(self, index: int) -> SelectOption:
+        """Returns a `SelectOption` for the option at the given index.
+
+        The label of the `SelectOption` is the option's key (shortened if necessary),
+        and its value is the option's index in this store.
+        """
+        return create_select_option(self.keys[index], index)
+
+    def get_button_label(self, index: int) -> str:
+        """Returns the option key at the given index, shortened to fit on a `Button`."""
+        return truncate(self.keys[index], type(self).MAX_BUTTON_LABEL_LENGTH)
+
+
+def create_select_option(key: str, index: int) -> SelectOption:
+    """Returns a `SelectOption` that displays the given key and refers to `index`."""
+    max_length = OptionStore.MAX_SELECT_LABEL_LENGTH
+    return SelectOption(label=truncate(key, max_length), value=str(index))
+
+
+def truncate(text: str, max_length: int) -> str:
+    """Shortens the given text to at most `max_length` characters (with an ellipsis)."""
+    return text if (len(text) <= max_length) else f"{text[:max_length - 1]}…"
@@ -1,141 +1,544 @@
+import asyncio
 import functools
-from collections.abc import Callable, Coroutine
-from typing import Any, Final, NamedTuple
+import inspect
+import os
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any, Final, TypeAlias
 
-from discord import ApplicationContext, ButtonStyle, Interaction, SelectOption
-from discord.ui import Button, Select
+from discord import ButtonStyle, Interaction, SelectOption
+from discord.ui import InputText, Modal, ViewItem
 
 from uikitty.base_selector import BaseSelector
+from uikitty.cached_components import CachedButton, CachedSelect
+from uikitty.instrumentation import EventKind
+from uikitty.option_store import OptionStore, create_select_option, truncate
+from uikitty.search_index import SearchIndex
+
+PageProvider: TypeAlias = Callable[
+    [int], list[SelectOption] | Awaitable[list[SelectOption]]
+]
+SearchIndexProvider: TypeAlias = Callable[[], Awaitable[SearchIndex]]
+RangeLabeler: TypeAlias = Callable[[int, int], str]
+PageLabeler: TypeAlias = Callable[[int], str]
 
 
 class Paginator:
     """A helper class that displays and manages paginated options for a `BaseSelector`.
 
-    This class must be initialized with multiple lists of `SelectOption` items, in which
-    each `list` represents the options that should be rendered on an individual page.
+    This class must be initialized with a page provider (i.e. a sync or async function
+    that returns the `SelectOption` items for a given page index) and a page count.
+    Pages are only built when they're needed, and only the most recently used pages
+    are kept around. As a result, the memory used by each instance remains constant
+    regardless of the total number of options.
+
+    If the keys of all options are known in advance, a function that returns a search
+    index of them may also be provided in order to enable searching. In that case, a
+    search button will be displayed alongside the navigation buttons. The index is first
+    requested when the search button is clicked (so that it may be built while the user
+    is typing), and the matching options replace the current page.
+
+    Similarly, a function that describes a range of pages may be provided in order to
+    enable jump navigation. In that case, an additional dropdown menu will list up to 25
+    page ranges. Selecting a range narrows it down into (up to) 25 smaller ranges, until
+    the range consists of a single page, which is then displayed. Any page can therefore
+    be reached by selecting at most `ceil(log25(page_count))` items from this menu.
+
+    If the options are sorted or grouped, a function that describes each page may also
+    be provided. Its description of the current page (e.g. "Ne–Ni") is then displayed
+    on the center button and in the placeholder of the dropdown menu, so that the user
+    can tell which way to navigate without having to open the menu on each page.
+
+    Each interaction is answered with a single request that edits the message in place.
+    If the user interacts again while an edit is still in progress, the new interaction
+    is only acknowledged, and the latest state is sent once the current edit completes
+    (through the parent view's `EditScheduler`, which limits the rate of such edits).
+    This way, rapid clicks result in one final edit instead of a backlog of stale ones.
 
     After an instance of this class is created, its `attach()` method must be called in
     order to make it functional. The provided `BaseSelector`'s `finish()` method will be
     called asynchronously once the user selects an option and confirms their choice.
     """
 
-    class UI(NamedTuple):
-        """A `NamedTuple` containing the individual UI components in a `Paginator`."""
+    class UI:
+        """A container for the individual UI components in a `Paginator`.
+
+        Each instance creates its own components, so that any number of paginators can
+        be active at the same time without sharing (and overwriting) each other's state.
+        """
+
+        __slots__ = (
+            "select",
+            "prev_button",
+            "center_button",
+            "next_button",
+            "search_button",
+            "jump_select",
+        )
+
+        def __init__(self) -> None:
+            """Initializes a new `UI` instance with a fresh set of components."""
+            self.select: Final[CachedSelect] = CachedSelect()
+            """A dropdown menu containing the available options on the current page."""
 
-        select: Select = Select()
-        """A dropdown menu containing all the available options on the current page."""
+            self.prev_button: Final[CachedButton] = CachedButton(
+                style=ButtonStyle.primary, label="<<"
+            )
+            """Navigates to the previous page when clicked. Disabled on first page."""
 
-        prev_button: Button = Button(style=ButtonStyle.primary, label="<<")
-        """Navigates to the previous page when clicked. Disabled when on first page."""
+            self.center_button: Final[CachedButton] = CachedButton()
+            """Confirms the selected option when clicked. Disabled if none is selected.
+               While disabled, will show information about the pagination state."""
 
-        center_button: Button = Button()
-        """Confirms the selected option when clicked. Disabled if no option is selected.
-           While disabled, will show information about the current pagination state."""
+            self.next_button: Final[CachedButton] = CachedButton(
+                style=ButtonStyle.primary, label=">>"
+            )
+            """Navigates to the next page when clicked. Disabled on the last page."""
 
-        next_button: Button = Button(style=ButtonStyle.primary, label=">>")
-        """Navigates to the next page when clicked. Disabled when on last page."""
+            self.search_button: Final[CachedButton] = CachedButton(label="🔍 Search")
+            """Opens a modal in which the user can search for options by name.
+               Only present if search keys were provided to the `Paginator`."""
+
+            self.jump_select: Final[CachedSelect] = CachedSelect()
+            """A dropdown menu containing ranges of pages to jump to.
+               Only present if a range labeler was provided to the `Paginator`."""
+
+        def __iter__(self) -> Iterator[ViewItem]:
+            """Yields each component in the order in which it should be displayed."""
+            yield self.jump_select
+            yield self.select
+            yield self.prev_button
+            yield self.center_button
+            yield self.next_button
+            yield self.search_button
+
+    class SearchModal(Modal):
+        """A modal in which the user can enter a query to search for options by name."""
+
+        def __init__(
+            self,
+            query: str | None,
+            on_submit: Callable[[Interaction, str], Awaitable[None]],
+        ) -> None:
+            """Initializes a new `SearchModal` instance.
+
+            Args:
+                query:
+                    The previous query, which is displayed as the initial value.
+                on_submit:
+                    An async function that accepts the modal's interaction and the
+                    submitted query. It's called when the user submits the modal.
+            """
+            self.query_input: Final[InputText] = InputText(
+                label="Search",
+                placeholder="Enter (part of) the name of an option",
+                value=query,
+                max_length=100,
+            )
+            super().__init__(self.query_input, title="Search Options")
+            self.on_submit: Final[
+                Callable[[Interaction, str], Awaitable[None]]
+            ] = on_submit
+
+        async def callback(self, interaction: Interaction) -> None:
+            """Passes the submitted query to the `on_submit` function."""
+            await self.on_submit(interaction, self.query_input.value or "")
+
+    MIN_PAGE_COUNT: int = 2
+    MAX_CACHED_PAGES: Final[int] = 3
+    MAX_SEARCH_RESULTS: Final[int] = 25
+    MAX_JUMP_RANGES: Final[int] = 25
+    MAX_PLACEHOLDER_LENGTH: Final[int] = 150
 
     def __init__(
         self,
-        *options_by_page: list[SelectOption],
+        page_provider: PageProvider,
+        page_count: int,
         placeholder: str = "Make a selection, or use the arrows for more options",
+        search_index: SearchIndexProvider | None = None,
+        range_labeler: RangeLabeler | None = None,
+        page_labeler: PageLabeler | None = None,
     ) -> None:
         """Initializes a new `Paginator` instance.
 
         Args:
-            *options_by_page:
-                Lists of `SelectOption` items, in which each `list` represents
-                the options that should be rendered on an individual page.
+            page_provider:
+                A sync or async function that accepts a page index and returns a list
+                of the `SelectOption` items that should be rendered on that page. The
+                value of each item must be its index in the parent view's `options`.
+            page_count:
+                The total number of pages that can be returned by the `page_provider`.
+                If this isn't known in advance, the `page_provider` may update the
+                `page_count` attribute of this instance whenever it's called.
             placeholder:
                 The placeholder text to display in the `Select` (dropdown) menu.
+            search_index:
+                An async function that returns a `SearchIndex` of the keys (i.e. labels)
+                of all options, such as `PageLayout.get_search_index`. Optional. If
+                provided, the user will be able to search for options by name.
+            range_labeler:
+                A function that accepts the indices of the first and last pages in
+                a range (inclusive) and returns a short description of the options
+                in that range, such as "Ag–Bo". Optional. If provided, the user will
+                be able to jump directly to any page using an extra dropdown menu.
+            page_labeler:
+                A function that accepts the index of a page and returns a short
+                description of the options on it, such as "Ne–Ni". Optional. If
+                provided, it's displayed instead of just the page number.
 
         Raises:
-            ValueError: If fewer than `2` lists (i.e. pages) of options are provided.
+            ValueError: If the `page_count` is less than `MIN_PAGE_COUNT`.
         """
-        if len(options_by_page) < 2:
-            raise ValueError("At least two lists (i.e. pages) of options are required.")
+        if page_count < type(self).MIN_PAGE_COUNT:
+            raise ValueError(
+                f"At least {type(self).MIN_PAGE_COUNT} pages of options are required."
+            )
 
-        self.options_by_page: Final[tuple[list[SelectOption], ...]] = options_by_page
+        self.page_provider: Final[PageProvider] = page_provider
+        self.page_count: int = page_count
         self.default_placeholder: Final[str] = placeholder
         self.ui: Final[Paginator.UI] = type(self).UI()
 
         self.ui.select.callback = self._on_select
         self.ui.prev_button.callback = self._on_prev_click
         self.ui.next_button.callback = self._on_next_click
+        self.ui.search_button.callback = self._on_search_click
+        self.ui.jump_select.callback = self._on_jump_select
 
-        async def uninitialized() -> None:
-            raise RuntimeError("'self.refresh_view' was never properly initialized.")
-
-        self.refresh_view: Callable[[], Coroutine[Any, Any, None]] = uninitialized
+        self.parent_view: BaseSelector | None = None
         self.current_page: int = 0
-        self.current_selection: str | None = None
+        self.current_selection: int | None = None
+        self._cached_pages: Final[OrderedDict[int, list[SelectOption]]] = OrderedDict()
+
+        self.search_index: Final[SearchIndexProvider | None] = search_index
+        self.search_query: str | None = None
+        self.search_results: list[SelectOption] | None = None
+        self._search_index_task: asyncio.Future[SearchIndex] | None = None
 
-    def attach(self, parent_view: BaseSelector, ctx: ApplicationContext) -> None:
+        self.range_labeler: Final[RangeLabeler | None] = range_labeler
+        self.page_labeler: Final[PageLabeler | None] = page_labeler
+        self.jump_range: tuple[int, int] = (0, page_count)
+
+        self._refresh_lock: Final[asyncio.Lock] = asyncio.Lock()
+        self._pending_interaction: Interaction | None = None
+        self._sent_components: list[dict[str, Any]] | None = None
+        self._filtered_options: tuple[list[SelectOption], str, list[SelectOption]] = (
+            [],
+            "",
+            [],
+        )
+        self._jump_state: tuple[Any, ...] | None = None
+
+    def attach(self, parent_view: BaseSelector) -> None:
         """Adds pagination UI components to the view and sets up the required callbacks.
 
+        Note:
+            The `prepare()` method must be awaited before the parent view is displayed.
+
         Args:
             parent_view:
                 The `BaseSelector` view to which these UI components will be added.
                 Once a selection is made, this view's `finish()` method will be called.
-            ctx:
-                The context for the application command that prompted this selection.
         """
 
         async def on_confirm(interaction: Interaction) -> None:
-            if isinstance(self.current_selection, str):
+            if isinstance(self.current_selection, int):
                 await parent_view.finish(self.current_selection, interaction)
             else:
                 raise TypeError("Cannot confirm a nonexistent selection.")
 
-        self.refresh_view = functools.partial(ctx.edit, view=parent_view)
+        self.parent_view = parent_view
         self.ui.center_button.callback = on_confirm
-        self._update_ui()
 
         for component in self.ui:
+            if (component is self.ui.search_button) and not self.search_index:
+                continue
+            if (component is self.ui.jump_select) and not self.range_labeler:
+                continue
             parent_view.add_item(component)
 
+    async def prepare(self) -> None:
+        """Loads the first page and updates the UI components to display its options."""
+        await self._update_ui()
+        if self.parent_view:
+            # The parent view is about to be sent with these components.
+            self._sent_components = self.parent_view.to_components()
+
     @property
-    def _has_selection(self) -> bool:
-        return self.current_selection is not None
+    def _is_searching(self) -> bool:
+        return bool(self.search_results)
 
     async def _on_select(self, interaction: Interaction) -> None:
-        self.current_selection = self.ui.select.values[0]
+        self.current_selection = int(self.ui.select.values[0])
         await self._on_interaction(interaction)
 
     async def _on_prev_click(self, interaction: Interaction) -> None:
-        self.current_page -= 1
+        if not self._clear_search():
+            self._go_to_page(self.current_page - 1)
         self.current_selection = None
         await self._on_interaction(interaction)
 
     async def _on_next_click(self, interaction: Interaction) -> None:
-        self.current_page += 1
+        if not self._clear_search():
+            self._go_to_page(self.current_page + 1)
         self.current_selection = None
         await self._on_interaction(interaction)
 
+    async def _on_jump_select(self, interaction: Interaction) -> None:
+        start, end = map(int, str(self.ui.jump_select.values[0]).split(":"))
+
+        if end - start > 1:
+            self.jump_range = (start, end)
+        else:
+            self._clear_search()
+            self._go_to_page(start)
+            self.current_selection = None
+            self.jump_range = (0, self.page_count)
+
+        await self._on_interaction(interaction)
+
+    def _go_to_page(self, page_index: int) -> None:
+        # Clicks that arrive before the arrow buttons are disabled may overshoot.
+        page_index = max(0, min(page_index, self.page_count - 1))
+        if page_index == self.current_page:
+            return
+
+        self.current_page = page_index
+        if self.parent_view:
+            self.parent_view.emit(
+                EventKind.PAGE_NAVIGATED,
+                page_index=page_index,
+                page_count=self.page_count,
+            )
+
+    async def _on_search_click(self, interaction: Interaction) -> None:
+        if self.search_index and not self._search_index_task:
+            self._search_index_task = asyncio.ensure_future(self.search_index())
+
+        async def on_submit(modal_interaction: Interaction, query: str) -> None:
+            if self._search_index_task and not self._search_index_task.done():
+                await modal_interaction.response.defer()
+            await self._search(query)
+            await self._on_interaction(modal_interaction)
+
+        await interaction.response.send_modal(
+            type(self).SearchModal(self.search_query, on_submit)
+        )
+
+    async def _search(self, query: str) -> None:
+        self.current_selection = None
+
+        if not (query := query.strip()) or (self._search_index_task is None):
+            self._clear_search()
+            return
+
+        search_index = await self._search_index_task
+        matches = search_index.search(query, type(self).MAX_SEARCH_RESULTS)
+
+        self.search_query = query
+        self.search_results = [
+            create_select_option(search_index.keys[i], i) for i in matches
+        ]
+
+    def _clear_search(self) -> bool:
+        was_searching = self._is_searching
+        self.search_query = None
+        self.search_results = None
+        return was_searching
+
     async def _on_interaction(self, interaction: Interaction) -> None:
-        await interaction.response.defer()
-        self._update_ui()
-        await self.refresh_view()
-
-    def _update_ui(self) -> None:
-        page_count = len(self.options_by_page)
-        options = self.options_by_page[self.current_page]
-        center_button_label = f"Page {self.current_page + 1} of {page_count}"
-
-        if self._has_selection:
-            self.ui.select.placeholder = self.current_selection
-            self.ui.select.options = [
-                option for option in options if (option.label != self.current_selection)
-            ]
+        if not self.parent_view:
+            raise RuntimeError("This paginator was never attached to a parent view.")
+
+        if not interaction.response.is_done():
+            if self._refresh_lock.locked() or not self._is_page_loaded():
+                await interaction.response.defer()
+
+        if interaction.response.is_done():
+            self._pending_interaction = interaction
+            if self._refresh_lock.locked():
+                return  # The edit in progress will pick up the latest state afterwards.
+
+        async with self._refresh_lock:
+            if not interaction.response.is_done():
+                await self._update_ui()
+                if self._has_visible_changes():
+                    await self._send_edit(interaction.response.edit_message)
+                else:
+                    await interaction.response.defer()
+
+            while pending_interaction := self._pending_interaction:
+                self._pending_interaction = None
+                await self._update_ui()
+                if self._has_visible_changes():
+                    await self.parent_view.schedule_edit(
+                        pending_interaction.channel_id,
+                        functools.partial(
+                            self._send_edit, pending_interaction.edit_original_response
+                        ),
+                    )
+
+    def _has_visible_changes(self) -> bool:
+        # Components reuse their payloads until they change (and never modify them), so
+        # unchanged components are compared by identity, and this is nearly free.
+        components = self.parent_view.to_components() if self.parent_view else []
+        if components == self._sent_components:
+            return False
+        self._sent_components = components
+        return True
+
+    async def _send_edit(self, edit: Callable[..., Awaitable[Any]]) -> None:
+        try:
+            await edit(view=self.parent_view)
+        except Exception:
+            self._sent_components = None  # The previous components may still be shown.
+            raise
+
+    def _is_page_loaded(self) -> bool:
+        return (
+            self._is_searching
+            or (self.current_page in self._cached_pages)
+            or not inspect.iscoroutinefunction(self.page_provider)
+        )
+
+    async def _get_page(self, index: int) -> list[SelectOption]:
+        if index in self._cached_pages:
+            self._cached_pages.move_to_end(index)
+            return self._cached_pages[index]
+
+        result = self.page_provider(index)
+        options = (await result) if inspect.isawaitable(result) else result
+
+        self._cached_pages[index] = options
+        while len(self._cached_pages) > type(self).MAX_CACHED_PAGES:
+            self._cached_pages.popitem(last=False)
+
+        return options
+
+    async def _update_ui(self) -> None:
+        if self._is_searching:
+            options = self.search_results or []
+            center_button_label = f"Search Results: {len(options)}"
+            placeholder = f"Results for '{self.search_query}' (use arrows to go back)"
+        else:
+            options = await self._get_page(self.current_page)
+            center_button_label = f"Page {self.current_page + 1} of {self.page_count}"
+            placeholder = self.default_placeholder
+
+            if self.page_labeler:
+                page_label = self.page_labeler(self.current_page)
+                center_button_label = truncate(
+                    f"{page_label} ({self.current_page + 1}/{self.page_count})",
+                    OptionStore.MAX_BUTTON_LABEL_LENGTH,
+                )
+                placeholder = f"[{page_label}] {placeholder}"
+
+            if self.search_results is not None:
+                center_button_label = "No Search Results"
+
+        if self.parent_view and (self.current_selection is not None):
+            selected_value = str(self.current_selection)
+            self.ui.select.placeholder = truncate(
+                self.parent_view.options.keys[self.current_selection],
+                type(self).MAX_PLACEHOLDER_LENGTH,
+            )
+            self.ui.select.options = self._get_options_without(options, selected_value)
             self.ui.center_button.style = ButtonStyle.success
             self.ui.center_button.label = "Confirm Selection"
             self.ui.center_button.disabled = False
         else:
-            self.ui.select.placeholder = self.default_placeholder
+            self.ui.select.placeholder = truncate(
+                placeholder, type(self).MAX_PLACEHOLDER_LENGTH
+            )
             self.ui.select.options = options
             self.ui.center_button.style = ButtonStyle.secondary
             self.ui.center_button.label = center_button_label
             self.ui.center_button.disabled = True
 
-        self.ui.prev_button.disabled = self.current_page == 0
-        self.ui.next_button.disabled = self.current_page == (page_count - 1)
+        if self.range_labeler:
+            self._update_jump_select(self.range_labeler)
+
+        is_first_page = self.current_page == 0
+        is_last_page = self.current_page == (self.page_count - 1)
+        self.ui.prev_button.disabled = is_first_page and not self._is_searching
+        self.ui.next_button.disabled = is_last_page and not self._is_searching
+
+    def _get_options_without(
+        self, options: list[SelectOption], value: str
+    ) -> list[SelectOption]:
+        # Reuses the previous list if possible, so that its payload is reused as well.
+        previous_options, previous_value, filtered_options = self._filtered_options
+
+        if (options is not previous_options) or (value != previous_value):
+            filtered_options = [
+                option for option in options if (option.value != value)
+            ] or options
+            self._filtered_options = (options, value, filtered_options)
+
+        return filtered_options
+
+    def _update_jump_select(self, range_labeler: RangeLabeler) -> None:
+        state = (
+            self.jump_range,
+            self.current_page,
+            self.page_count,
+            self._is_searching,
+        )
+        if state == self._jump_state:
+            return  # The jump options would be the same as before.
+
+        self._jump_state = state
+        start, end = self.jump_range
+
+        # Divide the range evenly, so that every level uses as many ranges as possible.
+        range_count = min(end - start, type(self).MAX_JUMP_RANGES)
+        range_starts = [
+            start + ((end - start) * i) // range_count for i in range(range_count + 1)
+        ]
+
+        options = []
+        for range_start, range_end in zip(range_starts, range_starts[1:]):
+            is_single_page = (range_end - range_start) == 1
+            options.append(
+                SelectOption(
+                    label=range_labeler(range_start, range_end - 1),
+                    value=f"{range_start}:{range_end}",
+                    description=(
+                        f"Page {range_start + 1}"
+                        if is_single_page
+                        else f"Pages {range_start + 1}–{range_end}"
+                    ),
+                    default=is_single_page
+                    and (range_start == self.current_page)
+                    and not self._is_searching,
+                )
+            )
+
+        self.ui.jump_select.options = options
+        self.ui.jump_select.placeholder = (
+            "Jump to a range of pages"
+            if (self.jump_range == (0, self.page_count))
+            else f"Jump to a page in {range_labeler(start, end - 1)}"
+        )
+
+    @staticmethod
+    def get_range_label(first_key: str, last_key: str, max_length: int = 45) -> str:
+        """Returns a short label describing a range of (ideally sorted) option keys.
+
+        Each key is shortened to the smallest prefix (of at least two characters) that
+        still distinguishes it from the other key, e.g. `"Ag–Bo"` or `"Neo–Nic"`.
+
+        Args:
+            first_key:
+                The first option key in the range.
+            last_key:
+                The last option key in the range.
+            max_length:
+                The maximum number of characters to keep from each key.
+
+        Returns:
+            A label in the format `"<first>–<last>"`.
+        """
+        prefix_length = len(os.path.commonprefix([first_key, last_key]))
+        length = min(max(prefix_length + 1, 2), max_length)
+        return f"{first_key[:length]}–{last_key[:length]}"
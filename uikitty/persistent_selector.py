@@ -0,0 +1,359 @@
+import functools
+import math
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any, Final, TypeAlias
+
+from discord import (
+    ApplicationContext,
+    ButtonStyle,
+    Client,
+    Embed,
+    Interaction,
+    InteractionType,
+)
+from discord.ui import Button, Select, View
+
+from uikitty.edit_scheduler import EditScheduler, edit_scheduler
+from uikitty.layout_cache import LayoutCache
+from uikitty.option_store import OptionStore, create_select_option, truncate
+from uikitty.session_store import MemorySessionStore, SessionState, SessionStore
+
+SelectionHandler: TypeAlias = Callable[[Interaction, Any, Any], Awaitable[None]]
+
+
+class PersistentSelectorManager:
+    """Runs selectors whose state is kept in a `SessionStore` instead of in memory.
+
+    A regular `DynamicSelector` only works for as long as the process that created it is
+    running, and only that process can handle its interactions. The selectors created
+    by this class are stateless on the Python side instead. Their components have
+    custom IDs of the form `"uikitty:<session ID>:<action>"`, and each interaction is
+    handled by loading the session's state from the store, applying the action, saving
+    the state, and re-rendering the components from it. Any process that uses the same
+    store (and registers the same handlers) can therefore handle any interaction,
+    including after a restart. If two processes handle clicks on the same selector at
+    the same time, the state saved last wins.
+
+    Since the code that created a selector may no longer be running once a selection is
+    made, selections are delivered to a named handler (see `handler()`), rather than
+    returned. The handler receives the interaction that confirmed the selection, and may
+    use it to respond (e.g. by editing the message). Otherwise, it's deferred.
+
+    The layouts match those of `DynamicSelector`: 2–5 options are displayed as buttons,
+    6–25 options as a dropdown menu, and more options are divided into pages. Search and
+    jump navigation are not available for persistent selectors.
+    """
+
+    CUSTOM_ID_PREFIX: Final[str] = "uikitty"
+    MAX_ENTRIES_PER_PAGE: Final[int] = 25
+    MAX_BUTTONS_PER_ROW: Final[int] = 5
+    MIN_OPTIONS: Final[int] = 2
+    MAX_PLACEHOLDER_LENGTH: Final[int] = 150
+
+    def __init__(
+        self,
+        client: Client,
+        store: SessionStore | None = None,
+        layout_cache: LayoutCache | None = None,
+        scheduler: EditScheduler = edit_scheduler,
+    ) -> None:
+        """Initializes a new `PersistentSelectorManager` that handles `client`'s clicks.
+
+        Args:
+            client:
+                The bot (or other client) whose component interactions to handle.
+            store:
+                The `SessionStore` in which to keep the state of each selector. Defaults
+                to a `MemorySessionStore`, which doesn't persist across restarts.
+            layout_cache:
+                A `LayoutCache` in which to keep the pages built for paged selectors, so
+                that re-rendering a session doesn't need to rebuild them every time.
+            scheduler:
+                The `EditScheduler` through which to send message edits that don't
+                respond to an interaction. Defaults to the process-wide scheduler.
+        """
+        self.store: Final[SessionStore] = store or MemorySessionStore()
+        self.layout_cache: Final[LayoutCache] = layout_cache or LayoutCache(max_size=32)
+        self.handlers: Final[dict[str, SelectionHandler]] = {}
+        self.scheduler: Final[EditScheduler] = scheduler
+        client.add_listener(self.on_interaction, "on_interaction")
+
+    def handler(
+        self, name: str | None = None
+    ) -> Callable[[SelectionHandler], SelectionHandler]:
+        """Returns a decorator that registers a function as a selection handler.
+
+        Every process that uses the same store must register the same handlers, and it
+        must do so before handling any interactions (e.g. when the bot is set up).
+
+        Args:
+            name:
+                The name to register the handler under, which is stored in each session.
+                Defaults to the qualified name of the decorated function.
+        """
+
+        def decorator(function: SelectionHandler) -> SelectionHandler:
+            self.handlers[name or function.__qualname__] = function
+            return function
+
+        return decorator
+
+    async def select(
+        self,
+        ctx: ApplicationContext,
+        handler: str,
+        *args: str,
+        content: str | None = None,
+        embed: Embed | None = None,
+        button_style: ButtonStyle = ButtonStyle.secondary,
+        select_placeholder: str | None = None,
+        timeout: float | None = None,
+        data: Any = None,
+        **kwargs: Any,
+    ) -> str:
+        """Displays a persistent selector and returns the ID of its session.
+
+        Args:
+            ctx:
+                The context for the application command that prompted this selection.
+            handler:
+                The name of the handler that will receive the selection.
+            *args:
+                An ordered collection of option strings.
+                Cannot be used alongside `**kwargs`.
+            content:
+                The text content to display in the message with the selector.
+            embed:
+                An embed to display in the message with the selector.
+            button_style:
+                The `ButtonStyle` to use for the option `Button` components.
+                Only applicable if there are between 2 and 5 options (inclusive).
+            select_placeholder:
+                The placeholder text to display in the `Select` (dropdown) component.
+            timeout:
+                The number of seconds after which the session expires, counted from
+                the user's latest interaction. Set to `None` to keep it indefinitely.
+            data:
+                Arbitrary data that will be passed to the handler, e.g. to identify what
+                the selection is for. Must be JSON-serializable if the store needs it.
+            **kwargs:
+                An ordered mapping of option labels to option values. The values must be
+                JSON-serializable if the store needs it.
+                Cannot be used alongside `*args`.
+
+        Raises:
+            KeyError: If no handler has been registered under the name `handler`.
+            ValueError: If both `*args` and `**kwargs` are provided, or if fewer than
+                2 options are provided.
+        """
+        if args and kwargs:
+            raise ValueError("Only one of '*args' or '**kwargs' may be provided.")
+        if handler not in self.handlers:
+            raise KeyError(f"No selection handler is registered as '{handler}'.")
+
+        options = OptionStore(kwargs.items() if kwargs else zip(args, args))
+
+        if len(options) < type(self).MIN_OPTIONS:
+            raise ValueError(f"At least {type(self).MIN_OPTIONS} options are required.")
+
+        session_id = uuid.uuid4().hex
+        state = SessionState(
+            handler=handler,
+            keys=options.keys,
+            values=options.values,
+            placeholder=select_placeholder,
+            button_style=button_style.value,
+            data=data,
+            timeout=timeout,
+            expiry_time=_get_expiry_time(timeout),
+        )
+        await self.store.save(session_id, state)
+
+        view = self.render(session_id, state)
+
+        if ctx.response.is_done():
+            await self.scheduler.submit(
+                ctx.channel_id,
+                session_id,
+                functools.partial(ctx.edit, content=content, embed=embed, view=view),
+            )
+        else:
+            await ctx.respond(content=content, embed=embed, view=view)
+
+        return session_id
+
+    async def on_interaction(self, interaction: Interaction) -> None:
+        """Handles a component interaction if it belongs to a persistent selector."""
+        if interaction.type is not InteractionType.component:
+            return
+
+        prefix, _, target = (interaction.custom_id or "").partition(":")
+
+        if prefix != type(self).CUSTOM_ID_PREFIX:
+            return
+
+        session_id, _, action = target.partition(":")
+
+        if (state := await self.store.load(session_id)) is None:
+            await interaction.response.send_message(
+                "This selection is no longer available.", ephemeral=True
+            )
+            return
+
+        state = state._replace(expiry_time=_get_expiry_time(state.timeout))
+
+        match action.split(":"):
+            case ["pick", option_index]:
+                await self._finish(session_id, state, int(option_index), interaction)
+            case ["select"] if _get_page_count(state) == 1:
+                selected_index = _get_selected_index(interaction)
+                await self._finish(session_id, state, selected_index, interaction)
+            case ["select"]:
+                await self._update(
+                    session_id,
+                    state,
+                    interaction,
+                    selected_index=_get_selected_index(interaction),
+                )
+            case ["page", page_index]:
+                # Like in a `Paginator`, navigating clears the selection.
+                await self._update(
+                    session_id,
+                    state,
+                    interaction,
+                    page_index=int(page_index),
+                    selected_index=None,
+                )
+            case ["confirm"] if state.selected_index is not None:
+                await self._finish(session_id, state, state.selected_index, interaction)
+            case _:
+                await interaction.response.defer()
+
+    def render(self, session_id: str, state: SessionState) -> View:
+        """Returns a view that displays the given state of a persistent selector.
+
+        The view is stopped before it's returned, so that it's never registered with the
+        client. Its interactions are handled by this manager (via `on_interaction()`).
+        """
+        view = View(timeout=None)
+        custom_id_prefix = f"{type(self).CUSTOM_ID_PREFIX}:{session_id}"
+        option_count = len(state.keys)
+        cls = type(self)
+
+        if option_count <= cls.MAX_BUTTONS_PER_ROW:
+            for index, key in enumerate(state.keys):
+                view.add_item(
+                    Button(
+                        style=ButtonStyle(state.button_style),
+                        label=truncate(key, OptionStore.MAX_BUTTON_LABEL_LENGTH),
+                        custom_id=f"{custom_id_prefix}:pick:{index}",
+                    )
+                )
+        elif (page_count := _get_page_count(state)) == 1:
+            view.add_item(
+                Select(
+                    custom_id=f"{custom_id_prefix}:select",
+                    placeholder=state.placeholder,
+                    options=self.layout_cache.get(state.keys, 1).get_page(0),
+                )
+            )
+        else:
+            self._render_pages(view, custom_id_prefix, state, page_count)
+
+        view.stop()
+        return view
+
+    def _render_pages(
+        self, view: View, custom_id_prefix: str, state: SessionState, page_count: int
+    ) -> None:
+        page_index = state.page_index
+        options = self.layout_cache.get(state.keys, page_count).get_page(page_index)
+        placeholder = state.placeholder or (
+            "Make a selection, or use the arrows for more options"
+        )
+
+        if (selected_index := state.selected_index) is not None:
+            options = [
+                option for option in options if option.value != str(selected_index)
+            ] or [create_select_option(state.keys[selected_index], selected_index)]
+            placeholder = state.keys[selected_index]
+            center_button: Button = Button(
+                style=ButtonStyle.success,
+                label="Confirm Selection",
+                custom_id=f"{custom_id_prefix}:confirm",
+            )
+        else:
+            center_button = Button(
+                label=f"Page {page_index + 1} of {page_count}",
+                custom_id=f"{custom_id_prefix}:confirm",
+                disabled=True,
+            )
+
+        view.add_item(
+            Select(
+                custom_id=f"{custom_id_prefix}:select",
+                placeholder=truncate(placeholder, type(self).MAX_PLACEHOLDER_LENGTH),
+                options=options,
+            )
+        )
+        view.add_item(
+            Button(
+                style=ButtonStyle.primary,
+                label="<<",
+                custom_id=f"{custom_id_prefix}:page:{page_index - 1}",
+                disabled=(page_index == 0),
+            )
+        )
+        view.add_item(center_button)
+        view.add_item(
+            Button(
+                style=ButtonStyle.primary,
+                label=">>",
+                custom_id=f"{custom_id_prefix}:page:{page_index + 1}",
+                disabled=(page_index == page_count - 1),
+            )
+        )
+
+    async def _update(
+        self,
+        session_id: str,
+        state: SessionState,
+        interaction: Interaction,
+        **changes: Any,
+    ) -> None:
+        state = state._replace(**changes)
+        await self.store.save(session_id, state)
+        await interaction.response.edit_message(view=self.render(session_id, state))
+
+    async def _finish(
+        self,
+        session_id: str,
+        state: SessionState,
+        selected_index: int,
+        interaction: Interaction,
+    ) -> None:
+        if (handler := self.handlers.get(state.handler)) is None:
+            await interaction.response.send_message(
+                "This selection can't be completed right now.", ephemeral=True
+            )
+            return
+
+        await self.store.delete(session_id)
+        await handler(interaction, state.values[selected_index], state.data)
+
+        if not interaction.response.is_done():
+            await interaction.response.defer()
+
+
+def _get_page_count(state: SessionState) -> int:
+    return math.ceil(len(state.keys) / PersistentSelectorManager.MAX_ENTRIES_PER_PAGE)
+
+
+def _get_selected_index(interaction: Interaction) -> int:
+    return int(interaction.data["values"][0])  # type: ignore
+
+
+def _get_expiry_time(timeout: float | None) -> float | None:
+    return None if (timeout is None) else (time.time() + timeout)
@@ -0,0 +1,269 @@
+import asyncio
+import functools
+import math
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, Final, NamedTuple
+
+from discord import ButtonStyle, HTTPException, Interaction, Message, SelectOption
+from discord.ui import Button, Select
+
+from uikitty.base_selector import BaseSelector
+from uikitty.instrumentation import EventKind
+from uikitty.layout_planner import LayoutPlanner
+from uikitty.option_store import OptionStore, truncate
+
+
+class PollResults(NamedTuple):
+    """The aggregated choices of every user who voted in a poll."""
+
+    counts: dict[str, int]
+    """The number of votes for each option key (i.e. label), in the original order."""
+
+    choices: dict[int, Any]
+    """The value of the option chosen by each user who voted, keyed by their user ID."""
+
+
+class PollSelector(BaseSelector):
+    """A `BaseSelector` view that collects one choice from each of any number of users.
+
+    Unlike other selectors, a single instance of this view is shared by everyone who can
+    see its message, so collecting choices from hundreds of users only takes one message
+    and one view. Each user's latest choice is kept in `choices` (keyed by user ID), and
+    the number of votes for each option is kept in `tally`. Both are updated in O(1)
+    time per vote.
+
+    Votes are acknowledged without editing the message. Instead, the tally displayed on
+    the components is refreshed at most once every `update_interval` seconds, and only
+    if any votes were cast since the previous refresh. This caps the number of message
+    edits per poll, regardless of how many users vote (or change their votes). Since the
+    token of the interaction that displayed the poll expires after 15 minutes, later
+    edits are sent through the message's channel instead, so polls may run for any
+    duration. Open polls are also never evicted from their `SelectorRegistry`.
+    """
+
+    MAX_OPTIONS: Final[int] = 25
+    MAX_BUTTONS_PER_ROW: Final[int] = 5
+    MIN_OPTIONS: Final[int] = 2
+    INTERACTION_EDIT_SECONDS: Final[float] = 840
+    EVICTABLE: bool = False
+
+    def __init__(
+        self,
+        button_style: ButtonStyle,
+        select_placeholder: str | None,
+        log: Callable[[str], None] | None,
+        options: OptionStore,
+        update_interval: float = 2.0,
+    ) -> None:
+        """Initializes a new `PollSelector` instance.
+
+        Args:
+            button_style:
+                The `ButtonStyle` to use for the option `Button` components.
+                Only applicable if there are between 2 and 5 options (inclusive).
+            select_placeholder:
+                The placeholder text to display in the `Select` (dropdown) component.
+                Only applicable if there are between 6 and 25 options (inclusive).
+            log:
+                A function that will be called to display information in the console.
+                Set to `None` to disable console output for this instance.
+            options:
+                The `OptionStore` containing the keys (i.e. labels) and values of all
+                options. Components refer to options by their index in this store.
+            update_interval:
+                The minimum number of seconds between two edits of the message that
+                displays this view, which refresh the displayed tally.
+
+        Raises:
+            ValueError: If fewer than `2` or more than `25` options are provided.
+        """
+        cls = type(self)
+
+        # Checked before `super().__init__()`, which registers this instance.
+        if not (cls.MIN_OPTIONS <= len(options) <= cls.MAX_OPTIONS):
+            raise ValueError(
+                f"Polls must have between {cls.MIN_OPTIONS} "
+                f"and {cls.MAX_OPTIONS} options."
+            )
+
+        super().__init__(log=log, options=options)
+
+        self.update_interval: float = update_interval
+        self.choices: Final[dict[int, int]] = {}
+        self.tally: Final[list[int]] = [0] * len(options)
+        self.pending_vote_count: int = 0
+        self.select: Select | None = None
+        self.buttons: Final[list[Button]] = []
+
+        if len(options) > cls.MAX_BUTTONS_PER_ROW:
+            self._setup_select(select_placeholder)
+            layout = "poll_select"
+        else:
+            self._setup_buttons(button_style)
+            layout = "poll_buttons"
+
+        self._render_tally()
+        plan = LayoutPlanner.plan(len(options))
+        self.emit(
+            EventKind.LAYOUT_CHOSEN,
+            layout=layout,
+            option_count=len(options),
+            page_count=1,
+            button_count=plan.button_count,
+            select_count=plan.select_count,
+            expected_clicks=round(plan.expected_clicks, 3),
+        )
+
+    async def vote(self, option_index: int, interaction: Interaction) -> None:
+        """Records the user's choice, replacing any choice they've previously made.
+
+        The interaction is acknowledged without changing the message. The new tally
+        will be displayed by the next call to `update_tally()`.
+
+        Args:
+            option_index:
+                The index in this instance's `options` of the item chosen by the user.
+            interaction:
+                The `Interaction` on the UI component that triggered this method call.
+        """
+        await interaction.response.defer()
+
+        if self.is_finished() or not interaction.user:
+            return
+
+        user_id = interaction.user.id
+
+        if (previous_index := self.choices.get(user_id)) == option_index:
+            return
+        if previous_index is not None:
+            self.tally[previous_index] -= 1
+
+        self.choices[user_id] = option_index
+        self.tally[option_index] += 1
+        self.pending_vote_count += 1
+
+    async def collect(self, duration: float | None) -> PollResults:
+        """Collects votes until the `duration` elapses or this view is stopped.
+
+        While votes are being collected, the displayed tally is refreshed periodically
+        via `update_tally()`. Once collection ends, the components are disabled and the
+        final tally is displayed.
+
+        Args:
+            duration:
+                The number of seconds for which to collect votes. Set to `None` to
+                collect them until this view is stopped.
+
+        Returns:
+            The aggregated choices of every user who voted.
+        """
+        deadline = math.inf if (duration is None) else (time.monotonic() + duration)
+        stopped = asyncio.ensure_future(self.wait())
+
+        try:
+            while (not stopped.done()) and (
+                remaining := deadline - time.monotonic()
+            ) > 0:
+                await asyncio.wait(
+                    {stopped}, timeout=min(self.update_interval, remaining)
+                )
+                await self.update_tally()
+        finally:
+            self.stop()
+
+        self.disable_all_items()
+        await self.update_tally(force=True)
+        self.emit(EventKind.POLL_CLOSED, voter_count=len(self.choices))
+
+        return self.get_results()
+
+    async def update_tally(self, force: bool = False) -> None:
+        """Edits the message that displays this view to show the current tally.
+
+        Args:
+            force:
+                Whether to edit the message even if no votes were cast since the last
+                update, e.g. to display a change to the components themselves.
+        """
+        if not (self.message and (self.pending_vote_count or force)):
+            return
+
+        batched_vote_count = self.pending_vote_count
+        self.pending_vote_count = 0
+        self._render_tally()
+
+        try:
+            await self.schedule_edit(
+                self.message.channel.id,
+                functools.partial(self._get_edit(self.message), view=self),
+            )
+        except HTTPException:
+            # Keep the votes pending, so that the next update will try again.
+            self.pending_vote_count += batched_vote_count
+            return
+
+        self.emit(
+            EventKind.TALLY_UPDATED,
+            voter_count=len(self.choices),
+            batched_vote_count=batched_vote_count,
+        )
+
+    def _get_edit(self, message: Message) -> Callable[..., Awaitable[Any]]:
+        # The message is a response to an interaction, whose token (which is used to
+        # edit the message) expires after 15 minutes. Later edits are sent through the
+        # message's channel instead, which uses the bot's own token.
+        if time.perf_counter() - self.start_time < type(self).INTERACTION_EDIT_SECONDS:
+            return message.edit
+        # Group DMs can't contain bots, let alone their polls.
+        channel = message.channel
+        return channel.get_partial_message(message.id).edit  # type: ignore[union-attr]
+
+    def get_results(self) -> PollResults:
+        """Returns the choices that have been made so far, aggregated by option."""
+        counts: dict[str, int] = {}
+        for key, count in zip(self.options.keys, self.tally):
+            counts[key] = counts.get(key, 0) + count
+
+        values = self.options.values
+        choices = {user_id: values[index] for user_id, index in self.choices.items()}
+
+        return PollResults(counts, choices)
+
+    def _setup_select(self, placeholder: str | None) -> None:
+        select = Select(placeholder=placeholder)
+
+        async def callback(interaction: Interaction) -> None:
+            await self.vote(int(select.values[0]), interaction)
+
+        select.callback = callback
+        self.select = select
+        self.add_item(select)
+
+    def _setup_buttons(self, style: ButtonStyle) -> None:
+        for index in range(len(self.options)):
+            button = Button(style=style)
+            button.callback = functools.partial(self.vote, index)
+            self.buttons.append(button)
+            self.add_item(button)
+
+    def _render_tally(self) -> None:
+        if self.select:
+            self.select.options = [
+                SelectOption(
+                    label=truncate(key, OptionStore.MAX_SELECT_LABEL_LENGTH),
+                    value=str(index),
+                    description=_describe_count(count),
+                )
+                for index, (key, count) in enumerate(zip(self.options.keys, self.tally))
+            ]
+            return
+
+        max_length = OptionStore.MAX_BUTTON_LABEL_LENGTH
+        for button, key, count in zip(self.buttons, self.options.keys, self.tally):
+            suffix = f" ({count})"
+            button.label = truncate(key, max_length - len(suffix)) + suffix
+
+
+def _describe_count(vote_count: int) -> str:
+    return f"{vote_count} vote{'' if vote_count == 1 else 's'}"
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from uikitty.base_selector import BaseSelector
+
+
+class SelectorRegistry:
+    """Keeps track of the selector views that are currently waiting for user input.
+
+    Every `BaseSelector` registers itself with a registry upon creation, and is removed
+    from it once it's finished, has timed out, or has been evicted. A registry holds at
+    most `max_size` selectors at once. If a new selector would exceed that limit, the
+    selector that has been idle (i.e. without any user interaction) for the longest time
+    is evicted, which stops it and allows it to be garbage-collected. Selectors whose
+    class sets `EVICTABLE` to `False` (such as polls, which are shared by many users and
+    may be idle for a long time) are never evicted, so they may exceed this limit.
+
+    The counters on this class can be used to monitor how many selectors are live, and
+    how many have been abandoned by their users (i.e. have expired or been evicted).
+    """
+
+    def __init__(self, max_size: int = 1000) -> None:
+        """Initializes a new `SelectorRegistry` instance.
+
+        Args:
+            max_size:
+                The maximum number of selectors that may be live at the same time.
+        """
+        self.max_size: int = max_size
+        self.expired_count: int = 0
+        self.evicted_count: int = 0
+        self._selectors: Final[OrderedDict[str, "BaseSelector"]] = OrderedDict()
+
+    @property
+    def live_count(self) -> int:
+        """The number of selectors that are currently registered."""
+        return len(self._selectors)
+
+    def get_stats(self) -> dict[str, int]:
+        """Returns the current values of all counters for this registry."""
+        return {
+            "live": self.live_count,
+            "expired": self.expired_count,
+            "evicted": self.evicted_count,
+        }
+
+    def register(self, selector: "BaseSelector") -> None:
+        """Adds a selector to this registry, evicting the most idle ones if necessary.
+
+        Args:
+            selector:
+                The selector to add. It will be treated as the most recently active one.
+        """
+        self._selectors[selector.id] = selector
+
+        while len(self._selectors) > max(self.max_size, 1):
+            evicted_selector = next(
+                (s for s in self._selectors.values() if type(s).EVICTABLE), None
+            )
+            if evicted_selector is None:
+                break  # Only selectors that can't be evicted are left.
+
+            del self._selectors[evicted_selector.id]
+            self.evicted_count += 1
+            evicted_selector.evict()
+
+    def touch(self, selector: "BaseSelector") -> None:
+        """Marks a selector as the most recently active one in this registry.
+
+        Args:
+            selector:
+                The selector that the user just interacted with.
+        """
+        if selector.id in self._selectors:
+            self._selectors.move_to_end(selector.id)
+
+    def unregister(self, selector: "BaseSelector", expired: bool = False) -> None:
+        """Removes a selector from this registry, if it's currently registered.
+
+        Args:
+            selector:
+                The selector to remove.
+            expired:
+                Whether the selector is being removed because its timeout elapsed.
+        """
+        if self._selectors.pop(selector.id, None) and expired:
+            self.expired_count += 1
+
+
+selector_registry: Final[SelectorRegistry] = SelectorRegistry()
+"""The default registry, which is shared by all selectors in the current process."""
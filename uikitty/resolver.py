@@ -0,0 +1,88 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any, Final, NamedTuple, TypeAlias
+
+Resolver: TypeAlias = Callable[[str], Awaitable[Any]]
+
+
+class _CacheEntry(NamedTuple):
+    future: asyncio.Future[Any]
+    expiry_time: float
+
+
+class CachedResolver:
+    """Wraps an async resolver function and caches the values it returns.
+
+    A resolver accepts the key (i.e. label) of an option and returns its value, e.g. by
+    loading it from a database. Wrapping a resolver in this class avoids resolving the
+    same key again while its value is still cached. Concurrent calls for the same key
+    share a single underlying call, and failed calls are not cached.
+
+    The cache holds at most `max_size` values. If adding a value would exceed that
+    limit, the least recently used one is discarded. Values are also discarded once
+    they're older than `ttl` seconds, so that stale data is eventually resolved again.
+    """
+
+    def __init__(
+        self, resolver: Resolver, max_size: int = 256, ttl: float | None = None
+    ) -> None:
+        """Initializes a new `CachedResolver` instance.
+
+        Args:
+            resolver:
+                The async function that accepts an option key and returns its value.
+            max_size:
+                The maximum number of values to keep at the same time.
+            ttl:
+                The number of seconds after which a cached value should be resolved
+                again. Set to `None` to keep values until they're the least recently
+                used ones.
+        """
+        self.resolver: Final[Resolver] = resolver
+        self.max_size: int = max_size
+        self.ttl: float | None = ttl
+        self.hit_count: int = 0
+        self.miss_count: int = 0
+        self._entries: Final[OrderedDict[str, _CacheEntry]] = OrderedDict()
+
+    def get_stats(self) -> dict[str, int]:
+        """Returns the current values of all counters for this resolver."""
+        return {
+            "size": len(self._entries),
+            "hits": self.hit_count,
+            "misses": self.miss_count,
+        }
+
+    async def __call__(self, key: str) -> Any:
+        """Returns the (possibly cached) value for the given option key."""
+        now = time.monotonic()
+
+        if (entry := self._entries.get(key)) and (entry.expiry_time > now):
+            self.hit_count += 1
+            self._entries.move_to_end(key)
+            return await asyncio.shield(entry.future)
+
+        self.miss_count += 1
+        future = asyncio.ensure_future(self.resolver(key))
+        expiry_time = (now + self.ttl) if (self.ttl is not None) else float("inf")
+        self._entries[key] = _CacheEntry(future, expiry_time)
+
+        while len(self._entries) > max(self.max_size, 1):
+            self._entries.popitem(last=False)
+
+        try:
+            return await asyncio.shield(future)
+        except BaseException:
+            if (entry := self._entries.get(key)) and (entry.future is future):
+                if future.done():
+                    del self._entries[key]
+            raise
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Discards the cached value for the given key, or all values if it's `None`."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
@@ -0,0 +1,208 @@
+import bisect
+import heapq
+import re
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from typing import Final
+
+
+class SearchIndex:
+    """A precomputed index that finds the option keys matching a search query.
+
+    Queries are matched case-insensitively in three passes, and each pass only runs if
+    the previous passes didn't produce enough results:
+
+    1. **Prefix matches** against the start of any word in a key. These are found via
+       binary search on a sorted array of word suffixes (i.e. a flattened prefix trie),
+       so the cost of a query depends on the number of results, not the number of keys.
+    2. **Substring matches** anywhere in a key. Candidates are taken from the trigram
+       posting list with the fewest entries and then verified directly.
+    3. **Fuzzy matches**, ranked by the number of trigrams shared with the query.
+
+    This class only stores integer indices into the original sequence of keys, so the
+    results of a search can be used to look up the corresponding options in O(1) time.
+    Callers that search repeatedly while a query is being typed can use `refine()` to
+    narrow down the results of a previous search instead of searching from scratch.
+    """
+
+    MAX_FUZZY_CANDIDATES: Final[int] = 20_000
+    MIN_SUBSTRING_LENGTH: Final[int] = 3
+
+    def __init__(self, keys: Sequence[str]) -> None:
+        """Initializes a new `SearchIndex` instance.
+
+        Args:
+            keys:
+                The option keys (i.e. names/labels) that should be searchable.
+        """
+        self.keys: Final[Sequence[str]] = keys
+        self._normalized_keys: Final[list[str]] = [key.casefold() for key in keys]
+
+        word_suffixes = sorted(
+            (normalized_key[match.start() :], index)
+            for index, normalized_key in enumerate(self._normalized_keys)
+            for match in re.finditer(r"\w+", normalized_key)
+        )
+        self._suffixes: Final[list[str]] = [suffix for suffix, _ in word_suffixes]
+        self._suffix_indices: Final[array[int]] = array(
+            "I", (index for _, index in word_suffixes)
+        )
+
+        postings: dict[str, array[int]] = {}
+        for index, normalized_key in enumerate(self._normalized_keys):
+            for trigram in _get_trigrams(normalized_key):
+                if (posting := postings.get(trigram)) is None:
+                    postings[trigram] = array("I", (index,))
+                else:
+                    posting.append(index)
+        self._trigram_postings: Final[dict[str, array[int]]] = postings
+
+    def search(self, query: str, limit: int = 25, fuzzy: bool = True) -> list[int]:
+        """Finds the indices of the option keys that best match the given query.
+
+        Args:
+            query:
+                The text to search for. Leading/trailing whitespace is ignored.
+            limit:
+                The maximum number of results to return.
+            fuzzy:
+                Whether to look for fuzzy matches if there are no prefix or substring
+                matches. Substring matches are only found for queries that are at least
+                `MIN_SUBSTRING_LENGTH` characters long.
+
+        Returns:
+            A list of indices into `keys`, ordered from the best match to the worst.
+        """
+        if not (query := query.strip().casefold()):
+            return []
+
+        results: dict[int, None] = {}
+        self._add_prefix_matches(query, results, limit)
+
+        if len(results) < limit:
+            self._add_substring_matches(query, results, limit)
+        if fuzzy and not results:
+            self._add_fuzzy_matches(query, results, limit)
+
+        return list(results)
+
+    def refine(
+        self, query: str, candidates: Iterable[int], limit: int = 25
+    ) -> list[int]:
+        """Finds the prefix and substring matches for a query among the given indices.
+
+        If `candidates` are all of the (non-fuzzy) matches for a prefix of `query`, and
+        both are long enough for substring matches (or neither is), the results are the
+        same as those of `search(query, limit, fuzzy=False)`. However, the cost of this
+        method depends on the number of candidates rather than the size of the index.
+
+        Args:
+            query:
+                The text to search for. Leading/trailing whitespace is ignored.
+            candidates:
+                The indices of the option keys that may match the query.
+            limit:
+                The maximum number of results to return.
+
+        Returns:
+            A list of indices into `keys`, ordered from the best match to the worst.
+        """
+        if not (query := query.strip().casefold()):
+            return []
+
+        find_prefixes = _WORD_CHARACTER.match(query) is not None
+        find_substrings = len(query) >= type(self).MIN_SUBSTRING_LENGTH
+        prefix_matches: list[tuple[str, int]] = []
+        substring_matches: list[int] = []
+
+        for index in candidates:
+            normalized_key = self._normalized_keys[index]
+            position = normalized_key.find(query)
+            best_suffix = None
+
+            while find_prefixes and (position >= 0):
+                if (position == 0) or not _WORD_CHARACTER.match(
+                    normalized_key, position - 1
+                ):
+                    suffix = normalized_key[position:]
+                    if (best_suffix is None) or (suffix < best_suffix):
+                        best_suffix = suffix
+                position = normalized_key.find(query, position + 1)
+
+            if best_suffix is not None:
+                prefix_matches.append((best_suffix, index))
+            elif find_substrings and (query in normalized_key):
+                substring_matches.append(index)
+
+        results = [index for _, index in sorted(prefix_matches)[:limit]]
+        results.extend(sorted(substring_matches)[: limit - len(results)])
+        return results
+
+    def find_similar(self, query: str, limit: int = 25) -> list[int]:
+        """Finds the option keys that share the most trigrams with the given query.
+
+        This is the fuzzy pass of `search()` on its own, for callers that have already
+        looked for prefix and substring matches (e.g. via `refine()`) and found none.
+        """
+        if not (query := query.strip().casefold()):
+            return []
+
+        results: dict[int, None] = {}
+        self._add_fuzzy_matches(query, results, limit)
+        return list(results)
+
+    def _add_prefix_matches(
+        self, query: str, results: dict[int, None], limit: int
+    ) -> None:
+        position = bisect.bisect_left(self._suffixes, query)
+
+        while (len(results) < limit) and (position < len(self._suffixes)):
+            if not self._suffixes[position].startswith(query):
+                break
+            results[self._suffix_indices[position]] = None
+            position += 1
+
+    def _add_substring_matches(
+        self, query: str, results: dict[int, None], limit: int
+    ) -> None:
+        if not (trigrams := _get_trigrams(query)):
+            return
+
+        postings = []
+        for trigram in trigrams:
+            if (posting := self._trigram_postings.get(trigram)) is None:
+                return
+            postings.append(posting)
+
+        for index in min(postings, key=len):
+            if (index not in results) and (query in self._normalized_keys[index]):
+                results[index] = None
+                if len(results) >= limit:
+                    break
+
+    def _add_fuzzy_matches(
+        self, query: str, results: dict[int, None], limit: int
+    ) -> None:
+        postings = sorted(
+            filter(None, map(self._trigram_postings.get, _get_trigrams(query))),
+            key=len,
+        )
+        scores: Counter[int] = Counter()
+        candidate_count = 0
+
+        for posting in postings:
+            if candidate_count + len(posting) > type(self).MAX_FUZZY_CANDIDATES:
+                break
+            scores.update(posting)
+            candidate_count += len(posting)
+
+        for index in heapq.nlargest(limit, scores, key=scores.__getitem__):
+            results[index] = None
+
+
+_WORD_CHARACTER: Final[re.Pattern[str]] = re.compile(r"\w")
+
+
+def _get_trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
@@ -0,0 +1,223 @@
+import asyncio
+import functools
+import uuid
+from collections.abc import Callable
+from typing import Any, Final
+
+from discord import ApplicationContext, ButtonStyle, Embed, Interaction
+from discord.ui import View
+
+from uikitty.dynamic_selector import DynamicSelector
+from uikitty.edit_scheduler import EditScheduler, edit_scheduler
+from uikitty.instrumentation import EventKind
+from uikitty.layout_cache import LayoutCache
+from uikitty.option_store import OptionStore
+
+
+class SelectionChain:
+    """Displays a series of selections (e.g. the steps of a wizard) in a single message.
+
+    Each call to `select()` displays a new `DynamicSelector` in place of the previous
+    one, so the options for each step may depend on the answers to previous steps. The
+    interaction that completes a step is not acknowledged right away. Instead, the next
+    step's components are sent as the response to that interaction, which replaces the
+    usual pair of requests (acknowledging the click, then editing the message) with a
+    single one. Calling `finish()` does the same for the final message.
+
+    Discord requires interactions to be acknowledged within 3 seconds. If the next step
+    isn't ready within `ACK_DEADLINE` seconds (e.g. because the caller is waiting on a
+    slow database query), the pending interaction is deferred, and the next step edits
+    the message with a separate request instead.
+    """
+
+    ACK_DEADLINE: Final[float] = 2.0
+
+    def __init__(
+        self,
+        ctx: ApplicationContext,
+        log: Callable[[str], None] | None = print,
+        timeout: float | None = None,
+        layout_cache: LayoutCache | None = None,
+        scheduler: EditScheduler = edit_scheduler,
+    ) -> None:
+        """Initializes a new `SelectionChain` instance.
+
+        Args:
+            ctx:
+                The context for the application command that prompted these selections.
+            log:
+                A function that will be called to display information in the console.
+                Set to `None` to disable console output for this instance.
+            timeout:
+                The number of seconds to wait for the user to complete each step.
+                Set to `None` to wait indefinitely.
+            layout_cache:
+                A `LayoutCache` from which to reuse the pages built for previous steps
+                (or previous chains) with the same option keys. Optional.
+            scheduler:
+                The `EditScheduler` through which to send message edits that don't
+                respond to an interaction. Defaults to the process-wide scheduler.
+        """
+        self.ctx: Final[ApplicationContext] = ctx
+        self.log: Final[Callable[[str], None] | None] = log
+        self.timeout: float | None = timeout
+        self.layout_cache: Final[LayoutCache | None] = layout_cache
+        self.answers: Final[list[Any]] = []
+        self.scheduler: Final[EditScheduler] = scheduler
+        self.message_key: Final[str] = uuid.uuid4().hex
+        self._pending_interaction: Interaction | None = None
+        self._ack_task: asyncio.Task[None] | None = None
+
+    async def select(
+        self,
+        *args: str,
+        content: str | None = None,
+        embed: Embed | None = None,
+        button_style: ButtonStyle = ButtonStyle.secondary,
+        select_placeholder: str | None = None,
+        jump_navigation: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """Displays the next step and returns the option selected by the user.
+
+        Args:
+            *args:
+                An ordered collection of option strings.
+                Cannot be used alongside `**kwargs`.
+            content:
+                The text content to display with this step. If omitted, the content of
+                the previous step (if any) is kept.
+            embed:
+                An embed to display with this step. If omitted, the embed of the
+                previous step (if any) is kept.
+            button_style:
+                The `ButtonStyle` to use for the option `Button` components.
+                Only applicable if there are between 2 and 5 options (inclusive).
+            select_placeholder:
+                The placeholder text to display in the `Select` (dropdown) component.
+                Only applicable if there are between 6 and 25 options (inclusive).
+            jump_navigation:
+                Whether to display an extra dropdown menu that lists ranges of pages.
+                Only applicable if there are 26 or more options.
+            **kwargs:
+                An ordered mapping of option labels to option values.
+                Cannot be used alongside `*args`.
+
+        Returns:
+            The user's selected option string (if `*args`) or option value (if
+            `**kwargs`). If there are fewer than 2 options, no view is displayed, and
+            the only option (or `None`) is returned right away.
+
+        Raises:
+            TimeoutError:
+                If the `timeout` elapses without a selection, or the view is evicted
+                from the process-wide `selector_registry` before a selection is made.
+            ValueError:
+                If both `*args` and `**kwargs` are provided.
+        """
+        if args and kwargs:
+            raise ValueError("Only one of '*args' or '**kwargs' may be provided.")
+
+        options = OptionStore(kwargs.items() if kwargs else zip(args, args))
+
+        if len(options) < DynamicSelector.MIN_OPTIONS:
+            answer = options.values[0] if options.values else None
+            self.answers.append(answer)
+            return answer
+
+        view = DynamicSelector(
+            self.ctx,
+            button_style,
+            select_placeholder,
+            self.log,
+            options,
+            jump_navigation,
+            self.timeout,
+            self.layout_cache,
+        )
+        view.defers_finish = False
+        timed_out = False
+
+        try:
+            await view.prepare()
+            await self._show(view, content, embed)
+            view.mark_shown()
+            timed_out = await view.wait()
+        except asyncio.CancelledError:
+            view.emit(EventKind.ABANDONED, reason="cancelled")
+            raise
+        finally:
+            if not timed_out:
+                view.stop()
+
+        if timed_out or view.is_evicted:
+            raise TimeoutError("The user did not make a selection in time.")
+
+        if view.finish_interaction:
+            self._hold(view.finish_interaction)
+
+        self.answers.append(view.selected_value)
+        return view.selected_value
+
+    async def finish(
+        self, content: str | None = None, embed: Embed | None = None
+    ) -> None:
+        """Removes the last step's components from the message.
+
+        If the last step's interaction is still pending, the message is edited as the
+        response to that interaction.
+
+        Args:
+            content:
+                The text content to display instead. If omitted, it's left unchanged.
+            embed:
+                An embed to display instead. If omitted, it's left unchanged.
+        """
+        await self._show(None, content, embed)
+
+    async def _show(
+        self, view: View | None, content: str | None, embed: Embed | None
+    ) -> None:
+        payload: dict[str, Any] = {"view": view}
+        if content is not None:
+            payload["content"] = content
+        if embed is not None:
+            payload["embed"] = embed
+
+        if interaction := self._take_pending_interaction():
+            await interaction.response.edit_message(**payload)
+            return
+
+        if self._ack_task:
+            await self._ack_task  # Make sure the deferral has gone through.
+            self._ack_task = None
+
+        if self.ctx.response.is_done():
+            await self.scheduler.submit(
+                self.ctx.channel_id,
+                self.message_key,
+                functools.partial(self.ctx.edit, **payload),
+            )
+        else:
+            await self.ctx.respond(**payload)
+
+    def _hold(self, interaction: Interaction) -> None:
+        self._pending_interaction = interaction
+        self._ack_task = asyncio.create_task(self._acknowledge_later(interaction))
+
+    def _take_pending_interaction(self) -> Interaction | None:
+        interaction = self._pending_interaction
+
+        if interaction and self._ack_task:
+            # The task is still waiting for the deadline, so it's safe to cancel it.
+            self._ack_task.cancel()
+            self._ack_task = None
+
+        self._pending_interaction = None
+        return interaction
+
+    async def _acknowledge_later(self, interaction: Interaction) -> None:
+        await asyncio.sleep(type(self).ACK_DEADLINE)
+        if self._pending_interaction is interaction:
+            self._pending_interaction = None
+            await interaction.response.defer()
@@ -0,0 +1,68 @@
+from collections.abc import Iterable, Iterator
+from typing import Final
+
+
+class SelectionSet:
+    """A set of option indices that is stored as a bitset.
+
+    Each option takes up a single bit, so even a selection over 100k options needs less
+    than 13 KB of memory. The bitset grows as needed, which means that the number of
+    options doesn't need to be known in advance. Indices are always iterated in order.
+    """
+
+    def __init__(self, capacity: int = 0) -> None:
+        """Initializes a new (empty) `SelectionSet` instance.
+
+        Args:
+            capacity:
+                The number of options for which to preallocate space. Optional.
+        """
+        self._bits: Final[bytearray] = bytearray((capacity + 7) // 8)
+        self._count: int = 0
+
+    def __len__(self) -> int:
+        """Returns the number of indices in this set."""
+        return self._count
+
+    def __contains__(self, index: object) -> bool:
+        """Returns whether the given index is in this set."""
+        if not isinstance(index, int) or (index < 0):
+            return False
+        byte_index, bit_index = divmod(index, 8)
+        return (byte_index < len(self._bits)) and bool(
+            self._bits[byte_index] & (1 << bit_index)
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        """Yields every index in this set, in ascending order."""
+        for byte_index, byte in enumerate(self._bits):
+            if byte:
+                for bit_index in range(8):
+                    if byte & (1 << bit_index):
+                        yield (byte_index * 8) + bit_index
+
+    def add(self, index: int) -> None:
+        """Adds the given index to this set."""
+        byte_index, bit_index = divmod(index, 8)
+        if byte_index >= len(self._bits):
+            self._bits.extend(bytes(byte_index + 1 - len(self._bits)))
+        if not self._bits[byte_index] & (mask := 1 << bit_index):
+            self._bits[byte_index] |= mask
+            self._count += 1
+
+    def discard(self, index: int) -> None:
+        """Removes the given index from this set, if it's present."""
+        if index in self:
+            byte_index, bit_index = divmod(index, 8)
+            self._bits[byte_index] &= ~(1 << bit_index)
+            self._count -= 1
+
+    def update(self, indices: Iterable[int]) -> None:
+        """Adds all of the given indices to this set."""
+        for index in indices:
+            self.add(index)
+
+    def clear(self) -> None:
+        """Removes all indices from this set."""
+        self._bits[:] = bytes(len(self._bits))
+        self._count = 0
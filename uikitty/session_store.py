@@ -0,0 +1,176 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Final, NamedTuple
+
+from discord import ButtonStyle
+
+
+class SessionState(NamedTuple):
+    """Everything needed to render and advance a persistent selector in any process."""
+
+    handler: str
+    """The name of the handler to call once the user confirms their selection."""
+
+    keys: list[str]
+    """The keys (i.e. labels) of all options, in order."""
+
+    values: list[Any]
+    """The values of all options, in the same order as their keys."""
+
+    page_index: int = 0
+    """The index of the page that is currently displayed (if the options are paged)."""
+
+    selected_index: int | None = None
+    """The index of the currently selected option, if any (for paged options)."""
+
+    placeholder: str | None = None
+    """The placeholder text to display in the dropdown menu, if any."""
+
+    button_style: int = ButtonStyle.secondary.value
+    """The numeric value of the `ButtonStyle` for option buttons (if any)."""
+
+    data: Any = None
+    """Arbitrary data that will be passed to the handler along with the selection."""
+
+    timeout: float | None = None
+    """The number of seconds of inactivity after which this session expires, if any."""
+
+    expiry_time: float | None = None
+    """When this session expires, in seconds since the epoch (or `None` for never)."""
+
+    def is_expired(self, now: float | None = None) -> bool:
+        """Returns whether this session has expired (as of `now`, if provided)."""
+        if self.expiry_time is None:
+            return False
+        return self.expiry_time <= (time.time() if (now is None) else now)
+
+    def to_json(self) -> str:
+        """Returns a JSON representation of this state. All values must be JSON-safe."""
+        return json.dumps(self._asdict(), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "SessionState":
+        """Returns the state represented by the given JSON (as made by `to_json()`)."""
+        return cls(**json.loads(text))
+
+
+class SessionStore(ABC):
+    """Base class for the places where the states of persistent selectors are kept.
+
+    A store must be shared by every process that handles interactions for the same
+    bot, so that any of them can pick up a session where another one left off.
+    Implementations should treat expired sessions as missing.
+    """
+
+    @abstractmethod
+    async def load(self, session_id: str) -> SessionState | None:
+        """Returns the state of the given session, or `None` if it doesn't exist."""
+
+    @abstractmethod
+    async def save(self, session_id: str, state: SessionState) -> None:
+        """Creates or replaces the state of the given session."""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """Removes the given session, if it exists."""
+
+
+class MemorySessionStore(SessionStore):
+    """A `SessionStore` that keeps sessions in a dict, for use by a single process.
+
+    Sessions don't survive restarts of the process, but this store is useful for local
+    development and tests. Expired sessions are removed when they're next accessed.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a new (empty) `MemorySessionStore` instance."""
+        self._sessions: Final[dict[str, SessionState]] = {}
+
+    async def load(self, session_id: str) -> SessionState | None:
+        """Returns the state of the given session, or `None` if it doesn't exist."""
+        if (state := self._sessions.get(session_id)) and state.is_expired():
+            del self._sessions[session_id]
+            return None
+        return state
+
+    async def save(self, session_id: str, state: SessionState) -> None:
+        """Creates or replaces the state of the given session."""
+        self._sessions[session_id] = state
+
+    async def delete(self, session_id: str) -> None:
+        """Removes the given session, if it exists."""
+        self._sessions.pop(session_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    """A `SessionStore` that keeps sessions in an SQLite database file.
+
+    Sessions survive restarts, and the database may be shared by several processes on
+    the same machine (e.g. one per shard). Queries run in a worker thread, so they don't
+    block the event loop. Option values and handler data must be JSON-serializable.
+    """
+
+    TABLE_NAME: Final[str] = "uikitty_sessions"
+
+    def __init__(self, path: str) -> None:
+        """Initializes a new `SQLiteSessionStore` instance.
+
+        Args:
+            path:
+                The path of the database file. It will be created if it doesn't exist.
+        """
+        self.path: Final[str] = path
+        self._lock: Final[threading.Lock] = threading.Lock()
+        self._connection: Final[sqlite3.Connection] = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {type(self).TABLE_NAME} ("
+            "session_id TEXT PRIMARY KEY, state TEXT NOT NULL, expiry_time REAL)"
+        )
+
+    async def load(self, session_id: str) -> SessionState | None:
+        """Returns the state of the given session, or `None` if it doesn't exist."""
+        rows = await self._execute(
+            f"SELECT state FROM {type(self).TABLE_NAME} WHERE session_id = ? "
+            "AND (expiry_time IS NULL OR expiry_time > ?)",
+            (session_id, time.time()),
+        )
+        return SessionState.from_json(rows[0][0]) if rows else None
+
+    async def save(self, session_id: str, state: SessionState) -> None:
+        """Creates or replaces the state of the given session."""
+        await self._execute(
+            f"INSERT OR REPLACE INTO {type(self).TABLE_NAME} VALUES (?, ?, ?)",
+            (session_id, state.to_json(), state.expiry_time),
+        )
+
+    async def delete(self, session_id: str) -> None:
+        """Removes the given session, if it exists."""
+        await self._execute(
+            f"DELETE FROM {type(self).TABLE_NAME} WHERE session_id = ?", (session_id,)
+        )
+
+    async def purge_expired(self) -> None:
+        """Removes every session that has expired, to reclaim space in the database."""
+        await self._execute(
+            f"DELETE FROM {type(self).TABLE_NAME} WHERE expiry_time <= ?",
+            (time.time(),),
+        )
+
+    def close(self) -> None:
+        """Closes the connection to the database, after which this store is unusable."""
+        with self._lock:
+            self._connection.close()
+
+    async def _execute(self, sql: str, parameters: tuple[Any, ...]) -> list[Any]:
+        def execute() -> list[Any]:
+            with self._lock:
+                return self._connection.execute(sql, parameters).fetchall()
+
+        return await asyncio.to_thread(execute)